@@ -0,0 +1,249 @@
+"""
+Cliente adb - fala direto com o servidor adb (socket em 127.0.0.1:5037), sem abrir processos.
+
+Cada "adb devices" / "adb shell ..." era um fork/exec do executável adb, mais o
+handshake com o servidor. Aqui:
+  - a lista de devices é um único pedido host:devices;
+  - cada device tem UM shell persistente (shell,raw: - sem PTY), aberto na
+    primeira consulta; os comandos seguintes vão pela mesma conexão, delimitados
+    por um marcador com o código de saída, um de cada vez (lock por device).
+
+Devices com adbd antigo (sem shell,raw:) usam uma conexão shell:<comando> por
+consulta - ainda sem processo. Só quando o servidor adb não está rodando é que
+o executável é chamado, uma vez, para iniciá-lo (adb start-server).
+
+O endereço do servidor segue as variáveis do próprio adb
+(ANDROID_ADB_SERVER_ADDRESS / ANDROID_ADB_SERVER_PORT).
+"""
+import os
+import uuid
+import socket
+import atexit
+import logging
+import threading
+import subprocess
+
+
+ADB_HOST = os.environ.get("ANDROID_ADB_SERVER_ADDRESS", "127.0.0.1")
+ADB_PORTA = int(os.environ.get("ANDROID_ADB_SERVER_PORT", "5037"))
+
+logger = logging.getLogger("appium_test")
+
+
+class ErroAdb(RuntimeError):
+    """Falha reportada pelo servidor adb (FAIL) ou comando com código de saída != 0."""
+
+
+def _conectar(host: str, porta: int, timeout: float) -> socket.socket:
+    sock = socket.create_connection((host, porta), timeout=timeout)
+    sock.settimeout(timeout)
+    return sock
+
+
+def _ler_exato(sock, tamanho: int) -> bytes:
+    dados = b""
+    while len(dados) < tamanho:
+        parte = sock.recv(tamanho - len(dados))
+        if not parte:
+            raise ConnectionError("Conexao com o servidor adb encerrada")
+        dados += parte
+    return dados
+
+
+def _ler_ate_fechar(sock) -> bytes:
+    partes = []
+    while True:
+        parte = sock.recv(65536)
+        if not parte:
+            return b"".join(partes)
+        partes.append(parte)
+
+
+def _pedir(sock, servico: str):
+    """Envia um pedido (4 dígitos hex de tamanho + serviço) e confere OKAY/FAIL."""
+    dados = servico.encode('utf-8')
+    sock.sendall(f"{len(dados):04x}".encode('ascii') + dados)
+    status = _ler_exato(sock, 4)
+    if status == b"OKAY":
+        return
+    if status == b"FAIL":
+        tamanho = int(_ler_exato(sock, 4), 16)
+        raise ErroAdb(_ler_exato(sock, tamanho).decode('utf-8', errors='replace'))
+    raise ErroAdb(f"Resposta inesperada do servidor adb: {status!r}")
+
+
+class ShellPersistente:
+    """Um shell aberto no device, reaproveitado por todos os comandos (um por vez)."""
+
+    def __init__(self, serial: str, host: str, porta: int, timeout: float):
+        self.serial = serial
+        self._timeout = timeout
+        self._lock = threading.Lock()
+        self._buffer = b""
+        self._sock = _conectar(host, porta, timeout)
+        try:
+            _pedir(self._sock, f"host:transport:{serial}" if serial else "host:transport-any")
+            _pedir(self._sock, "shell,raw:")
+        except Exception:
+            self._sock.close()
+            raise
+
+    def executar(self, comando: str, timeout: float = None) -> str:
+        """
+        Executa o comando no shell aberto e devolve a saída (stdout + stderr).
+
+        Raises:
+            ErroAdb: código de saída diferente de zero.
+        """
+        marcador = f"__FIM_{uuid.uuid4().hex}__"
+        linha = f"{comando} </dev/null; printf '\\n{marcador}:%d\\n' $?\n"
+        fim = f"\n{marcador}:".encode('ascii')
+        with self._lock:
+            self._sock.settimeout(timeout or self._timeout)
+            self._sock.sendall(linha.encode('utf-8'))
+            while True:
+                pos = self._buffer.find(fim)
+                if pos >= 0:
+                    quebra = self._buffer.find(b"\n", pos + len(fim))
+                    if quebra >= 0:
+                        break
+                parte = self._sock.recv(65536)
+                if not parte:
+                    raise ConnectionError("Shell adb encerrado")
+                self._buffer += parte
+            saida = self._buffer[:pos].decode('utf-8', errors='replace')
+            codigo = int(self._buffer[pos + len(fim):quebra])
+            self._buffer = self._buffer[quebra + 1:]
+        if codigo != 0:
+            raise ErroAdb(f"'{comando}' saiu com codigo {codigo}: {saida.strip()}")
+        return saida
+
+    def fechar(self):
+        """Encerra o shell (o processo no device termina junto)."""
+        try:
+            self._sock.close()
+        except OSError:
+            pass
+
+
+class ClienteAdb:
+    """Pool de shells persistentes por device, sobre o servidor adb local."""
+
+    def __init__(self, host: str = ADB_HOST, porta: int = ADB_PORTA, timeout: float = 30):
+        self.host = host
+        self.porta = porta
+        self.timeout = timeout
+        self._shells = {}
+        self._sem_shell_raw = set()
+        self._lock = threading.Lock()
+        # Abertura de shell serializada por device: conexão lenta de um não trava os outros
+        self._locks_por_serial = {}
+        self._servidor_iniciado = False
+
+    def _conectar(self, timeout: float = None) -> socket.socket:
+        """Conexão com o servidor adb; inicia o servidor (uma vez) se ele não estiver rodando."""
+        try:
+            return _conectar(self.host, self.porta, timeout or self.timeout)
+        except ConnectionRefusedError:
+            if self._servidor_iniciado:
+                raise
+            self._servidor_iniciado = True
+            subprocess.run(['adb', 'start-server'], capture_output=True, timeout=30)
+            return _conectar(self.host, self.porta, timeout or self.timeout)
+
+    def dispositivos(self) -> list:
+        """Seriais dos devices prontos (estado 'device'), como em 'adb devices'."""
+        with self._conectar() as sock:
+            _pedir(sock, "host:devices")
+            tamanho = int(_ler_exato(sock, 4), 16)
+            dados = _ler_exato(sock, tamanho).decode('utf-8', errors='replace')
+        linhas = [linha.split('\t') for linha in dados.splitlines() if '\t' in linha]
+        return [serial for serial, estado in linhas if estado == 'device']
+
+    def _lock_do_serial(self, chave: str) -> threading.Lock:
+        with self._lock:
+            return self._locks_por_serial.setdefault(chave, threading.Lock())
+
+    def _shell_do_device(self, serial: str):
+        """Shell persistente do device (aberto na primeira chamada), ou None se o adbd não suporta."""
+        chave = serial or ""
+        with self._lock_do_serial(chave):
+            with self._lock:
+                if chave in self._sem_shell_raw:
+                    return None
+                shell = self._shells.get(chave)
+            if shell is not None:
+                return shell
+            # Conexão fora do lock global: só as chamadas deste device esperam por ela
+            self._conectar(timeout=1).close()  # Garante o servidor no ar
+            try:
+                shell = ShellPersistente(serial, self.host, self.porta, self.timeout)
+            except (ErroAdb, ConnectionError) as e:
+                if 'not found' in str(e):
+                    raise
+                logger.info(f"[ADB] Shell persistente indisponivel em {serial or 'device padrao'} ({e}), usando shell por comando")
+                with self._lock:
+                    self._sem_shell_raw.add(chave)
+                return None
+            with self._lock:
+                self._shells[chave] = shell
+            return shell
+
+    def _shell_avulso(self, serial: str, comando: str, timeout: float) -> str:
+        """Uma conexão shell:<comando> (adbd antigo). Sem código de saída."""
+        with self._conectar(timeout) as sock:
+            _pedir(sock, f"host:transport:{serial}" if serial else "host:transport-any")
+            _pedir(sock, f"shell:{comando}")
+            return _ler_ate_fechar(sock).decode('utf-8', errors='replace').replace('\r\n', '\n')
+
+    def shell(self, serial: str, comando: str, timeout: float = None) -> str:
+        """
+        Executa um comando no shell do device (serial None = único device conectado).
+        Se o shell persistente caiu (device reconectado), abre outro e repete uma vez.
+        """
+        timeout = timeout or self.timeout
+        shell = self._shell_do_device(serial)
+        if shell is None:
+            return self._shell_avulso(serial, comando, timeout)
+        try:
+            return shell.executar(comando, timeout)
+        except socket.timeout:
+            # Saída do comando pode chegar depois: o shell não serve mais
+            self._descartar(serial)
+            raise
+        except OSError:
+            self._descartar(serial)
+            shell = self._shell_do_device(serial)
+            if shell is None:
+                return self._shell_avulso(serial, comando, timeout)
+            return shell.executar(comando, timeout)
+
+    def getprop(self, serial: str, propriedade: str) -> str:
+        """Valor de uma propriedade do sistema (ex: ro.product.model)."""
+        return self.shell(serial, f"getprop {propriedade}").strip()
+
+    def _descartar(self, serial: str):
+        with self._lock:
+            shell = self._shells.pop(serial or "", None)
+        if shell:
+            shell.fechar()
+
+    def fechar(self):
+        """Fecha todos os shells abertos."""
+        with self._lock:
+            shells = list(self._shells.values())
+            self._shells.clear()
+        for shell in shells:
+            shell.fechar()
+
+
+_cliente = None
+
+
+def cliente() -> ClienteAdb:
+    """Cliente compartilhado do processo (shells fechados na saída)."""
+    global _cliente
+    if _cliente is None:
+        _cliente = ClienteAdb()
+        atexit.register(_cliente.fechar)
+    return _cliente
@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+"""
+Benchmark de gestos de scroll - gesto nativo do UiAutomator2 x arrasto W3C (ActionChains).
+
+Abra no app uma tela com lista rolável (ex: lista de produtos) e rode:
+    python benchmark_gestos.py
+    python benchmark_gestos.py --repeticoes 20 --percentual 0.4 --device-id <UDID>
+
+Para cada backend mede:
+  - scrolls por segundo (só o tempo do gesto, sem a leitura da hierarquia);
+  - precisão: deslocamento real do conteúdo x distância pedida, a partir da
+    posição dos mesmos nós na hierarquia antes e depois do gesto.
+
+Os scrolls alternam para baixo e para cima, para a lista não chegar ao fim.
+O backend "w3c" reproduz o caminho antigo (get_window_size + ActionChains a cada scroll).
+"""
+import sys
+import time
+import argparse
+import statistics
+import xml.etree.ElementTree as ET
+
+from benchmark_locators import _criar_driver
+from pages.gestos import (
+    BACKEND_NATIVO, BACKEND_W3C, regiao_scroll, rolar, swipe, tamanho_da_sessao,
+)
+from pages.base_page import SnapshotTela
+
+
+def posicoes(xml: str) -> dict:
+    """{(classe, resource-id, texto): y1} dos nós identificáveis de forma única na tela."""
+    try:
+        raiz = ET.fromstring(xml)
+    except ET.ParseError:
+        return {}
+    vistos = {}
+    for no in raiz.iter():
+        chave = (no.tag, no.get('resource-id', ''), no.get('text', ''))
+        if not chave[1] and not chave[2]:
+            continue
+        limites = SnapshotTela.limites(no.attrib)
+        if limites:
+            vistos.setdefault(chave, []).append(limites[1])
+    return {chave: ys[0] for chave, ys in vistos.items() if len(ys) == 1}
+
+
+def deslocamento(xml_antes: str, xml_depois: str):
+    """Deslocamento vertical (px) do conteúdo: mediana entre os nós presentes nas duas telas."""
+    antes, depois = posicoes(xml_antes), posicoes(xml_depois)
+    deltas = [antes[c] - depois[c] for c in antes.keys() & depois.keys() if antes[c] != depois[c]]
+    return abs(statistics.median(deltas)) if deltas else None
+
+
+def _gesto(driver, backend: str, regiao: dict, percentual: float, direcao: str):
+    """Executa um scroll pelo backend (w3c inclui o get_window_size que o caminho antigo fazia)."""
+    if backend == "swipe":
+        swipe(driver, regiao, percentual, direcao)
+    elif backend == BACKEND_W3C:
+        driver.get_window_size()
+        rolar(driver, regiao, percentual, direcao, backend=BACKEND_W3C)
+    else:
+        rolar(driver, regiao, percentual, direcao, backend=BACKEND_NATIVO)
+
+
+def medir_backend(driver, backend: str, regiao: dict, percentual: float, repeticoes: int) -> dict:
+    """Tempo de cada gesto e erro relativo do deslocamento em relação ao pedido."""
+    pedido = regiao['height'] * percentual
+    tempos, erros = [], []
+    xml = driver.page_source
+    for i in range(repeticoes):
+        direcao = 'down' if i % 2 == 0 else 'up'
+        inicio = time.perf_counter()
+        _gesto(driver, backend, regiao, percentual, direcao)
+        tempos.append(time.perf_counter() - inicio)
+        xml_depois = driver.page_source
+        real = deslocamento(xml, xml_depois)
+        if real is not None:
+            erros.append(abs(real - pedido) / pedido)
+        xml = xml_depois
+    return {
+        'por_segundo': 1 / statistics.mean(tempos),
+        'mediana_ms': statistics.median(tempos) * 1000,
+        'erro': statistics.mean(erros) if erros else None,
+        'medidos': len(erros),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de gestos de scroll")
+    parser.add_argument('--repeticoes', type=int, default=10, help="Scrolls por backend (padrão: 10)")
+    parser.add_argument('--percentual', type=float, default=0.5, help="Distância pedida, em fração da faixa (padrão: 0.5)")
+    parser.add_argument('--device-id', help="UDID do device (padrão: detectado)")
+    args = parser.parse_args()
+
+    driver = _criar_driver(args.device_id)
+    try:
+        regiao = regiao_scroll(tamanho_da_sessao(driver))
+        print(f"Regiao de scroll {regiao} | distancia pedida {regiao['height'] * args.percentual:.0f}px")
+        for backend in (BACKEND_NATIVO, "swipe", BACKEND_W3C):
+            r = medir_backend(driver, backend, regiao, args.percentual, args.repeticoes)
+            erro = f"{r['erro']:6.1%}" if r['erro'] is not None else "   n/d"
+            print(f"   {backend:7} {r['por_segundo']:5.2f} scroll/s | mediana {r['mediana_ms']:7.1f} ms"
+                  f" | erro de distancia {erro} ({r['medidos']} medido(s))")
+    finally:
+        driver.quit()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
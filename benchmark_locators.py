@@ -0,0 +1,211 @@
+#!/usr/bin/env python
+"""
+Benchmark de locators - mede o custo de cada estratégia de busca na tela atual do device.
+
+Abra no app a tela que contém os elementos e rode:
+    python benchmark_locators.py                          # XPaths padrão (campo de data da troca)
+    python benchmark_locators.py --xpath "//*[@text='Imprimir']/..//*[@resource-id='android:id/switch_widget']"
+    python benchmark_locators.py --repeticoes 30 --device-id <UDID>
+
+Modo --estrategias: mede ID x UiSelector x XPath para TODOS os locators declarados
+nas classes de pages/ e grava o resultado por modelo de device. A BasePage passa a
+usar a estratégia equivalente mais rápida de cada locator naquele modelo.
+    python benchmark_locators.py --estrategias            # sessão real (tela atual)
+    python benchmark_locators.py --estrategias --hierarquia tela.xml --modelo L400 --package <pkg>
+
+Com --hierarquia a medição é local, sobre o XML gravado (page_source / uiautomator dump):
+a busca por XPath inclui a serialização da hierarquia, como no device. Resultados de
+sessão real nunca são sobrescritos por medições de hierarquia.
+
+Cada locator é buscado N vezes com find_elements (sem espera) em cada estratégia.
+"""
+import sys
+import time
+import inspect
+import pkgutil
+import argparse
+import importlib
+import statistics
+import xml.etree.ElementTree as ET
+
+from appium.webdriver.common.appiumby import AppiumBy
+
+import pages
+from pages.base_page import BasePage
+from pages.locators import (
+    compilar_xpath, tipo_locator, chave_locator, locator_por_estrategia,
+    salvar_resultados, escolher_preferida, ESTRATEGIAS_ID, ESTRATEGIAS_TEXTO,
+)
+from pages.troca_page import TrocaPage
+
+
+def xpaths_padrao(app_package: str) -> list:
+    """XPaths usados nas páginas (dependem do package da sessão)."""
+    return [
+        f"//*[@resource-id='{app_package}:id/{TrocaPage.INPUT_DATA_INICIAL}']//android.widget.EditText",
+    ]
+
+
+def medir(driver, by: str, valor: str, repeticoes: int) -> dict:
+    """Tempo (ms) de cada find_elements para o locator."""
+    tempos = []
+    encontrados = 0
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        encontrados = len(driver.find_elements(by, valor))
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return {
+        'media': statistics.mean(tempos),
+        'mediana': statistics.median(tempos),
+        'encontrados': encontrados,
+    }
+
+
+def locators_das_paginas() -> dict:
+    """
+    Locators declarados nas classes de pages/ (constantes MAIÚSCULAS com string).
+
+    Returns:
+        {chave: (tipo, valor)} sem repetição entre páginas.
+    """
+    locators = {}
+    for modulo_info in pkgutil.iter_modules(pages.__path__):
+        modulo = importlib.import_module(f"pages.{modulo_info.name}")
+        for _, classe in inspect.getmembers(modulo, inspect.isclass):
+            if not issubclass(classe, BasePage) or classe is BasePage:
+                continue
+            for nome, valor in vars(classe).items():
+                if nome.isupper() and isinstance(valor, str) and valor:
+                    tipo = tipo_locator(valor)
+                    locators[chave_locator(tipo, valor)] = (tipo, valor)
+    return locators
+
+
+def _valor_completo(tipo: str, valor: str, app_package: str) -> str:
+    """resource-id completo para IDs curtos; textos ficam como estão."""
+    if tipo == 'id' and ':id/' not in valor:
+        return f"{app_package}:id/{valor}"
+    return valor
+
+
+def _buscar_na_hierarquia(raiz, tipo: str, valor: str, estrategia: str) -> int:
+    """Busca local no XML gravado; XPath serializa a hierarquia antes (como o UiAutomator2)."""
+    if estrategia == 'xpath':
+        raiz = ET.fromstring(ET.tostring(raiz))
+    if tipo == 'id':
+        return sum(1 for no in raiz.iter() if no.get('resource-id') == valor)
+    return sum(1 for no in raiz.iter() if valor in (no.get('text') or ''))
+
+
+def medir_na_hierarquia(raiz, tipo: str, valor: str, estrategia: str, repeticoes: int) -> dict:
+    """Tempo (ms) de cada busca local para o locator."""
+    tempos = []
+    encontrados = 0
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        encontrados = _buscar_na_hierarquia(raiz, tipo, valor, estrategia)
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return {
+        'media': statistics.mean(tempos),
+        'mediana': statistics.median(tempos),
+        'encontrados': encontrados,
+    }
+
+
+def benchmark_estrategias(repeticoes: int, app_package: str, driver=None, raiz=None) -> dict:
+    """
+    Mede cada estratégia equivalente de todos os locators das páginas.
+
+    Returns:
+        {chave: {estratégia: {"media_ms", "encontrados"}}}
+    """
+    resultados = {}
+    for chave, (tipo, valor) in sorted(locators_das_paginas().items()):
+        completo = _valor_completo(tipo, valor, app_package)
+        estrategias = ESTRATEGIAS_ID if tipo == 'id' else ESTRATEGIAS_TEXTO
+        resultados[chave] = {}
+        for estrategia in estrategias:
+            if driver is not None:
+                by, locator = locator_por_estrategia(tipo, completo, estrategia)
+                r = medir(driver, by, locator, repeticoes)
+            else:
+                r = medir_na_hierarquia(raiz, tipo, completo, estrategia, repeticoes)
+            resultados[chave][estrategia] = {'media_ms': round(r['media'], 2), 'encontrados': r['encontrados']}
+
+        tempos = " | ".join(f"{e} {r['media_ms']:7.1f} ms ({r['encontrados']})" for e, r in resultados[chave].items())
+        preferida = escolher_preferida(resultados[chave]) or "- (nao equivalentes)"
+        print(f"   {chave:45} {tempos}  -> {preferida}")
+    return resultados
+
+
+def _criar_driver(device_id: str):
+    """Sessão Appium na tela que já está aberta (sem relançar o app)."""
+    from appium import webdriver
+    from config import APPIUM_SERVER_URL, get_appium_options
+
+    options = get_appium_options(device_id=device_id)
+    options.set_capability("forceAppLaunch", False)
+    return webdriver.Remote(command_executor=APPIUM_SERVER_URL, options=options)
+
+
+def comparar_xpaths(driver, xpaths: list, repeticoes: int):
+    """XPath x UiSelector compilado (pages/locators.py) para cada XPath."""
+    for xpath in xpaths:
+        print(f"\n{xpath}")
+        by, valor = compilar_xpath(xpath)
+        if by == AppiumBy.XPATH:
+            print("   [SKIP] Formato sem tradução para UiSelector (continua XPath)")
+            continue
+
+        r_xpath = medir(driver, AppiumBy.XPATH, xpath, repeticoes)
+        r_ui = medir(driver, by, valor, repeticoes)
+        print(f"   UiSelector: {valor}")
+        print(f"   XPath      media {r_xpath['media']:7.1f} ms | mediana {r_xpath['mediana']:7.1f} ms | {r_xpath['encontrados']} elemento(s)")
+        print(f"   UiSelector media {r_ui['media']:7.1f} ms | mediana {r_ui['mediana']:7.1f} ms | {r_ui['encontrados']} elemento(s)")
+        if r_xpath['encontrados'] != r_ui['encontrados']:
+            print("   [AVISO] Quantidade de elementos diferente entre as estratégias")
+        print(f"   Ganho por busca: {r_xpath['media'] - r_ui['media']:.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de estratégias de locator")
+    parser.add_argument('--xpath', action='append', help="XPath a medir (pode repetir)")
+    parser.add_argument('--repeticoes', type=int, default=20, help="Buscas por estratégia (padrão: 20)")
+    parser.add_argument('--device-id', help="UDID do device (padrão: detectado)")
+    parser.add_argument('--estrategias', action='store_true',
+                        help="Mede ID x UiSelector x XPath de todos os locators das páginas e grava por modelo")
+    parser.add_argument('--hierarquia', help="XML gravado da tela (mede localmente, sem device)")
+    parser.add_argument('--modelo', help="Modelo do device (obrigatório com --hierarquia)")
+    parser.add_argument('--package', help="Package do app (obrigatório com --hierarquia)")
+    args = parser.parse_args()
+
+    if args.hierarquia:
+        if not args.estrategias or not args.modelo or not args.package:
+            parser.error("--hierarquia exige --estrategias, --modelo e --package")
+        with open(args.hierarquia, encoding='utf-8') as f:
+            raiz = ET.fromstring(f.read())
+        print(f"Hierarquia gravada {args.hierarquia} (modelo {args.modelo})")
+        resultados = benchmark_estrategias(args.repeticoes, args.package, raiz=raiz)
+        arquivo = salvar_resultados(args.modelo, resultados, origem="hierarquia")
+        print(f"\nResultados salvos em {arquivo}")
+        return 0
+
+    driver = _criar_driver(args.device_id)
+    try:
+        app_package = driver.capabilities.get('appPackage')
+        if args.estrategias:
+            modelo = driver.capabilities.get('deviceModel') or args.modelo
+            print(f"Estratégias por locator (modelo {modelo})")
+            resultados = benchmark_estrategias(args.repeticoes, app_package, driver=driver)
+            arquivo = salvar_resultados(modelo, resultados, origem="sessao")
+            print(f"\nResultados salvos em {arquivo}")
+        else:
+            comparar_xpaths(driver, args.xpath or xpaths_padrao(app_package), args.repeticoes)
+    finally:
+        driver.quit()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+"""
+Benchmark da espera por tela estável - pausas fixas antigas x aguardar_tela_estavel, por fluxo.
+
+Roda sem device: cada fluxo (métodos @cronometrar_fluxo) é executado com as ações
+da BasePage simuladas, e cada espera por tela estável roda de verdade contra um
+device simulado:
+  - page_source com latência (--latencia), como a ida e volta ao UiAutomator2;
+  - cada espera vem logo após uma ação, que dispara uma transição de tela com
+    animação de layout por --transicao segundos;
+  - um relógio na tela muda o texto a cada leitura (não pode segurar a espera).
+
+    python benchmark_tela_estavel.py
+    python benchmark_tela_estavel.py --latencia 0.25 --transicao 0.8
+
+"antes" é a soma das pausas fixas dos pontos de espera do fluxo (o tempo_maximo de
+cada chamada é a pausa que ela substituiu); "depois" é o tempo medido das esperas.
+Cliques e digitação custam o mesmo nos dois casos e ficam fora da conta.
+"""
+import sys
+import time
+import argparse
+from unittest.mock import MagicMock, patch
+
+from pages.base_page import BasePage
+from pages.consulta_pedido_page import ConsultaPedidoPage
+from pages.pedido_page import PedidoPage
+from pages.troca_page import TrocaPage
+from pages.venda_futura_page import VendaFuturaPage
+from pages.venda_page import VendaPage
+
+
+FLUXOS = [
+    (VendaPage, "executar_venda_consumidor"),
+    (VendaPage, "executar_venda_cliente"),
+    (PedidoPage, "executar_pedido_venda_consumidor"),
+    (PedidoPage, "executar_pedido_venda_cliente"),
+    (TrocaPage, "executar_troca"),
+    (TrocaPage, "executar_troca_consumidor"),
+    (VendaFuturaPage, "executar_venda_futura"),
+    (VendaFuturaPage, "executar_venda_futura_domicilio"),
+    (ConsultaPedidoPage, "executar_consulta_e_finalizar_pedido"),
+]
+
+# Ações simuladas: não medidas, só retornam um valor que deixa o fluxo seguir
+_MEDIDOS = {"aguardar_tela_estavel", "assinatura_tela"}
+
+
+class DeviceSimulado:
+    """Driver mínimo: page_source com latência, transição animada após cada ação e relógio na tela."""
+
+    capabilities = {'appPackage': 'com.simulado'}
+
+    def __init__(self, latencia: float, transicao: float):
+        self.latencia = latencia
+        self.transicao = transicao
+        self.tela = 0
+        self.fim_transicao = 0.0
+        self.leituras = 0
+
+    def acao(self):
+        """Uma ação do fluxo: a próxima tela começa a entrar."""
+        self.tela += 1
+        self.fim_transicao = time.monotonic() + self.transicao
+
+    # Acessos diretos ao driver nos page objects (listas de opções, menu, voltar)
+    def find_element(self, by, valor):
+        return MagicMock()
+
+    def find_elements(self, by, valor):
+        return [MagicMock(), MagicMock()]
+
+    def back(self):
+        pass
+
+    @property
+    def page_source(self) -> str:
+        time.sleep(self.latencia)
+        self.leituras += 1
+        restante = max(self.fim_transicao - time.monotonic(), 0.0)
+        deslocamento = int(restante * 1000)  # animação de entrada: o conteúdo desliza até a posição final
+        return (
+            "<hierarchy rotation='0' width='720' height='1280'>"
+            "<android.widget.FrameLayout resource-id='' bounds='[0,0][720,1280]'>"
+            f"<android.widget.TextView resource-id='com.simulado:id/relogio' text='{self.leituras}' bounds='[0,0][720,60]'/>"
+            f"<android.widget.LinearLayout resource-id='com.simulado:id/tela_{self.tela}'"
+            f" bounds='[{deslocamento},80][{720 + deslocamento},1280]'/>"
+            "</android.widget.FrameLayout></hierarchy>"
+        )
+
+
+def medir_fluxo(classe, nome: str, device: DeviceSimulado) -> dict:
+    """Executa o fluxo com ações simuladas: (esperas, soma das pausas antigas, tempo medido)."""
+    page = classe(device)
+    for atributo, valor in vars(BasePage).items():
+        if callable(valor) and not atributo.startswith('_') and atributo not in _MEDIDOS:
+            setattr(page, atributo, MagicMock())
+    page.aguardar_primeiro.return_value = ("simulado", MagicMock())
+    page.tratar_interrupcoes.side_effect = lambda *i, estavel=False: page.aguardar_tela_estavel() and []
+
+    esperas = []
+    original = BasePage.aguardar_tela_estavel
+
+    def _aguardar(self, tempo_maximo: float = 1.5, **kwargs):
+        device.acao()
+        inicio = time.perf_counter()
+        original(self, tempo_maximo=tempo_maximo, **kwargs)
+        esperas.append((tempo_maximo, time.perf_counter() - inicio))
+        return True
+
+    fluxo = getattr(classe, nome).__wrapped__  # sem o @cronometrar_fluxo (não entra no resumo)
+    with patch.object(BasePage, 'aguardar_tela_estavel', _aguardar), patch('pages.base_page.logger'):
+        fluxo(page)
+    return {
+        'esperas': len(esperas),
+        'antes': sum(pausa for pausa, _ in esperas),
+        'depois': sum(tempo for _, tempo in esperas),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da espera por tela estável (device simulado)")
+    parser.add_argument('--latencia', type=float, default=0.1, help="Latência do page_source em s (padrão: 0.1)")
+    parser.add_argument('--transicao', type=float, default=0.5, help="Duração da transição após cada ação em s (padrão: 0.5)")
+    args = parser.parse_args()
+
+    print(f"Device simulado: page_source {args.latencia}s, transicao {args.transicao}s, relogio na tela")
+    total_antes = total_depois = 0.0
+    for classe, nome in FLUXOS:
+        device = DeviceSimulado(args.latencia, args.transicao)
+        r = medir_fluxo(classe, nome, device)
+        total_antes += r['antes']
+        total_depois += r['depois']
+        print(f"   {classe.__name__ + '.' + nome:56} {r['esperas']:2} espera(s) | antes {r['antes']:5.1f}s"
+              f" | depois {r['depois']:5.2f}s | {device.leituras:3} page_source")
+    print(f"   {'TOTAL':67} | antes {total_antes:5.1f}s | depois {total_depois:5.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
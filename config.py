@@ -1,10 +1,19 @@
-import subprocess
+import re
 import sys
+import json
+import time
+import queue
+import atexit
 import logging
 import os
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 from appium.options.android import UiAutomator2Options
 
+import adb_client
+import port_leases
+
 # Fix encoding para Windows
 if sys.platform == 'win32':
     try:
@@ -110,30 +119,176 @@ class LogStyle:
         """Formata mensagem de aviso."""
         return f"{Cores.AMARELO}{msg}{Cores.RESET}"
 
+
+# Sequências ANSI (removidas das mensagens de texto no log em arquivo)
+_ANSI = re.compile(r"\033\[[0-9;]*m")
+
+
+class EventoLog:
+    """
+    Evento de log estruturado - ação, locator, valor, duração... como campos.
+
+    O texto só é montado quando um handler formata o registro: nada é formatado se
+    o nível estiver desligado. O console (str) recebe o texto colorido; o arquivo
+    recebe os campos em JSON (FormatadorJson).
+
+    Uso:
+        logger.info(EventoLog("clique", LogStyle.CLICK, "Clicando em {locator}...", locator="btn_ok"))
+    """
+
+    __slots__ = ("acao", "estilo", "texto", "recuo", "campos")
+
+    def __init__(self, acao: str, estilo: str, texto: str, recuo: bool = True, **campos):
+        """
+        Args:
+            acao: nome da ação (campo "acao" no JSON).
+            estilo: prefixo do console (constante de LogStyle).
+            texto: modelo da mensagem; {locator}, {valor} e os demais campos são preenchidos.
+            recuo: indenta a linha no console (passos dentro de um fluxo).
+        """
+        self.acao = acao
+        self.estilo = estilo
+        self.texto = texto
+        self.recuo = recuo
+        self.campos = campos
+
+    def mensagem(self, cores: bool = True) -> str:
+        """Texto do evento, colorido (console) ou puro (arquivo)."""
+        valores = dict(self.campos)
+        if "locator" in valores:
+            valores["locator"] = LogStyle.elemento(valores["locator"]) if cores else f"'{valores['locator']}'"
+        if "valor" in valores:
+            valores["valor"] = LogStyle.valor(valores["valor"]) if cores else f"'{valores['valor']}'"
+        texto = self.texto.format(**valores)
+        if not cores:
+            return texto
+        return f"{'   ' if self.recuo else ''}{self.estilo} {texto}"
+
+    def __str__(self):
+        return self.mensagem()
+
+    def __repr__(self):
+        return f"EventoLog({self.acao!r}, {self.campos!r})"
+
+
+class FormatadorJson(logging.Formatter):
+    """Uma linha JSON compacta por registro; EventoLog vira campos, texto sem cores."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        evento = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "nivel": record.levelname,
+        }
+        if isinstance(record.msg, EventoLog):
+            evento["acao"] = record.msg.acao
+            evento.update({chave: _valor_json(valor) for chave, valor in record.msg.campos.items()})
+            evento["msg"] = record.msg.mensagem(cores=False)
+        else:
+            evento["msg"] = _ANSI.sub("", record.getMessage()).strip()
+        if record.exc_info:
+            evento["exc"] = self.formatException(record.exc_info)
+        return json.dumps(evento, ensure_ascii=False, separators=(",", ":"))
+
+
+def _valor_json(valor):
+    if valor is None or isinstance(valor, (str, int, float, bool)):
+        return round(valor, 3) if isinstance(valor, float) else valor
+    return str(valor)
+
+
+class _QueueHandlerSemFormatacao(QueueHandler):
+    """
+    QueueHandler que enfileira o registro como está.
+
+    O prepare() padrão formata a mensagem na thread do teste (e troca o EventoLog
+    por texto). A fila é do próprio processo, então o registro não precisa ser
+    serializado: a formatação fica toda com o listener.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
 # Diretórios
 LOGS_DIR = Path("logs")
 SCREENSHOTS_DIR = LOGS_DIR / "screenshots"
 REPORTS_DIR = LOGS_DIR / "reports"
+# Resultados do benchmark de locators por modelo de device (criado sob demanda)
+BENCHMARK_DIR = LOGS_DIR / "benchmark"
+# Caches persistidos entre execuções (criado sob demanda)
+CACHE_DIR = LOGS_DIR / "cache"
 
 # Cria diretórios se não existirem
 LOGS_DIR.mkdir(parents=True, exist_ok=True)
 SCREENSHOTS_DIR.mkdir(parents=True, exist_ok=True)
 REPORTS_DIR.mkdir(parents=True, exist_ok=True)
 
-# Logger configurado - pytest cuida do console (log_cli), nos so salvamos em arquivo
+# Logger configurado - pytest cuida do console (log_cli), nos so salvamos em arquivo.
+# O arquivo e escrito fora da thread do teste: logger.info so enfileira o registro
+# (QueueHandler) e um QueueListener por processo grava no RotatingFileHandler.
+# Com delay=True o arquivo so e criado quando chega o primeiro registro.
 logger = logging.getLogger("appium_test")
 logger.setLevel(logging.INFO)
 
+LOG_MAX_BYTES = int(os.environ.get("LOG_MAX_BYTES", 10 * 1024 * 1024))
+LOG_BACKUPS = int(os.environ.get("LOG_BACKUPS", 5))
+
+
+def configurar_log_assincrono(log: logging.Logger, arquivo: Path, nivel: int = logging.INFO):
+    """
+    Liga o logger a um arquivo com rotacao por tamanho, gravado em background.
+    Uma linha JSON por registro (FormatadorJson), formatada na thread do listener.
+
+    Returns:
+        (file_handler, listener) - o listener ja iniciado.
+    """
+    file_handler = RotatingFileHandler(arquivo, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS,
+                                       encoding='utf-8', delay=True)
+    file_handler.setLevel(nivel)
+    file_handler.setFormatter(FormatadorJson())
+    fila = queue.SimpleQueue()
+    queue_handler = _QueueHandlerSemFormatacao(fila)
+    # Filtra o nivel antes de enfileirar: DEBUG nem entra na fila
+    queue_handler.setLevel(nivel)
+    listener = QueueListener(fila, file_handler, respect_handler_level=True)
+    log.addHandler(queue_handler)
+    listener.start()
+    return file_handler, listener
+
+
+def descarregar_logs():
+    """Espera a fila de logs ser gravada (ex: antes de ler o arquivo de log)."""
+    if log_listener is None:
+        return
+    # stop() processa o que ja esta na fila e encerra a thread; start() sobe outra
+    log_listener.stop()
+    log_listener.start()
+    file_handler.flush()
+
+
+def redirecionar_log(diretorio: Path):
+    """
+    Passa o arquivo de log desta execução para outro diretório (ex: temporário
+    nos testes unitários). Chamar antes do primeiro registro: com delay=True o
+    arquivo ainda não foi criado.
+    """
+    global log_filename
+    if file_handler is None:
+        return
+    descarregar_logs()
+    file_handler.close()
+    Path(diretorio).mkdir(parents=True, exist_ok=True)
+    log_filename = Path(diretorio) / log_filename.name
+    file_handler.baseFilename = os.path.abspath(log_filename)
+
+
 # Handler para arquivo (console é gerenciado pelo pytest log_cli)
-from datetime import datetime
-log_filename = LOGS_DIR / f"teste_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
-file_handler = logging.FileHandler(log_filename, encoding='utf-8')
-file_handler.setLevel(logging.INFO)
-file_handler.setFormatter(logging.Formatter('%(asctime)s [%(levelname)s] %(message)s', datefmt='%H:%M:%S'))
+log_filename = LOGS_DIR / f"teste_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"
+file_handler = log_listener = None
 
 # Adiciona handler (evita duplicação)
 if not logger.handlers:
-    logger.addHandler(file_handler)
+    file_handler, log_listener = configurar_log_assincrono(logger, log_filename)
+    atexit.register(log_listener.stop)
     # Propaga para pytest capturar e mostrar no console com cores
     logger.propagate = True
 
@@ -146,9 +301,7 @@ def get_connected_device_udid(permitir_multiplos: bool = False):
     """
     print("-> Procurando por dispositivos Android conectados...")
     try:
-        resultado = subprocess.check_output(['adb', 'devices'], text=True)
-        linhas = resultado.strip().split('\n')
-        dispositivos = [l.split('\t')[0] for l in linhas[1:] if l.strip() and '\tdevice' in l]
+        dispositivos = adb_client.cliente().dispositivos()
 
         if len(dispositivos) == 0:
             raise RuntimeError("ERRO: Nenhum dispositivo Android foi encontrado.")
@@ -174,10 +327,7 @@ def get_connected_device_udid(permitir_multiplos: bool = False):
 def get_all_connected_devices():
     """Retorna lista de todos os dispositivos conectados."""
     try:
-        resultado = subprocess.check_output(['adb', 'devices'], text=True)
-        linhas = resultado.strip().split('\n')
-        dispositivos = [l.split('\t')[0] for l in linhas[1:] if l.strip() and '\tdevice' in l]
-        return dispositivos
+        return adb_client.cliente().dispositivos()
     except:
         return []
 
@@ -208,25 +358,113 @@ APP_TARGETS = {
     }
 } 
 
+# Layout de telas por flavor: "device" (Iniciar Venda / Selecionar Cliente por texto)
+# ou "playstore" (Venda / botões por ID). Flavors fora daqui ainda não foram
+# mapeados - as páginas continuam descobrindo a versão pela tela.
+LAYOUT_POR_FLAVOR = {
+    "REDEL400": "device",
+    "Stone": "device",
+    "Playstore": "playstore",
+}
+
+
+# Índice package -> app (flavor, ambiente, activity), na ordem de prioridade de APP_TARGETS
+APPS_POR_PACOTE = {
+    info["package"]: {"flavor": flavor, "ambiente": ambiente, **info}
+    for flavor, ambientes in APP_TARGETS.items()
+    for ambiente, info in ambientes.items()
+}
+
+
+def flavor_do_pacote(package: str):
+    """Retorna o flavor de APP_TARGETS (ex: 'Stone') dono do package, ou None."""
+    if not isinstance(package, str):
+        return None
+    app = APPS_POR_PACOTE.get(package)
+    return app["flavor"] if app else None
+
+
+# Cache device -> app detectado: validade antes de conferir de novo no device (segundos)
+CACHE_APPS_ARQUIVO = CACHE_DIR / "apps_por_device.json"
+CACHE_APPS_VALIDADE = int(os.environ.get("CACHE_APPS_VALIDADE", 24 * 3600))
+_APPS_POR_DEVICE = {}
+
+
+def _ler_cache_apps() -> dict:
+    try:
+        with open(CACHE_APPS_ARQUIVO, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _gravar_cache_apps(device_id: str, entrada: dict):
+    """Grava a entrada do device (relê o arquivo antes: outros processos podem ter gravado)."""
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        cache = _ler_cache_apps()
+        cache[device_id] = entrada
+        temporario = CACHE_APPS_ARQUIVO.with_suffix(f".{os.getpid()}.tmp")
+        with open(temporario, "w", encoding="utf-8") as f:
+            json.dump(cache, f, indent=2)
+        os.replace(temporario, CACHE_APPS_ARQUIVO)
+    except OSError as e:
+        print(f"[AVISO] Nao foi possivel gravar o cache de apps: {e}")
+
+
+def _instalado_em(device_id: str, package: str):
+    """lastUpdateTime do package no device (muda a cada instalação), ou None se não instalado/sem resposta."""
+    try:
+        saida = adb_client.cliente().shell(device_id, f"dumpsys package {package} | grep -m1 lastUpdateTime", timeout=30)
+    except Exception:
+        return None
+    return saida.strip().partition("=")[2] or None
+
+
 def discover_target_app(device_id: str = None):
     """
     Detecta o app alvo instalado no dispositivo.
+    Usa o cache por device (memória e disco, em CACHE_DIR): dentro da validade não
+    chama o adb; vencida a validade, confere só a data de instalação do app em
+    cache e refaz a detecção se ela mudou, o app sumiu ou a data não pôde ser lida.
 
     Args:
         device_id: ID do dispositivo. Se None, usa o primeiro disponivel.
     """
+    chave = device_id or ""
+    entrada = _APPS_POR_DEVICE.get(chave) or _ler_cache_apps().get(chave)
+    if entrada:
+        if time.time() - entrada.get("verificado_em", 0) < CACHE_APPS_VALIDADE:
+            _APPS_POR_DEVICE[chave] = entrada
+            return entrada["package"], entrada["activity"]
+        # Sem data de instalação (dumpsys falhou na gravação ou agora) não há como
+        # validar: None == None não conta, a detecção é refeita
+        instalado_em = entrada.get("instalado_em")
+        if instalado_em is not None and _instalado_em(device_id, entrada["package"]) == instalado_em:
+            entrada = dict(entrada, verificado_em=time.time())
+            _APPS_POR_DEVICE[chave] = entrada
+            _gravar_cache_apps(chave, entrada)
+            return entrada["package"], entrada["activity"]
+        print(f"   [INFO] App em cache mudou no dispositivo {device_id or 'padrao'}, detectando de novo...")
+
+    package, activity = _detectar_app(device_id)
+    entrada = {
+        "package": package, "activity": activity,
+        "instalado_em": _instalado_em(device_id, package), "verificado_em": time.time(),
+    }
+    _APPS_POR_DEVICE[chave] = entrada
+    _gravar_cache_apps(chave, entrada)
+    return package, activity
+
+
+def _detectar_app(device_id: str = None):
+    """Detecta o app alvo pela lista de pacotes do device (pm list packages)."""
     print(f"-> Procurando por aplicativos de teste no dispositivo {device_id or 'padrao'}...")
     try:
-        # Monta comando adb com ou sem device_id
-        if device_id:
-            cmd = ['adb', '-s', device_id, 'shell', 'pm', 'list', 'packages']
-        else:
-            cmd = ['adb', 'shell', 'pm', 'list', 'packages']
-
-        resultado = subprocess.check_output(cmd, text=True, timeout=30)
-        pacotes_instalados = [p.replace('package:', '') for p in resultado.strip().split('\n')]
-        pacotes_conhecidos = [env_info for flavor_info in APP_TARGETS.values() for env_info in flavor_info.values()]
-        apps_encontrados = [app_info for app_info in pacotes_conhecidos if app_info["package"] in pacotes_instalados]
+        # Shell persistente do device (sem device_id: o unico conectado)
+        resultado = adb_client.cliente().shell(device_id, 'pm list packages', timeout=30)
+        pacotes_instalados = {p.strip().replace('package:', '') for p in resultado.strip().split('\n')}
+        apps_encontrados = [app_info for package, app_info in APPS_POR_PACOTE.items() if package in pacotes_instalados]
 
         if len(apps_encontrados) == 1:
             app_encontrado = apps_encontrados[0]
@@ -239,7 +477,7 @@ def discover_target_app(device_id: str = None):
             app_encontrado = apps_encontrados[0]
             print(f"   [INFO] Multiplos apps encontrados. Usando: {app_encontrado['package']}")
             return app_encontrado["package"], app_encontrado["activity"]
-    except subprocess.TimeoutExpired:
+    except TimeoutError:
         raise RuntimeError("ERRO: Timeout ao listar pacotes do dispositivo.")
     except Exception as e:
         raise RuntimeError(f"Falha ao detectar o app alvo: {e}")
@@ -248,36 +486,40 @@ APPIUM_SERVER_URL = "http://127.0.0.1:4723"
 DEFAULT_WAIT = 30
 RETRY_ATTEMPTS = 2
 
-# Inicializacao - detecta devices conectados
-# Quando ha multiplos devices, nao tenta detectar app automaticamente
-# O app sera detectado em get_appium_options() com device_id especifico
-try:
-    dispositivos = get_all_connected_devices()
-    if len(dispositivos) == 1:
-        DEVICE_NAME = dispositivos[0]
-        APP_PACKAGE, APP_ACTIVITY = discover_target_app(DEVICE_NAME)
-    elif len(dispositivos) > 1:
-        # Multiplos devices - nao detecta app aqui, sera feito por device
-        print(f"[INFO] {len(dispositivos)} dispositivos conectados - deteccao de app sera por device")
-        DEVICE_NAME = dispositivos[0]  # Primeiro como padrao
-        APP_PACKAGE = None
-        APP_ACTIVITY = None
-    else:
-        DEVICE_NAME = None
-        APP_PACKAGE = None
-        APP_ACTIVITY = None
-except RuntimeError as e:
-    print(f"\n[!!!] ERRO DE INICIALIZACAO [!!!]\n{e}\n")
-    DEVICE_NAME = None
-    APP_PACKAGE = None
-    APP_ACTIVITY = None
-
-def _calcular_porta_unica(device_id: str, base_port: int = 8200) -> int:
-    """Calcula uma porta unica baseada no device_id para evitar conflitos."""
-    # Usa hash do device_id para gerar um offset (0-99)
-    offset = abs(hash(device_id)) % 100
-    return base_port + offset
-
+# Device e app padrao - descobertos no primeiro acesso, nao no import.
+# Importar config (conftest, page objects, testes unitarios, cada subprocesso do
+# parallel_runner) nao chama o adb; DEVICE_NAME/APP_PACKAGE/APP_ACTIVITY sao
+# resolvidos por __getattr__ na primeira leitura e memorizados.
+# Quando ha multiplos devices, o app nao e detectado aqui: get_appium_options()
+# detecta por device_id especifico.
+_DESCOBERTA = {}
+_NOMES_DESCOBERTOS = ("DEVICE_NAME", "APP_PACKAGE", "APP_ACTIVITY")
+
+
+def _descobrir_padrao() -> dict:
+    """Device padrao e app detectado nele (uma vez por processo)."""
+    if _DESCOBERTA:
+        return _DESCOBERTA
+    device_name = app_package = app_activity = None
+    try:
+        dispositivos = get_all_connected_devices()
+        if len(dispositivos) == 1:
+            device_name = dispositivos[0]
+            app_package, app_activity = discover_target_app(device_name)
+        elif len(dispositivos) > 1:
+            # Multiplos devices - nao detecta app aqui, sera feito por device
+            print(f"[INFO] {len(dispositivos)} dispositivos conectados - deteccao de app sera por device")
+            device_name = dispositivos[0]  # Primeiro como padrao
+    except RuntimeError as e:
+        print(f"\n[!!!] ERRO DE INICIALIZACAO [!!!]\n{e}\n")
+    _DESCOBERTA.update(DEVICE_NAME=device_name, APP_PACKAGE=app_package, APP_ACTIVITY=app_activity)
+    return _DESCOBERTA
+
+
+def __getattr__(nome: str):
+    if nome in _NOMES_DESCOBERTOS:
+        return _descobrir_padrao()[nome]
+    raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
 
 def get_appium_options(limpar_dados_app: bool = False, device_id: str = None):
     """
@@ -288,7 +530,7 @@ def get_appium_options(limpar_dados_app: bool = False, device_id: str = None):
         device_id: ID do dispositivo (UDID). Se None, usa o detectado automaticamente.
     """
     # Determina device a usar
-    device_para_usar = device_id or DEVICE_NAME
+    device_para_usar = device_id or _descobrir_padrao()["DEVICE_NAME"]
 
     if not device_para_usar:
         raise RuntimeError("Nenhum dispositivo especificado e nenhum detectado automaticamente")
@@ -302,9 +544,10 @@ def get_appium_options(limpar_dados_app: bool = False, device_id: str = None):
         print(f"[APPIUM] App detectado: {app_package}")
     except Exception as e:
         print(f"[AVISO] Falha ao detectar app no device {device_para_usar}: {e}")
-        if APP_PACKAGE:
-            app_package = APP_PACKAGE
-            app_activity = APP_ACTIVITY
+        padrao = _descobrir_padrao()
+        if padrao["APP_PACKAGE"]:
+            app_package = padrao["APP_PACKAGE"]
+            app_activity = padrao["APP_ACTIVITY"]
         else:
             raise RuntimeError(f"Nao foi possivel detectar o app no dispositivo {device_para_usar}")
 
@@ -316,10 +559,11 @@ def get_appium_options(limpar_dados_app: bool = False, device_id: str = None):
     options.set_capability("udid", device_para_usar)
     options.device_name = device_para_usar
 
-    # IMPORTANTE: systemPort unico por device para evitar conflitos UiAutomator2
-    system_port = _calcular_porta_unica(device_para_usar)
-    options.set_capability("systemPort", system_port)
-    print(f"[APPIUM] SystemPort para {device_para_usar}: {system_port}")
+    # IMPORTANTE: portas do UiAutomator2 unicas por device (alugadas, estaveis entre execucoes)
+    portas = port_leases.alugar(device_para_usar)
+    for capability in ("systemPort", "mjpegServerPort", "chromedriverPort"):
+        options.set_capability(capability, portas[capability])
+    print(f"[APPIUM] SystemPort para {device_para_usar}: {portas['systemPort']}")
 
     options.app_package = app_package
     options.no_reset = not limpar_dados_app
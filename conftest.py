@@ -8,19 +8,26 @@ import pytest
 import allure
 import os
 import json
+import tempfile
 from datetime import datetime
 from pathlib import Path
 from appium import webdriver
 
+import adb_client
+from driver_pool import ESTATISTICAS_POOL, PoolDeSessoes, economia_estimada
 from config import (
     APPIUM_SERVER_URL,
     get_appium_options,
     SCREENSHOTS_DIR,
-    APP_PACKAGE,
-    logger
+    logger,
+    redirecionar_log,
 )
 from pages.login_page import LoginPage
 from pages.home_page import HomePage
+from pages.base_page import DURACOES_FLUXOS, ESTATISTICAS_SCROLL, ESTATISTICAS_TELA_ESTAVEL
+from pages.espera import ESTATISTICAS_ESPERAS
+from pages.retry import CONTADORES_RETRY
+from pages.interrupcoes import INTERRUPCOES_TRATADAS
 from test_data import test_data
 
 
@@ -81,6 +88,11 @@ def pytest_collection_modifyitems(session, config, items):
     Hook para ordenar os testes baseado na lista ORDEM_TESTES.
     Testes nao listados rodam por ultimo na ordem original.
     """
+    # Só testes unitários (sem device): o log da execução vai para um diretório temporário
+    unitarios = Path(__file__).parent / "tests" / "unit"
+    if items and all(unitarios in Path(str(item.fspath)).parents for item in items):
+        redirecionar_log(Path(tempfile.mkdtemp(prefix="logs_unit_")))
+
     def obter_ordem(item):
         nome = item.name
         try:
@@ -105,26 +117,127 @@ def pytest_configure(config):
     # Cria diretórios necessários
     SCREENSHOTS_DIR.mkdir(parents=True, exist_ok=True)
     ALLURE_RESULTS_DIR.mkdir(parents=True, exist_ok=True)
-
-    # Cria arquivo de ambiente para o Allure
-    _criar_ambiente_allure(config)
+    # O arquivo de ambiente do Allure e criado no primeiro driver (_criar_ambiente_allure):
+    # assim o pytest sobe sem consultar o adb (testes unitarios, coleta, --help)
+
+
+def pytest_terminal_summary(terminalreporter):
+    """Mostra a duração (wall-clock) de cada fluxo e o custo das esperas, retries, popups e buscas com scroll."""
+    _resumo_esperas(terminalreporter)
+    _resumo_tela_estavel(terminalreporter)
+    _resumo_retries(terminalreporter)
+    _resumo_interrupcoes(terminalreporter)
+    _resumo_pool(terminalreporter)
+    _resumo_buscas_scroll(terminalreporter)
+    if not DURACOES_FLUXOS:
+        return
+    terminalreporter.write_sep("-", "DURACAO DOS FLUXOS")
+    for nome, duracoes in sorted(DURACOES_FLUXOS.items()):
+        media = sum(duracoes) / len(duracoes)
+        terminalreporter.write_line(f"  {nome}: {media:.1f}s (media de {len(duracoes)} execucao(oes))")
+
+
+def _resumo_esperas(terminalreporter):
+    """Esperas por condição: quantidade, consultas ao Appium e tempo médio."""
+    if not ESTATISTICAS_ESPERAS:
+        return
+    terminalreporter.write_sep("-", "ESPERAS")
+    for condicao, esperas in sorted(ESTATISTICAS_ESPERAS.items()):
+        consultas = sum(e['consultas'] for e in esperas) / len(esperas)
+        tempo = sum(e['tempo'] for e in esperas) / len(esperas)
+        estouros = sum(1 for e in esperas if not e['sucesso'])
+        terminalreporter.write_line(
+            f"  {condicao}: {len(esperas)} espera(s), {consultas:.1f} consulta(s) e {tempo:.2f}s em media, {estouros} sem sucesso"
+        )
+
+
+def _resumo_tela_estavel(terminalreporter):
+    """Esperas por tela estável (no lugar das pausas fixas): quantidade, tempo médio e estouros."""
+    esperas = ESTATISTICAS_TELA_ESTAVEL['esperas']
+    if not esperas:
+        return
+    terminalreporter.write_sep("-", "ESPERAS POR TELA ESTAVEL")
+    terminalreporter.write_line(
+        f"  {esperas} espera(s), {ESTATISTICAS_TELA_ESTAVEL['tempo']:.1f}s no total "
+        f"(media {ESTATISTICAS_TELA_ESTAVEL['tempo'] / esperas:.2f}s, "
+        f"{ESTATISTICAS_TELA_ESTAVEL['estouradas']} sem estabilizar no tempo maximo)"
+    )
 
 
-def _criar_ambiente_allure(config):
-    """Cria arquivo environment.properties para o Allure."""
+def _resumo_retries(terminalreporter):
+    """Locators que precisaram de retry ou falharam: tentativas, retries, fatais e esgotados."""
+    contadores = {chave: c for chave, c in CONTADORES_RETRY.items() if c['retries'] or c['fatais'] or c['esgotados']}
+    if not contadores:
+        return
+    terminalreporter.write_sep("-", "RETRIES")
+    for chave, c in sorted(contadores.items(), key=lambda item: -item[1]['retries']):
+        terminalreporter.write_line(
+            f"  {chave}: {c['tentativas']} tentativa(s), {c['retries']} retry(s), {c['fatais']} fatal(is), {c['esgotados']} esgotado(s)"
+        )
+
+
+def _resumo_interrupcoes(terminalreporter):
+    """Popups/diálogos dispensados pelo registro de interrupções."""
+    if not INTERRUPCOES_TRATADAS:
+        return
+    terminalreporter.write_sep("-", "INTERRUPCOES")
+    for nome, vezes in sorted(INTERRUPCOES_TRATADAS.items()):
+        terminalreporter.write_line(f"  {nome}: dispensada {vezes} vez(es)")
+
+
+def _resumo_pool(terminalreporter):
+    """Sessões Appium criadas x reaproveitadas e o tempo economizado com o pool."""
+    criadas = ESTATISTICAS_POOL['criadas']
+    if not criadas:
+        return
+    reaproveitadas = ESTATISTICAS_POOL['reaproveitadas']
+    terminalreporter.write_sep("-", "SESSOES APPIUM")
+    terminalreporter.write_line(
+        f"  {criadas} criada(s) em {ESTATISTICAS_POOL['tempo_criacao'] / criadas:.1f}s em media, "
+        f"{reaproveitadas} reaproveitada(s) ({ESTATISTICAS_POOL['tempo_reset']:.1f}s de reset), "
+        f"{ESTATISTICAS_POOL['recriadas_apos_falha']} recriada(s) apos falha"
+    )
+    terminalreporter.write_line(f"  Economia estimada: {economia_estimada():.1f}s")
+    if ESTATISTICAS_POOL['logins_pulados']:
+        terminalreporter.write_line(f"  Verificacoes de login puladas: {ESTATISTICAS_POOL['logins_pulados']}")
+
+
+def _resumo_buscas_scroll(terminalreporter):
+    """Custo das buscas com scroll (rolar_ate_*): swipes e tempo por alvo."""
+    if not ESTATISTICAS_SCROLL:
+        return
+    terminalreporter.write_sep("-", "BUSCAS COM SCROLL")
+    for alvo, buscas in sorted(ESTATISTICAS_SCROLL.items()):
+        swipes = sum(b['swipes'] for b in buscas) / len(buscas)
+        tempo = sum(b['tempo'] for b in buscas) / len(buscas)
+        falhas = sum(1 for b in buscas if not b['encontrado'])
+        terminalreporter.write_line(
+            f"  {alvo}: {swipes:.1f} swipe(s), {tempo:.1f}s (media de {len(buscas)} busca(s), {falhas} sem sucesso)"
+        )
+
+
+_AMBIENTE_ALLURE_CRIADO = False
+
+
+def _criar_ambiente_allure(config, drv):
+    """Cria arquivo environment.properties para o Allure (uma vez, com a primeira sessão)."""
+    global _AMBIENTE_ALLURE_CRIADO
+    if _AMBIENTE_ALLURE_CRIADO:
+        return
+    _AMBIENTE_ALLURE_CRIADO = True
     try:
-        import subprocess
         import platform
 
-        # Obtém informações do dispositivo
-        device_id = config.getoption("--device-id", default=None)
+        # Device e app vêm da sessão criada (sem nova detecção via adb)
+        caps = drv.capabilities
+        device_id = config.getoption("--device-id", default=None) or caps.get('udid')
         appium_port = config.getoption("--appium-port", default=4723)
 
         # Informações do sistema
         env_info = {
             "Sistema Operacional": platform.system(),
             "Python": platform.python_version(),
-            "App Package": APP_PACKAGE,
+            "App Package": caps.get('appPackage') or caps.get('app_package'),
             "Servidor Appium": f"http://127.0.0.1:{appium_port}",
             "Device ID": device_id or "auto-detectar",
             "Data Execucao": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
@@ -139,25 +252,17 @@ def _criar_ambiente_allure(config):
 
         # Tenta obter info do dispositivo via ADB (pode falhar no CI)
         try:
-            if device_id:
-                cmd = ['adb', '-s', device_id, 'shell', 'getprop', 'ro.product.model']
-            else:
-                cmd = ['adb', 'shell', 'getprop', 'ro.product.model']
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=5)
-            if result.returncode == 0 and result.stdout.strip():
-                env_info["Modelo Dispositivo"] = result.stdout.strip()
+            modelo = adb_client.cliente().getprop(device_id, 'ro.product.model')
+            if modelo:
+                env_info["Modelo Dispositivo"] = modelo
         except:
             if IS_CI:
                 env_info["Modelo Dispositivo"] = "Emulador CI"
 
         try:
-            if device_id:
-                cmd = ['adb', '-s', device_id, 'shell', 'getprop', 'ro.build.version.release']
-            else:
-                cmd = ['adb', 'shell', 'getprop', 'ro.build.version.release']
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=5)
-            if result.returncode == 0 and result.stdout.strip():
-                env_info["Android Version"] = result.stdout.strip()
+            versao = adb_client.cliente().getprop(device_id, 'ro.build.version.release')
+            if versao:
+                env_info["Android Version"] = versao
         except:
             pass
 
@@ -214,6 +319,8 @@ def pytest_runtest_makereport(item, call):
     """Hook para capturar screenshots e logs em falhas."""
     outcome = yield
     report = outcome.get_result()
+    # Resultado de cada fase disponivel para as fixtures (item.rep_call)
+    setattr(item, f"rep_{report.when}", report)
 
     # Captura screenshot em falhas durante execucao do teste
     if report.when == "call" and report.failed:
@@ -251,10 +358,33 @@ def pytest_runtest_makereport(item, call):
 
 
 # --- Fixtures ---
+def _criar_sessao(appium_url: str, device_id: str, limpar_dados: bool):
+    """Cria uma sessão Appium nova (usada pelo pool de sessões)."""
+    # Obtem options com device_id especifico se fornecido
+    options = get_appium_options(limpar_dados_app=limpar_dados, device_id=device_id)
+
+    # Log das capabilities para debug
+    logger.info(f"[DEBUG] UDID nas capabilities: {options.get_capability('udid')}")
+    logger.info(f"[DEBUG] App package: {options.app_package}")
+
+    return webdriver.Remote(command_executor=appium_url, options=options)
+
+
+@pytest.fixture(scope="session")
+def pool_sessoes():
+    """Pool de sessões Appium da execução: uma por device, encerradas no final."""
+    pool = PoolDeSessoes(_criar_sessao)
+    yield pool
+    logger.info("Encerrando sessoes Appium...")
+    pool.encerrar()
+
+
 @pytest.fixture(scope="function")
-def driver(request):
+def driver(request, pool_sessoes):
     """
-    Fixture principal - Cria e gerencia o driver Appium.
+    Fixture principal - Entrega o driver Appium com o app reiniciado.
+    A sessão do device é reaproveitada entre os testes (pool_sessoes); só é
+    recriada se cair ou se o teste pedir dados limpos.
     Suporta multiplos dispositivos via parametros de linha de comando.
 
     Uso:
@@ -285,14 +415,8 @@ def driver(request):
     # Monta URL do Appium
     appium_url = f"http://127.0.0.1:{appium_port}"
 
-    # Obtem options com device_id especifico se fornecido
-    options = get_appium_options(limpar_dados_app=limpar_dados, device_id=device_id)
-
-    # Log das capabilities para debug
-    logger.info(f"[DEBUG] UDID nas capabilities: {options.get_capability('udid')}")
-    logger.info(f"[DEBUG] App package: {options.app_package}")
-
-    drv = webdriver.Remote(command_executor=appium_url, options=options)
+    drv = pool_sessoes.obter(appium_url, device_id, limpar_dados=limpar_dados)
+    _criar_ambiente_allure(request.config, drv)
 
     # Verifica em qual device realmente conectou e adiciona ao Allure
     try:
@@ -311,14 +435,22 @@ def driver(request):
 
     yield drv
 
-    logger.info("Encerrando driver...")
-    drv.quit()
+    # Teste sem driver_logado pode ter deslogado: a proxima sessao confere o login
+    if "driver_logado" not in request.fixturenames:
+        pool_sessoes.marcar_autenticada(drv, False)
+
+
+# Sessao autenticada no pool: so uma sonda curta da tela inicial decide pular o login
+# (sessao parada em outra tela cai no garantir_login sem gastar a espera cheia)
+SONDA_TELA_INICIAL = 3
 
 
 @pytest.fixture(scope="function")
-def driver_logado(driver):
+def driver_logado(request, driver, pool_sessoes):
     """
     Fixture que garante que o usuario esta logado.
+    Se o teste anterior na mesma sessao terminou logado, so confirma a tela
+    inicial com uma sonda curta (sem sondar o login nem refazer o fluxo de login).
 
     Uso:
         def test_venda(driver_logado):
@@ -327,20 +459,28 @@ def driver_logado(driver):
     login_page = LoginPage(driver)
     home_page = HomePage(driver)
 
-    # Usa garantir_login que lida com app ja configurado
-    login_page.garantir_login(
-        ip=test_data.SERVER_IP,
-        porta=test_data.SERVER_PORT,
-        empresa=test_data.COMPANY,
-        usuario=test_data.USER,
-        senha=test_data.PASSWORD
-    )
-
-    # Aguarda tela inicial carregar
-    assert home_page.tela_inicial_exibida(timeout=30), "Falha ao fazer login"
-
-    logger.info("Usuario logado com sucesso.")
-    return driver
+    if pool_sessoes.autenticada(driver) and home_page.tela_inicial_exibida(timeout=SONDA_TELA_INICIAL):
+        ESTATISTICAS_POOL['logins_pulados'] += 1
+        logger.info("Sessao ja autenticada no teste anterior: verificacao de login pulada.")
+    else:
+        # Usa garantir_login que lida com app ja configurado
+        login_page.garantir_login(
+            ip=test_data.SERVER_IP,
+            porta=test_data.SERVER_PORT,
+            empresa=test_data.COMPANY,
+            usuario=test_data.USER,
+            senha=test_data.PASSWORD
+        )
+
+        # Aguarda tela inicial carregar
+        assert home_page.tela_inicial_exibida(timeout=30), "Falha ao fazer login"
+        logger.info("Usuario logado com sucesso.")
+
+    yield driver
+
+    # So confia no login no proximo teste se este terminou sem falha
+    relatorio = getattr(request.node, "rep_call", None)
+    pool_sessoes.marcar_autenticada(driver, bool(relatorio and relatorio.passed))
 
 
 @pytest.fixture
@@ -0,0 +1,133 @@
+"""
+Pool de sessões Appium - uma sessão por device, reaproveitada entre os testes.
+
+Criar um webdriver.Remote custa o setup completo do UiAutomator2 (instalação/
+verificação do servidor no device, instrumentation, forceAppLaunch). Aqui a
+sessão é criada uma vez por device e, entre os testes, o app é reiniciado com
+terminate_app + activate_app - o mesmo efeito do forceAppLaunch, sem nova sessão.
+
+Uma sessão nova só é criada:
+  - na primeira vez em cada device;
+  - quando a sessão atual não responde (UiAutomator2 caiu, sessão expirou);
+  - quando o teste pede dados limpos (noReset=False só vale na criação).
+
+O pool também lembra quais sessões terminaram o último teste autenticadas: o
+login persiste nos dados do app (noReset) e sobrevive ao reinício, então o
+próximo teste só confirma a tela inicial, sem sondar o login. Sessão nova (queda
+ou dados limpos) começa sem essa marca.
+
+Tempos de criação e de reset ficam em ESTATISTICAS_POOL para estimar a economia
+(resumo no final da execução, em conftest.py).
+"""
+import time
+import logging
+
+
+logger = logging.getLogger("appium_test")
+
+# Custo das sessões: criadas, reaproveitadas, recriadas após falha, segundos gastos, logins pulados
+ESTATISTICAS_POOL = {
+    'criadas': 0,
+    'reaproveitadas': 0,
+    'recriadas_apos_falha': 0,
+    'tempo_criacao': 0.0,
+    'tempo_reset': 0.0,
+    'logins_pulados': 0,
+}
+
+
+def economia_estimada() -> float:
+    """Segundos economizados: criações evitadas (pelo tempo médio de criação) menos o custo dos resets."""
+    criadas = ESTATISTICAS_POOL['criadas']
+    if not criadas:
+        return 0.0
+    media_criacao = ESTATISTICAS_POOL['tempo_criacao'] / criadas
+    return ESTATISTICAS_POOL['reaproveitadas'] * media_criacao - ESTATISTICAS_POOL['tempo_reset']
+
+
+class PoolDeSessoes:
+    """Sessões Appium por device (e servidor), reiniciando o app entre os testes."""
+
+    def __init__(self, criar_sessao):
+        """
+        Args:
+            criar_sessao: função(appium_url, device_id, limpar_dados) -> webdriver.Remote.
+        """
+        self._criar_sessao = criar_sessao
+        self._sessoes = {}
+        # session_id das sessões cujo último teste terminou autenticado
+        self._autenticadas = set()
+
+    def _criar(self, chave: tuple, limpar_dados: bool):
+        appium_url, device_id = chave
+        inicio = time.monotonic()
+        drv = self._criar_sessao(appium_url, device_id, limpar_dados)
+        duracao = time.monotonic() - inicio
+        ESTATISTICAS_POOL['criadas'] += 1
+        ESTATISTICAS_POOL['tempo_criacao'] += duracao
+        logger.info(f"[POOL] Sessao criada para {device_id or 'device padrao'} em {duracao:.1f}s")
+        self._sessoes[chave] = drv
+        return drv
+
+    @staticmethod
+    def _pacote(drv) -> str:
+        caps = drv.capabilities
+        return caps.get('appPackage') or caps.get('app_package')
+
+    def _reiniciar_app(self, drv):
+        """Reinicia o app da sessão (equivale ao forceAppLaunch). Falha = sessão quebrada."""
+        pacote = self._pacote(drv)
+        inicio = time.monotonic()
+        drv.terminate_app(pacote)
+        drv.activate_app(pacote)
+        ESTATISTICAS_POOL['tempo_reset'] += time.monotonic() - inicio
+
+    def obter(self, appium_url: str, device_id: str = None, limpar_dados: bool = False):
+        """
+        Sessão pronta para um teste: app reiniciado na tela inicial.
+        Reaproveita a sessão do device se ela ainda responde; senão cria outra.
+        """
+        chave = (appium_url, device_id)
+        drv = self._sessoes.get(chave)
+        if drv is None:
+            return self._criar(chave, limpar_dados)
+        if limpar_dados:
+            logger.info("[POOL] Teste pede dados limpos: nova sessao")
+            self.descartar(appium_url, device_id)
+            return self._criar(chave, limpar_dados)
+        try:
+            self._reiniciar_app(drv)
+        except Exception as e:
+            logger.warning(f"[POOL] Sessao sem resposta ({type(e).__name__}), criando outra")
+            ESTATISTICAS_POOL['recriadas_apos_falha'] += 1
+            self.descartar(appium_url, device_id)
+            return self._criar(chave, limpar_dados)
+        ESTATISTICAS_POOL['reaproveitadas'] += 1
+        logger.info(f"[POOL] Sessao reaproveitada ({drv.session_id})")
+        return drv
+
+    def descartar(self, appium_url: str, device_id: str = None):
+        """Encerra a sessão do device (se houver); a próxima chamada a obter() cria outra."""
+        drv = self._sessoes.pop((appium_url, device_id), None)
+        if drv is not None:
+            self._autenticadas.discard(drv.session_id)
+            try:
+                drv.quit()
+            except Exception:
+                pass
+
+    def autenticada(self, drv) -> bool:
+        """True se o último teste nesta sessão terminou com o usuário logado."""
+        return drv.session_id in self._autenticadas
+
+    def marcar_autenticada(self, drv, autenticada: bool = True):
+        """Registra (ou esquece) que a sessão está com o usuário logado."""
+        if autenticada:
+            self._autenticadas.add(drv.session_id)
+        else:
+            self._autenticadas.discard(drv.session_id)
+
+    def encerrar(self):
+        """Encerra todas as sessões do pool (fim da execução)."""
+        for appium_url, device_id in list(self._sessoes):
+            self.descartar(appium_url, device_id)
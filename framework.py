@@ -1,38 +1,28 @@
 import os
-import sys
 import time
 import traceback
 import logging
 from datetime import datetime
 from functools import wraps
 from pathlib import Path
-import subprocess
 
 from appium.webdriver.common.appiumby import AppiumBy
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.common.action_chains import ActionChains
-from selenium.webdriver.common.actions import interaction
-from selenium.webdriver.common.actions.pointer_input import PointerInput
-from selenium.webdriver.common.actions.action_builder import ActionBuilder
 
+import config
 from config import *
+from pages.locators import aguardar_por_xpath
+from pages.espera import EsperaAdaptativa
+from pages.gestos import regiao_scroll, rolar, tamanho_da_sessao
+from pages.teclado import fechar as fechar_teclado
+from pages.retry import executar_com_retry
 
 # --- ESTRUTURA DE LOGS E UTILITÁRIOS ---
 for d in (LOGS_DIR, SCREENSHOTS_DIR, REPORTS_DIR): d.mkdir(parents=True, exist_ok=True)
 logger = logging.getLogger("appium_test")
 logger.setLevel(logging.DEBUG)
-if not logger.handlers:
-    fmt = logging.Formatter("%(asctime)s [%(levelname)s] %(message)s", datefmt="%Y-%m-%d %H:%M:%S")
-    ch = logging.StreamHandler(sys.stdout)
-    ch.setLevel(logging.INFO)
-    ch.setFormatter(fmt)
-    logger.addHandler(ch)
-    fh = logging.FileHandler(REPORTS_DIR / f"run_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log", "w", "utf-8")
-    fh.setLevel(logging.DEBUG)
-    fh.setFormatter(fmt)
-    logger.addHandler(fh)
+# Arquivo de log: pipeline assincrono de config.py (fila + escritor em background)
 
 def timestamp():
     return datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
@@ -54,8 +44,8 @@ def write_report(status, start_time, end_time, extra=None):
         f.write("="*51+"\n        RELATÓRIO DE EXECUÇÃO DE TESTE\n"+"="*51+"\n\n")
         f.write(f"Data/Hora: {timestamp()}\nResultado Final: {status}\nDuração Total do Teste: {duracao_teste}\n\n--- Log completo ---\n")
         try:
-            fh.flush()
-            with (REPORTS_DIR / Path(fh.baseFilename).name).open("r", "utf-8") as mainlog: 
+            descarregar_logs()
+            with Path(file_handler.baseFilename).open("r", encoding="utf-8") as mainlog: 
                 f.write(mainlog.read())
         except Exception: 
             pass
@@ -75,24 +65,20 @@ def executar_passo(desc, func):
         raise
 
 def realizar_scroll_para_baixo(driver):
-    tamanho_tela = driver.get_window_size()
-    largura, altura = tamanho_tela['width'], tamanho_tela['height']
-    start_x, start_y, end_y = largura // 2, int(altura * 0.8), int(altura * 0.2)
-    actions = ActionChains(driver)
-    actions.w3c_actions = ActionBuilder(driver, mouse=PointerInput(interaction.POINTER_TOUCH, "touch"))
-    actions.w3c_actions.pointer_action.move_to_location(start_x, start_y).pointer_down().pause(0.2).move_to_location(start_x, end_y).release()
-    actions.perform()
+    # Gesto nativo do UiAutomator2 (tamanho da tela e região calculados uma vez por sessão)
+    return rolar(driver, regiao_scroll(tamanho_da_sessao(driver)))
 
 def find_clickable_by_id(driver, id, wait=DEFAULT_WAIT): 
-    full_id = f"{APP_PACKAGE}:id/{id}"
-    return WebDriverWait(driver, wait).until(EC.element_to_be_clickable((AppiumBy.ID, full_id)))
+    full_id = f"{config.APP_PACKAGE}:id/{id}"
+    return EsperaAdaptativa(driver, wait).until(EC.element_to_be_clickable((AppiumBy.ID, full_id)))
 
 def find_element_by_text(driver, text, wait=DEFAULT_WAIT): 
     locator = f'new UiSelector().textContains("{text}")'
-    return WebDriverWait(driver, wait).until(EC.presence_of_element_located((AppiumBy.ANDROID_UIAUTOMATOR, locator)))
+    return EsperaAdaptativa(driver, wait).until(EC.presence_of_element_located((AppiumBy.ANDROID_UIAUTOMATOR, locator)))
 
 def find_element_by_xpath(driver, xpath, wait=DEFAULT_WAIT): 
-    return WebDriverWait(driver, wait).until(EC.presence_of_element_located((AppiumBy.XPATH, xpath)))
+    # Traduz para UiSelector quando possível; XPath fica como fallback
+    return aguardar_por_xpath(driver, xpath, wait)
 
 def scroll_ate_encontrar_texto(driver, texto_a_procurar, max_scrolls=5):
     for _ in range(max_scrolls):
@@ -100,14 +86,11 @@ def scroll_ate_encontrar_texto(driver, texto_a_procurar, max_scrolls=5):
             return find_element_by_text(driver, texto_a_procurar, wait=2)
         except Exception:
             realizar_scroll_para_baixo(driver)
-            time.sleep(1)
     raise Exception(f"Não foi possível encontrar o elemento com o texto '{texto_a_procurar}' após {max_scrolls} tentativas.")
 
 def fechar_teclado_back(driver):
-    try:
-        subprocess.run(['adb', 'shell', 'input', 'keyevent', '4'], check=True, timeout=3, capture_output=True)
-        time.sleep(0.8)
-    except Exception:
+    # Comandos da própria sessão (device certo, sem subprocess adb); BACK só com teclado aberto
+    if not fechar_teclado(driver):
         driver.back()
 
 def clicar_por_id(driver, id): 
@@ -130,8 +113,8 @@ def digitar_texto_por_xpath(driver, xpath, texto):
     campo.send_keys(texto)
 
 def clicar_no_primeiro_da_lista_por_id(driver, element_id: str):
-    full_id = f"{APP_PACKAGE}:id/{element_id}"
-    lista_de_elementos = WebDriverWait(driver, DEFAULT_WAIT).until(EC.presence_of_all_elements_located((AppiumBy.ID, full_id)))
+    full_id = f"{config.APP_PACKAGE}:id/{element_id}"
+    lista_de_elementos = EsperaAdaptativa(driver, DEFAULT_WAIT).until(EC.presence_of_all_elements_located((AppiumBy.ID, full_id)))
     if not lista_de_elementos: 
         raise Exception(f"Nenhum elemento encontrado com o ID '{element_id}'")
     lista_de_elementos[0].click()
@@ -146,23 +129,23 @@ def clicar_em_texto_se_existir(driver, texto_a_clicar: str, wait_time: int = 5)
     
 def clicar_ate_mudar_tela(driver, id_clicar, texto_esperado_nova_tela, tentativas=3):
     """Clica no elemento e verifica se a tela mudou procurando um texto específico."""
-    for i in range(tentativas):
-        try:
-            clicar_por_id(driver, id_clicar)
-            # Tenta verificar se o próximo elemento já apareceu (wait curto)
-            find_element_by_text(driver, texto_esperado_nova_tela, wait=5)
-            logger.info(f"   [✅] Tela mudou com sucesso na tentativa {i+1}")
-            return True
-        except Exception:
-            logger.warning(f"   [⚠️] Tentativa {i+1} de clique falhou em mudar a tela. Reentando...")
-            time.sleep(1)
-    raise Exception(f"Falha ao mudar de tela após clicar em {id_clicar}")   
+    def _clicar_e_conferir():
+        clicar_por_id(driver, id_clicar)
+        # Tenta verificar se o próximo elemento já apareceu (wait curto)
+        return find_element_by_text(driver, texto_esperado_nova_tela, wait=5)
+
+    try:
+        executar_com_retry(id_clicar, _clicar_e_conferir, tentativas)
+    except Exception as e:
+        raise Exception(f"Falha ao mudar de tela após clicar em {id_clicar}: {e}")
+    logger.info(f"   [✅] Tela mudou com sucesso após clicar em '{id_clicar}'")
+    return True
 
 def clicar_em_id_se_existir(driver, id_elemento: str, wait_time: int = 3) -> bool:
     """Tenta clicar em um ID. Se não encontrar em 'wait_time' segundos, ignora sem dar erro."""
     try:
         # Usa uma espera curta para não travar o teste
-        elemento = WebDriverWait(driver, wait_time).until(
+        elemento = EsperaAdaptativa(driver, wait_time).until(
             EC.element_to_be_clickable((AppiumBy.ID, id_elemento))
         )
         elemento.click()
@@ -174,24 +157,24 @@ def clicar_em_id_se_existir(driver, id_elemento: str, wait_time: int = 3) -> boo
         return False 
 
 def clicar_por_id_com_espera(driver, id_elemento, wait=DEFAULT_WAIT, tentativas=3):
-    
-    for i in range(tentativas):
-        try:
-            # Localiza o elemento garantindo que ele está pronto para interação
-            elemento = find_clickable_by_id(driver, id_elemento, wait=wait)
-            
-            # Pausa de 1.5s: Dá tempo para o app terminar cálculos de carrinho/estoque
-            time.sleep(1.5)
-            
-            elemento.click()
-            logger.info(f"   [✅] Clique no ID '{id_elemento}' realizado na tentativa {i+1}.")
-            return True
-        except Exception as e:
-            if i == tentativas - 1:
-                logger.error(f"   [❌] Falha definitiva ao clicar no ID '{id_elemento}' após {tentativas} tentativas.")
-                raise e
-            logger.warning(f"   [⚠️] Tentativa {i+1} de clique falhou. Reentando...")
-            time.sleep(1) 
+    """Clica no ID após a pausa de cálculo do app; retry só para falhas retentáveis (pages/retry.py)."""
+    def _clicar():
+        # Localiza o elemento garantindo que ele está pronto para interação
+        elemento = find_clickable_by_id(driver, id_elemento, wait=wait)
+
+        # Pausa de 1.5s: Dá tempo para o app terminar cálculos de carrinho/estoque
+        time.sleep(1.5)
+
+        elemento.click()
+        return True
+
+    try:
+        executar_com_retry(id_elemento, _clicar, tentativas)
+    except Exception:
+        logger.error(f"   [❌] Falha definitiva ao clicar no ID '{id_elemento}'.")
+        raise
+    logger.info(f"   [✅] Clique no ID '{id_elemento}' realizado.")
+    return True
 
 def garantir_switch_ativo_por_texto(driver, texto_label):
     """
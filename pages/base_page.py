@@ -3,25 +3,209 @@ Base Page - Classe base para todos os Page Objects.
 Contém métodos comuns de interação com elementos.
 """
 import time
-import subprocess
+import hashlib
+import weakref
+import functools
+import xml.etree.ElementTree as ET
 from appium.webdriver.common.appiumby import AppiumBy
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.common.action_chains import ActionChains
-from selenium.webdriver.common.actions.action_builder import ActionBuilder
-from selenium.webdriver.common.actions.pointer_input import PointerInput
-from selenium.webdriver.common.actions import interaction
-from selenium.common.exceptions import TimeoutException, StaleElementReferenceException
+from selenium.common.exceptions import (
+    TimeoutException, StaleElementReferenceException, ElementNotInteractableException, WebDriverException,
+)
 
-from config import DEFAULT_WAIT, logger, LogStyle, Cores
+from config import DEFAULT_WAIT, logger, LogStyle, EventoLog, Cores, LAYOUT_POR_FLAVOR, flavor_do_pacote
+from pages.espera import EsperaAdaptativa
+from pages.retry import FATAL, RETENTAVEL, classificar_falha, executar_com_retry
+from pages.locators import aguardar_por_xpath, chave_locator, locator_por_estrategia, preferencias_do_modelo
+from pages.teclado import fechar as fechar_teclado_da_sessao, teclado_visivel
+from pages.interrupcoes import AUTOMATICAS, INTERRUPCOES_TRATADAS, detectar, registrar as registrar_interrupcao
+from pages.gestos import (
+    BACKEND_NATIVO, FAIXA_PADRAO, FAIXA_TECLADO, regiao_scroll, rolar, tamanho_da_sessao, tocar,
+)
+
+
+# Perfil (flavor, layout) por sessão Appium - o app não muda durante a sessão
+_PERFIL_POR_SESSAO = {}
+
+# Snapshot da tela e estado do teclado por driver: todos os page objects da sessão
+# leem e descartam o mesmo cache (a ação feita por um invalida para os outros)
+_CACHE_TELA_POR_DRIVER = weakref.WeakKeyDictionary()
+
+# Duração (segundos) de cada execução dos fluxos, por nome do fluxo
+DURACOES_FLUXOS = {}
+
+# Custo de cada busca com scroll, por alvo: [{'swipes', 'tempo', 'encontrado'}]
+ESTATISTICAS_SCROLL = {}
+
+# Esperas por tela estável: quantidade, segundos gastos e quantas estouraram o tempo máximo
+ESTATISTICAS_TELA_ESTAVEL = {'esperas': 0, 'tempo': 0.0, 'estouradas': 0}
+
+
+def _registrar_tela_estavel(tempo: float, estavel: bool):
+    ESTATISTICAS_TELA_ESTAVEL['esperas'] += 1
+    ESTATISTICAS_TELA_ESTAVEL['tempo'] += tempo
+    if not estavel:
+        ESTATISTICAS_TELA_ESTAVEL['estouradas'] += 1
+
+
+def cronometrar_fluxo(func):
+    """
+    Decorator para métodos executar_* das páginas.
+    Registra a duração de cada execução em DURACOES_FLUXOS e no log.
+    """
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        inicio = time.monotonic()
+        try:
+            return func(self, *args, **kwargs)
+        finally:
+            duracao = time.monotonic() - inicio
+            nome = f"{type(self).__name__}.{func.__name__}"
+            DURACOES_FLUXOS.setdefault(nome, []).append(duracao)
+            logger.info(EventoLog("fluxo", LogStyle.INFO, "Fluxo {locator} levou {duracao:.1f}s", recuo=False,
+                                  locator=nome, duracao=duracao))
+    return wrapper
+
+
+class SnapshotTela:
+    """
+    Hierarquia de UI (page_source) capturada uma única vez por estado de tela.
+    O XML é parseado sob demanda e reaproveitado em todas as consultas.
+    """
+
+    def __init__(self, xml: str):
+        self.xml = xml if isinstance(xml, str) else ""
+        self.capturado_em = time.monotonic()
+        self._raiz = None
+        self._parseado = False
+
+    @property
+    def raiz(self):
+        """Raiz do XML parseado (None se o XML for inválido)."""
+        if not self._parseado:
+            self._parseado = True
+            try:
+                self._raiz = ET.fromstring(self.xml)
+            except ET.ParseError:
+                self._raiz = None
+        return self._raiz
+
+    @property
+    def assinatura(self) -> str:
+        """Hash do XML completo (identifica o estado da tela)."""
+        return hashlib.md5(self.xml.encode('utf-8', errors='replace')).hexdigest()
+
+    @property
+    def estrutura(self) -> str:
+        """
+        Impressão digital estrutural: classes e resource-ids dos nós, sem textos/posições.
+        Muda quando a tela troca, não quando só um valor exibido muda.
+        """
+        partes = [f"{no.tag}|{no.get('resource-id', '')}" for no in self.nos()]
+        return hashlib.md5("\n".join(partes).encode('utf-8', errors='replace')).hexdigest()
+
+    @property
+    def disposicao(self) -> str:
+        """
+        Impressão digital da disposição: classe, resource-id e bounds dos nós.
+        Sem textos e estados (checked, focused...): relógio, contador ou spinner
+        na tela não contam como tela mudando; transição e animação de layout contam.
+        """
+        partes = [f"{no.tag}|{no.get('resource-id', '')}|{no.get('bounds', '')}" for no in self.nos()]
+        return hashlib.md5("\n".join(partes).encode('utf-8', errors='replace')).hexdigest()
+
+    def idade(self) -> float:
+        """Segundos desde a captura."""
+        return time.monotonic() - self.capturado_em
+
+    def nos(self):
+        """Itera por todos os nós da hierarquia."""
+        if self.raiz is None:
+            return iter(())
+        return self.raiz.iter()
+
+    def buscar_por_id(self, full_id: str) -> list:
+        """Retorna os atributos dos nós com o resource-id informado."""
+        return [no.attrib for no in self.nos() if no.get('resource-id') == full_id]
+
+    def buscar_por_texto(self, texto: str) -> list:
+        """Retorna os atributos dos nós cujo texto contém o valor (como textContains)."""
+        return [no.attrib for no in self.nos() if texto in (no.get('text') or '')]
+
+    def tamanho_tela(self):
+        """Largura/altura declaradas na raiz da hierarquia, se existirem."""
+        raiz = self.raiz
+        if raiz is None:
+            return None
+        try:
+            return {'width': int(raiz.get('width')), 'height': int(raiz.get('height'))}
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def limites(atributos: dict):
+        """Converte 'bounds' ("[x1,y1][x2,y2]") em (x1, y1, x2, y2)."""
+        try:
+            bounds = atributos.get('bounds', '')
+            x1y1, x2y2 = bounds[1:-1].split('][')
+            x1, y1 = (int(v) for v in x1y1.split(','))
+            x2, y2 = (int(v) for v in x2y2.split(','))
+            return x1, y1, x2, y2
+        except (ValueError, AttributeError):
+            return None
+
+    def no_visivel(self, atributos: dict, tela: dict = None) -> bool:
+        """Mesmas regras de _elemento_realmente_visivel, lidas do XML (sem round trip)."""
+        if atributos.get('displayed', 'true') != 'true':
+            return False
+        if atributos.get('enabled', 'true') != 'true':
+            return False
+        limites = self.limites(atributos)
+        if not limites:
+            return False
+        x1, y1, x2, y2 = limites
+        if x2 - x1 <= 0 or y2 - y1 <= 0:
+            return False
+        tela = tela or self.tamanho_tela()
+        if tela:
+            if y1 < 0 or y1 > tela['height']:
+                return False
+            if x1 < 0 or x1 > tela['width']:
+                return False
+        return True
 
 
 class BasePage:
     """Classe base com métodos comuns para todas as páginas."""
 
+    _app_package = None
+    # Idade máxima do snapshot: a UI pode mudar sozinha (loading, diálogos)
+    VALIDADE_SNAPSHOT = 2.0
+    # Tempo mínimo com a hierarquia idêntica para a tela contar como estável
+    JANELA_ESTAVEL = 0.3
+
+    # Pós-condições opcionais de clique (clicar_por_id(confirmar=...))
+    CONFIRMAR_SUMIU = "sumiu"
+    CONFIRMAR_TELA = "tela"
+
+    # Busca com scroll (rolar_ate_*): orçamento total de tempo por busca
+    TEMPO_MAXIMO_SCROLL = 10.0
+    # Faixa vertical dos swipes, em fração da altura: (topo, base)
+    FAIXA_SCROLL = FAIXA_PADRAO
+    FAIXA_SCROLL_TECLADO = FAIXA_TECLADO
+    # Backend dos gestos de scroll: "nativo" (mobile: scrollGesture) ou "w3c" (ActionChains)
+    BACKEND_SCROLL = BACKEND_NATIVO
+
+    # Interrupções automáticas (pages/interrupcoes.py) dispensadas em todo snapshot novo.
+    # Desligar na página (classe) ou na sessão (instância) que precisa ver o popup na
+    # tela; aí as dispensas ficam em tratar_interrupcoes() e na nova tentativa de clicar_por_id()
+    INTERCEPTAR_INTERRUPCOES = True
+    # Tempo máximo para a interrupção dispensada sair da tela
+    TEMPO_DISPENSA = 1.0
+
     def __init__(self, driver):
         self.driver = driver
-        self.wait = WebDriverWait(driver, DEFAULT_WAIT)
+        self.wait = EsperaAdaptativa(driver, DEFAULT_WAIT)
         # Obtém app_package do driver (sessão atual) - funciona com múltiplos devices
         self._app_package = None
 
@@ -37,6 +221,37 @@ class BasePage:
                 pass
         return self._app_package
 
+    @property
+    def perfil(self) -> dict:
+        """
+        Flavor e layout de telas da sessão, resolvidos uma vez a partir do app_package.
+        layout é "device", "playstore" ou None (flavor não mapeado: sondar a tela).
+        """
+        chave = getattr(self.driver, 'session_id', None) or id(self.driver)
+        perfil = _PERFIL_POR_SESSAO.get(chave)
+        if perfil is None:
+            flavor = flavor_do_pacote(self.app_package)
+            perfil = {'flavor': flavor, 'layout': LAYOUT_POR_FLAVOR.get(flavor)}
+            _PERFIL_POR_SESSAO[chave] = perfil
+            if flavor:
+                logger.info(EventoLog("perfil", LogStyle.CONFIG, "Flavor {locator} (layout: {layout})", recuo=False,
+                                      locator=flavor, layout=perfil['layout'] or 'sondar tela'))
+        return perfil
+
+    @property
+    def modelo_device(self):
+        """Modelo do device da sessão (capability deviceModel do UiAutomator2)."""
+        try:
+            modelo = self.driver.capabilities.get('deviceModel')
+        except Exception:
+            return None
+        return modelo if isinstance(modelo, str) else None
+
+    @property
+    def layout(self):
+        """Layout de telas da sessão ("device", "playstore" ou None)."""
+        return self.perfil['layout']
+
     # --- Helpers de locators ---
     def _id_completo(self, element_id: str) -> str:
         """Retorna ID completo com package."""
@@ -49,42 +264,204 @@ class BasePage:
             return element_id
         return f"{pkg}:id/{element_id}"
 
-    def _capturar_tela_atual(self) -> str:
-        """Captura identificador da tela atual para comparação."""
+    # --- Snapshot da hierarquia ---
+    def _cache_tela(self) -> dict:
+        """Cache da tela do driver desta página (compartilhado entre os page objects da sessão)."""
+        driver = getattr(self, 'driver', None)
         try:
-            return self.driver.page_source[:500]
-        except:
-            return ""
+            return _CACHE_TELA_POR_DRIVER.setdefault(driver, {})
+        except TypeError:
+            # Sem driver (ou driver sem weakref): cache do próprio page object
+            return self.__dict__.setdefault('_cache_tela_local', {})
+
+    @property
+    def _snapshot(self):
+        """Snapshot da tela atual (descartado a cada ação que altera a tela)."""
+        return self._cache_tela().get('snapshot')
+
+    @_snapshot.setter
+    def _snapshot(self, snapshot):
+        self._cache_tela()['snapshot'] = snapshot
+
+    @property
+    def _estado_teclado(self):
+        """Teclado visível (visivel, momento da consulta) - mesmo ciclo de vida do snapshot."""
+        return self._cache_tela().get('teclado')
+
+    @_estado_teclado.setter
+    def _estado_teclado(self, estado):
+        self._cache_tela()['teclado'] = estado
+
+    def _obter_snapshot(self, forcar: bool = False) -> SnapshotTela:
+        """
+        Retorna o snapshot da tela atual.
+        Só baixa o page_source se não houver snapshot válido (ou se forcar=True).
+        Popups automáticos (bônus, permissões) presentes no snapshot novo são
+        dispensados, salvo com INTERCEPTAR_INTERRUPCOES desligado.
+        """
+        snapshot = self._snapshot
+        if forcar or snapshot is None or snapshot.idade() > self.VALIDADE_SNAPSHOT:
+            snapshot = self._capturar_snapshot()
+            if self.INTERCEPTAR_INTERRUPCOES:
+                snapshot = self._dispensar_interrupcoes(snapshot, AUTOMATICAS)
+        return snapshot
+
+    def _capturar_snapshot(self) -> SnapshotTela:
+        """Baixa o page_source e guarda como snapshot atual."""
+        try:
+            snapshot = SnapshotTela(self.driver.page_source)
+        except Exception:
+            snapshot = SnapshotTela("")
+        self._snapshot = snapshot
+        return snapshot
+
+    def _dispensar_interrupcoes(self, snapshot: SnapshotTela, interrupcoes) -> SnapshotTela:
+        """
+        Toca no botão de cada interrupção presente no snapshot e aguarda ela sair da tela.
+        Retorna o snapshot da tela depois das dispensas.
+        """
+        pendentes = list(interrupcoes)
+        for _ in range(len(interrupcoes) + 1):
+            achado = detectar(snapshot, pendentes)
+            if achado is None:
+                break
+            interrupcao, botao = achado
+            limites = SnapshotTela.limites(botao)
+            if limites is None:
+                # Botão sem bounds (ou malformado): sem onde tocar, segue para as outras
+                logger.warning(f"   {LogStyle.aviso('Botao sem bounds, nao dispensado:')} {LogStyle.elemento(interrupcao.nome)}")
+                pendentes.remove(interrupcao)
+                continue
+            x1, y1, x2, y2 = limites
+            logger.info(EventoLog("interrupcao", LogStyle.CLICK, "Interrupcao {locator} na tela. Dispensando...",
+                                  locator=interrupcao.nome))
+            try:
+                tocar(self.driver, (x1 + x2) // 2, (y1 + y2) // 2)
+            except WebDriverException as e:
+                logger.warning(f"   {LogStyle.aviso('Nao foi possivel dispensar')} {LogStyle.elemento(interrupcao.nome)}: {e}")
+                break
+            self._invalidar_snapshot()
+            registrar_interrupcao(interrupcao)
+
+            fim = time.monotonic() + self.TEMPO_DISPENSA
+            snapshot = self._capturar_snapshot()
+            while interrupcao.botao_na_tela(snapshot) is not None:
+                if time.monotonic() >= fim:
+                    logger.warning(f"   {LogStyle.aviso('Interrupcao continua na tela:')} {LogStyle.elemento(interrupcao.nome)}")
+                    return snapshot
+                time.sleep(0.1)
+                snapshot = self._capturar_snapshot()
+        return snapshot
+
+    def tratar_interrupcoes(self, *interrupcoes, estavel: bool = False) -> list:
+        """
+        Dispensa as interrupções pedidas (sem argumentos, as automáticas) que estiverem
+        na tela agora. Não espera elas aparecerem: lê o snapshot atual.
+
+        Args:
+            estavel: lê a tela só depois que ela parar de mudar (diálogo que abre logo
+                após a ação anterior).
 
-    def _elemento_realmente_visivel(self, elemento) -> bool:
+        Returns:
+            Nomes das interrupções pedidas que foram dispensadas durante a chamada.
+        """
+        pedidas = interrupcoes or AUTOMATICAS
+        antes = {i.nome: INTERRUPCOES_TRATADAS.get(i.nome, 0) for i in pedidas}
+        if estavel:
+            self.aguardar_tela_estavel()
+        self._dispensar_interrupcoes(self._obter_snapshot(), pedidas)
+        return [nome for nome, vezes in antes.items() if INTERRUPCOES_TRATADAS.get(nome, 0) > vezes]
+
+    def _invalidar_snapshot(self):
+        """Descarta o snapshot (chamar após qualquer ação que altere a tela)."""
+        self._snapshot = None
+        self._estado_teclado = None
+
+    def assinatura_tela(self) -> str:
+        """Disposição da tela atual - passar em mudou_de de aguardar_tela_estavel() após a ação."""
+        return self._obter_snapshot().disposicao
+
+    def aguardar_tela_estavel(self, tempo_maximo: float = 1.5, leituras_estaveis: int = 2,
+                              intervalo: float = 0.2, janela_minima: float = None,
+                              mudou_de: str = None) -> bool:
+        """
+        Aguarda a UI ficar ociosa: mesma disposição (SnapshotTela.disposicao) em N
+        leituras seguidas, cobrindo pelo menos janela_minima segundos (logo após um
+        clique, duas leituras iguais podem ser a tela antiga antes da transição começar).
+        Substitui pausas fixas (sleep) - retorna assim que a tela para de mudar; o
+        tempo_maximo de cada chamada é a pausa fixa que ela substituiu.
+        O último snapshot lido fica em cache para as consultas seguintes.
+
+        Args:
+            janela_minima: tempo mínimo com a tela idêntica (padrão JANELA_ESTAVEL).
+            mudou_de: disposição da tela antes da ação (assinatura_tela()); leituras
+                iguais a ela não contam - espera a tela mudar e então estabilizar.
+
+        Returns:
+            True se estabilizou, False se estourou tempo_maximo (o fluxo segue).
+        """
+        janela_minima = self.JANELA_ESTAVEL if janela_minima is None else janela_minima
+        inicio = time.monotonic()
+        ultima = desde = None
+        iguais = 0
+        mudou = mudou_de is None
+        while True:
+            assinatura = self._obter_snapshot(forcar=True).disposicao
+            agora = time.monotonic()
+            mudou = mudou or assinatura != mudou_de
+            if assinatura == ultima:
+                iguais += 1
+            else:
+                iguais, desde = 1, agora
+            ultima = assinatura
+            if mudou and iguais >= leituras_estaveis and agora - desde >= janela_minima:
+                _registrar_tela_estavel(agora - inicio, estavel=True)
+                return True
+            if agora - inicio >= tempo_maximo:
+                motivo = "ainda mudando" if mudou else "sem mudar"
+                logger.info(EventoLog("tela_estavel", LogStyle.AGUARDAR, "Tela {motivo} apos {duracao}s, seguindo...",
+                                      motivo=motivo, duracao=tempo_maximo))
+                _registrar_tela_estavel(agora - inicio, estavel=False)
+                return False
+            time.sleep(intervalo)
+
+    def _tamanho_tela(self) -> dict:
+        """
+        Tamanho da tela, buscado uma vez por sessão.
+        Usa a raiz do snapshot se houver; senão um único get_window_size.
+        """
+        snapshot = self._snapshot
+        return tamanho_da_sessao(self.driver, snapshot.tamanho_tela if snapshot else None)
+
+    def _elemento_realmente_visivel(self, elemento, estado_validado: bool = False) -> bool:
         """
         Verifica se elemento está REALMENTE visível e interativo.
         Não apenas presente no DOM, mas visível na tela.
+
+        Args:
+            estado_validado: True quando o elemento veio de element_to_be_clickable
+                (displayed/enabled já conferidos pela espera). Nesse caso a checagem
+                custa uma única chamada (rect) ao Appium.
         """
         try:
             if not elemento:
                 return False
 
-            # Verifica se está displayed
-            if not elemento.is_displayed():
-                return False
-
-            # Verifica se está enabled
-            if not elemento.is_enabled():
-                return False
+            if not estado_validado:
+                # Verifica se está displayed e enabled
+                if not elemento.is_displayed() or not elemento.is_enabled():
+                    return False
 
-            # Verifica se tem tamanho (não é invisível)
-            size = elemento.size
-            if size['width'] <= 0 or size['height'] <= 0:
+            # Posição e tamanho em uma única chamada
+            rect = elemento.rect
+            if rect['width'] <= 0 or rect['height'] <= 0:
                 return False
 
-            # Verifica se está dentro da área visível da tela
-            location = elemento.location
-            window_size = self.driver.get_window_size()
-
-            if location['y'] < 0 or location['y'] > window_size['height']:
+            # Verifica se está dentro da área visível da tela (tamanho em cache por sessão)
+            tela = self._tamanho_tela()
+            if rect['y'] < 0 or rect['y'] > tela['height']:
                 return False
-            if location['x'] < 0 or location['x'] > window_size['width']:
+            if rect['x'] < 0 or rect['x'] > tela['width']:
                 return False
 
             return True
@@ -94,86 +471,238 @@ class BasePage:
             return False
 
     # --- Encontrar elementos ---
+    def _estrategia_preferida(self, tipo: str, valor: str, padrao: str) -> str:
+        """Estratégia mais rápida medida neste modelo de device (benchmark_locators.py)."""
+        prefs = preferencias_do_modelo(self.modelo_device)
+        return prefs.get(chave_locator(tipo, valor), padrao)
+
+    def _locator_id(self, element_id: str) -> tuple:
+        """Locator (by, valor) para um ID, na estratégia mais rápida do device."""
+        estrategia = self._estrategia_preferida('id', element_id, 'id')
+        return locator_por_estrategia('id', self._id_completo(element_id), estrategia)
+
+    def _locator_texto(self, texto: str, exato: bool = False) -> tuple:
+        """Locator (by, valor) para um texto (textContains, ou text se exato=True)."""
+        if exato:
+            return (AppiumBy.ANDROID_UIAUTOMATOR, f'new UiSelector().text("{texto}")')
+        estrategia = self._estrategia_preferida('texto', texto, 'uiselector')
+        return locator_por_estrategia('texto', texto, estrategia)
+
+    def aguardar_primeiro(self, alternativas: dict, tempo_espera: int = None) -> tuple:
+        """
+        Aguarda a PRIMEIRA de várias alternativas ficar visível, em um único loop.
+        Usado em telas que mudam por versão do app (L400/Stone x Playstore):
+        em vez de esperar o timeout de uma versão para testar a outra,
+        todas são consultadas a cada poll e vence a que aparecer primeiro.
+
+        Args:
+            alternativas: {nome: (by, valor)} - a ordem define a prioridade no mesmo poll.
+
+        Returns:
+            (nome, elemento) da alternativa encontrada.
+
+        Raises:
+            TimeoutException se nenhuma aparecer dentro do tempo.
+        """
+        timeout = DEFAULT_WAIT if tempo_espera is None else tempo_espera
+
+        def _alguma_visivel(driver):
+            for nome, locator in alternativas.items():
+                for elemento in driver.find_elements(*locator):
+                    if self._elemento_realmente_visivel(elemento):
+                        return nome, elemento
+            return False
+
+        nome, elemento = EsperaAdaptativa(self.driver, timeout).until(
+            _alguma_visivel,
+            message=f"Nenhuma das alternativas apareceu: {', '.join(alternativas)}"
+        )
+        logger.info(EventoLog("tela_identificada", LogStyle.OK, "Tela identificada: {locator}", locator=nome))
+        return nome, elemento
+
+    def identificar_versao(self, alternativas: dict, tempo_espera: int = None) -> str:
+        """
+        Retorna qual versão de tela usar entre as alternativas {layout: (by, valor)}.
+        Se o layout da sessão é conhecido, retorna direto sem consultar a tela;
+        senão sonda as alternativas com aguardar_primeiro.
+
+        Raises:
+            TimeoutException se o layout é desconhecido e nenhuma alternativa aparecer.
+        """
+        layout = self.layout
+        if layout in alternativas:
+            logger.info(EventoLog("versao_tela", LogStyle.SKIP, "Versão {locator} definida pelo flavor (sem sondar a tela)",
+                                  locator=layout))
+            return layout
+        nome, _ = self.aguardar_primeiro(alternativas, tempo_espera)
+        return nome
+
+    def passo_opcional(self, dialogo_id: str, proxima: tuple, tempo_espera: int = 20) -> bool:
+        """
+        Diálogo opcional (ex: impressão) disputado com a próxima tela, no mesmo prazo.
+        Vence o que aparecer primeiro: se a próxima tela chega antes, o fluxo segue na
+        hora, sem esperar o prazo do diálogo que o terminal não mostrou.
+
+        Args:
+            dialogo_id: ID do botão a clicar se o diálogo aparecer.
+            proxima: locator (by, valor) da tela que vem depois do diálogo.
+
+        Returns:
+            True se o diálogo apareceu e foi respondido; False se não apareceu.
+        """
+        fim = time.monotonic() + tempo_espera
+        try:
+            nome, elemento = self.aguardar_primeiro({
+                "dialogo": self._locator_id(dialogo_id),
+                "proxima": proxima,
+            }, tempo_espera)
+        except TimeoutException:
+            logger.info(EventoLog("passo_opcional", LogStyle.SKIP, "Nem {locator} nem a proxima tela apareceram em {duracao}s",
+                                  locator=dialogo_id, duracao=tempo_espera))
+            return False
+        if nome == "proxima":
+            logger.info(EventoLog("passo_opcional", LogStyle.SKIP, "Proxima tela antes do dialogo {locator}, seguindo",
+                                  locator=dialogo_id))
+            return False
+
+        logger.info(EventoLog("passo_opcional", LogStyle.CLICK, "Respondendo dialogo {locator}...", locator=dialogo_id))
+        antes = self.assinatura_tela()
+        elemento.click()
+        self._invalidar_snapshot()
+        # Fechamento do diálogo (a tela precisa sair da que tinha o diálogo) no que sobrou do prazo
+        self.aguardar_tela_estavel(tempo_maximo=max(fim - time.monotonic(), 0.5), mudou_de=antes)
+        return True
+
     def encontrar_por_id(self, element_id: str, tempo_espera: int = None):
         """Encontra elemento por ID."""
-        timeout = tempo_espera or DEFAULT_WAIT
-        return WebDriverWait(self.driver, timeout).until(
-            EC.presence_of_element_located((AppiumBy.ID, self._id_completo(element_id)))
+        timeout = DEFAULT_WAIT if tempo_espera is None else tempo_espera
+        return EsperaAdaptativa(self.driver, timeout).until(
+            EC.presence_of_element_located(self._locator_id(element_id))
         )
 
     def encontrar_clicavel_por_id(self, element_id: str, tempo_espera: int = None):
         """Encontra elemento clicável por ID com validação rigorosa."""
-        timeout = tempo_espera or DEFAULT_WAIT
-        full_id = self._id_completo(element_id)
+        timeout = DEFAULT_WAIT if tempo_espera is None else tempo_espera
 
         # Primeiro aguarda estar clicável
-        elemento = WebDriverWait(self.driver, timeout).until(
-            EC.element_to_be_clickable((AppiumBy.ID, full_id))
+        elemento = EsperaAdaptativa(self.driver, timeout).until(
+            EC.element_to_be_clickable(self._locator_id(element_id))
         )
 
         # Validação extra: verifica se realmente está visível
-        if not self._elemento_realmente_visivel(elemento):
-            raise Exception(f"Elemento '{element_id}' encontrado mas NAO está visivel/clicavel na tela")
+        if not self._elemento_realmente_visivel(elemento, estado_validado=True):
+            raise ElementNotInteractableException(f"Elemento '{element_id}' encontrado mas NAO está visivel/clicavel na tela")
 
         return elemento
 
     def encontrar_por_texto(self, texto: str, tempo_espera: int = None):
         """Encontra elemento por texto visível."""
-        timeout = tempo_espera or DEFAULT_WAIT
-        locator = f'new UiSelector().textContains("{texto}")'
-        return WebDriverWait(self.driver, timeout).until(
-            EC.presence_of_element_located((AppiumBy.ANDROID_UIAUTOMATOR, locator))
+        timeout = DEFAULT_WAIT if tempo_espera is None else tempo_espera
+        return EsperaAdaptativa(self.driver, timeout).until(
+            EC.presence_of_element_located(self._locator_texto(texto))
         )
 
     def encontrar_por_xpath(self, xpath: str, tempo_espera: int = None):
-        """Encontra elemento por XPath."""
-        timeout = tempo_espera or DEFAULT_WAIT
-        return WebDriverWait(self.driver, timeout).until(
-            EC.presence_of_element_located((AppiumBy.XPATH, xpath))
-        )
+        """Encontra elemento por XPath (traduzido para UiSelector quando possível)."""
+        timeout = DEFAULT_WAIT if tempo_espera is None else tempo_espera
+        return aguardar_por_xpath(self.driver, xpath, timeout)
 
     # --- Ações de clique ---
-    def clicar_por_id(self, element_id: str, max_tentativas: int = 3):
+    def clicar_por_id(self, element_id: str, max_tentativas: int = 3, confirmar: str = None,
+                      tempo_confirmacao: float = 5):
         """
         Clica em elemento por ID com validação.
         Tenta múltiplas vezes se necessário.
-        """
-        for tentativa in range(max_tentativas):
-            try:
-                tela_antes = self._capturar_tela_atual()
 
-                elemento = self.encontrar_clicavel_por_id(element_id, tempo_espera=5)
-                logger.info(f"   {LogStyle.CLICK} Clicando em {LogStyle.elemento(element_id)}...")
-                elemento.click()
-                time.sleep(0.3)
+        Args:
+            confirmar: pós-condição opcional do clique (sem ela, o clique não lê a tela):
+                CONFIRMAR_SUMIU - o elemento clicado sai da tela (stale)
+                CONFIRMAR_TELA  - a estrutura da tela muda
+                "<id>"          - o elemento com esse ID aparece (próxima tela)
+                Se não for atendida em tempo_confirmacao, conta como tentativa falha.
 
-                # Verifica se a tela mudou (clique teve efeito)
-                tela_depois = self._capturar_tela_atual()
-                if tela_antes != tela_depois:
-                    logger.info(f"   {LogStyle.OK} Clique em {LogStyle.elemento(element_id)} confirmado (tela mudou)")
-                    return True
+        Falhas retentáveis (stale, clique interceptado, timeout) tentam de novo com
+        backoff; fatais (sessão encerrada, app errado em primeiro plano) falham na hora.
+        """
+        tentativas = 0
+
+        def _clicar():
+            nonlocal tentativas
+            tentativas += 1
+            if tentativas > 1:
+                # Dispensa popup automático que possa ter coberto o elemento
+                self._invalidar_snapshot()
+                self.tratar_interrupcoes()
+            estrutura_antes = self._obter_snapshot().estrutura if confirmar == self.CONFIRMAR_TELA else None
+
+            elemento = self.encontrar_clicavel_por_id(element_id, tempo_espera=5)
+            logger.info(EventoLog("clique", LogStyle.CLICK, "Clicando em {locator}...", locator=element_id))
+            inicio = time.monotonic()
+            elemento.click()
+            self._invalidar_snapshot()
 
-                # Se tela não mudou, pode ser ok (ex: checkbox)
-                logger.info(f"   {LogStyle.OK} Clique em {LogStyle.elemento(element_id)} executado")
+            if confirmar:
+                self._confirmar_clique(elemento, confirmar, estrutura_antes, tempo_confirmacao)
+                logger.info(EventoLog("clique", LogStyle.OK, "Clique em {locator} confirmado ({confirmar})",
+                                      locator=element_id, confirmar=confirmar, duracao=time.monotonic() - inicio))
                 return True
 
-            except Exception as e:
-                if tentativa < max_tentativas - 1:
-                    logger.warning(f"   {LogStyle.RETRY} Tentativa {tentativa + 1} falhou: {e}. Tentando novamente...")
-                    time.sleep(1)
-                else:
-                    logger.error(f"   {LogStyle.ERRO} Falha ao clicar em {LogStyle.elemento(element_id)} apos {max_tentativas} tentativas: {e}")
-                    raise Exception(f"Nao foi possivel clicar em '{element_id}': {e}")
+            logger.info(EventoLog("clique", LogStyle.OK, "Clique em {locator} executado",
+                                  locator=element_id, duracao=time.monotonic() - inicio))
+            return True
+
+        try:
+            return executar_com_retry(element_id, _clicar, max_tentativas, classificar=self._classificar_falha)
+        except Exception as e:
+            logger.error(EventoLog("clique", LogStyle.ERRO, "Falha ao clicar em {locator}: {erro}", locator=element_id, erro=e))
+            raise Exception(f"Nao foi possivel clicar em '{element_id}': {e}")
+
+    def _classificar_falha(self, excecao: Exception) -> str:
+        """
+        Política de retry (pages/retry.py) + contexto da sessão: se o elemento não
+        apareceu porque outro app está em primeiro plano, tentar de novo não adianta.
+        """
+        classe = classificar_falha(excecao)
+        if classe != RETENTAVEL or not isinstance(excecao, TimeoutException):
+            return classe
+        try:
+            atual = self.driver.current_package
+        except Exception:
+            return classe
+        if isinstance(atual, str) and self.app_package and atual != self.app_package:
+            logger.error(f"   {LogStyle.ERRO} App em primeiro plano: {atual} (esperado {self.app_package})")
+            return FATAL
+        return classe
+
+    def _confirmar_clique(self, elemento, confirmar: str, estrutura_antes: str, tempo: float):
+        """
+        Aguarda a pós-condição do clique com uma espera direcionada.
+
+        Raises:
+            TimeoutException se a pós-condição não ocorrer no tempo.
+        """
+        espera = EsperaAdaptativa(self.driver, tempo)
+        if confirmar == self.CONFIRMAR_SUMIU:
+            espera.until(EC.staleness_of(elemento), message="elemento clicado continua na tela")
+        elif confirmar == self.CONFIRMAR_TELA:
+            espera.until(
+                lambda _: self._obter_snapshot(forcar=True).estrutura != estrutura_antes,
+                message="estrutura da tela nao mudou"
+            )
+        else:
+            espera.until(
+                EC.presence_of_element_located(self._locator_id(confirmar)),
+                message=f"'{confirmar}' nao apareceu apos o clique"
+            )
 
     def clicar_no_primeiro_da_lista_por_id(self, element_id: str, tempo_espera: int = None):
         """Clica no primeiro elemento de uma lista com mesmo ID."""
-        timeout = tempo_espera or DEFAULT_WAIT
-        full_id = self._id_completo(element_id)
+        timeout = DEFAULT_WAIT if tempo_espera is None else tempo_espera
 
-        logger.info(f"   {LogStyle.LISTA} Buscando elementos com ID {LogStyle.elemento(element_id)}...")
+        logger.info(EventoLog("lista", LogStyle.LISTA, "Buscando elementos com ID {locator}...", locator=element_id))
 
-        lista_de_elementos = WebDriverWait(self.driver, timeout).until(
-            EC.presence_of_all_elements_located((AppiumBy.ID, full_id))
+        lista_de_elementos = EsperaAdaptativa(self.driver, timeout).until(
+            EC.presence_of_all_elements_located(self._locator_id(element_id))
         )
 
         if not lista_de_elementos:
@@ -182,15 +711,17 @@ class BasePage:
         # Encontra o primeiro elemento realmente visível
         for i, elemento in enumerate(lista_de_elementos):
             if self._elemento_realmente_visivel(elemento):
-                logger.info(f"   {LogStyle.OK} Encontrado elemento visivel na posicao {i}. Clicando...")
+                logger.info(EventoLog("lista", LogStyle.OK, "Encontrado elemento visivel na posicao {posicao}. Clicando...",
+                                      locator=element_id, posicao=i))
                 elemento.click()
+                self._invalidar_snapshot()
                 return
 
         raise Exception(f"Nenhum elemento com ID '{element_id}' esta visivel na tela")
 
     def clicar_por_texto(self, texto: str, tempo_espera: int = None):
         """Clica em elemento por texto."""
-        logger.info(f"   {LogStyle.CLICK} Buscando texto {LogStyle.elemento(texto)}...")
+        logger.info(EventoLog("clique_texto", LogStyle.CLICK, "Buscando texto {locator}...", locator=texto))
         elemento = self.encontrar_por_texto(texto, tempo_espera)
 
         if not self._elemento_realmente_visivel(elemento):
@@ -198,24 +729,28 @@ class BasePage:
 
         time.sleep(0.3)
         elemento.click()
-        logger.info(f"   {LogStyle.OK} Clicado em {LogStyle.elemento(texto)}")
+        self._invalidar_snapshot()
+        logger.info(EventoLog("clique_texto", LogStyle.OK, "Clicado em {locator}", locator=texto))
 
     def clicar_se_existir(self, element_id: str, tempo_espera: int = 3) -> bool:
         """Clica se elemento existir e estiver visível, senão ignora."""
         try:
-            elemento = WebDriverWait(self.driver, tempo_espera).until(
-                EC.element_to_be_clickable((AppiumBy.ID, self._id_completo(element_id)))
+            elemento = EsperaAdaptativa(self.driver, tempo_espera).until(
+                EC.element_to_be_clickable(self._locator_id(element_id))
             )
 
-            if self._elemento_realmente_visivel(elemento):
-                logger.info(f"   {LogStyle.CLICK} Elemento {LogStyle.elemento(element_id)} encontrado. Clicando...")
+            if self._elemento_realmente_visivel(elemento, estado_validado=True):
+                logger.info(EventoLog("clique_opcional", LogStyle.CLICK, "Elemento {locator} encontrado. Clicando...",
+                                      locator=element_id))
                 elemento.click()
+                self._invalidar_snapshot()
                 return True
             else:
-                logger.info(f"   {LogStyle.SKIP} Elemento {LogStyle.elemento(element_id)} existe mas nao esta visivel")
+                logger.info(EventoLog("clique_opcional", LogStyle.SKIP, "Elemento {locator} existe mas nao esta visivel",
+                                      locator=element_id))
                 return False
         except:
-            logger.info(f"   {LogStyle.SKIP} Elemento {LogStyle.elemento(element_id)} nao encontrado")
+            logger.info(EventoLog("clique_opcional", LogStyle.SKIP, "Elemento {locator} nao encontrado", locator=element_id))
             return False
 
     def clicar_texto_se_existir(self, texto: str, tempo_espera: int = 3) -> bool:
@@ -224,159 +759,172 @@ class BasePage:
             elemento = self.encontrar_por_texto(texto, tempo_espera)
 
             if self._elemento_realmente_visivel(elemento):
-                logger.info(f"   {LogStyle.CLICK} Texto {LogStyle.elemento(texto)} encontrado. Clicando...")
+                logger.info(EventoLog("clique_opcional", LogStyle.CLICK, "Texto {locator} encontrado. Clicando...", locator=texto))
                 elemento.click()
+                self._invalidar_snapshot()
                 return True
             else:
-                logger.info(f"   {LogStyle.SKIP} Texto {LogStyle.elemento(texto)} existe mas nao esta visivel")
+                logger.info(EventoLog("clique_opcional", LogStyle.SKIP, "Texto {locator} existe mas nao esta visivel",
+                                      locator=texto))
                 return False
         except:
-            logger.info(f"   {LogStyle.SKIP} Texto {LogStyle.elemento(texto)} nao encontrado")
+            logger.info(EventoLog("clique_opcional", LogStyle.SKIP, "Texto {locator} nao encontrado", locator=texto))
             return False
 
     # --- Ações de digitação ---
-    def digitar_por_id(self, element_id: str, texto: str):
-        """Digita texto em campo por ID."""
-        logger.info(f"   {LogStyle.DIGITAR} Campo {LogStyle.elemento(element_id)} ← {LogStyle.valor(texto)}")
+    def digitar_por_id(self, element_id: str, texto: str, rapido: bool = False):
+        """
+        Digita texto em campo por ID.
+
+        Args:
+            rapido: localiza só por presença (sem checagem de visibilidade) e digita
+                com um único comando, sem clear (ver _definir_texto).
+        """
+        logger.info(EventoLog("digitar", LogStyle.DIGITAR, "Campo {locator} ← {valor}", locator=element_id, valor=texto))
+        if rapido:
+            vazio = self._campo_vazio_no_snapshot(element_id)
+            campo = self.encontrar_por_id(element_id)
+            self._invalidar_snapshot()
+            self._definir_texto(campo, texto, vazio)
+            return
         campo = self.encontrar_clicavel_por_id(element_id)
+        self._invalidar_snapshot()
         campo.clear()
         campo.send_keys(texto)
 
-    def digitar_por_xpath(self, xpath: str, texto: str):
-        """Digita texto em campo por XPath."""
-        logger.info(f"   {LogStyle.DIGITAR} XPath ← {LogStyle.valor(texto)}")
+    def digitar_por_xpath(self, xpath: str, texto: str, rapido: bool = False):
+        """Digita texto em campo por XPath (rapido: um único comando, sem clear)."""
+        logger.info(EventoLog("digitar", LogStyle.DIGITAR, "XPath ← {valor}", locator=xpath, valor=texto))
         campo = self.encontrar_por_xpath(xpath)
+        self._invalidar_snapshot()
+        if rapido:
+            self._definir_texto(campo, texto)
+            return
         campo.clear()
         campo.send_keys(texto)
 
+    def preencher_formulario(self, campos):
+        """
+        Preenche vários campos da mesma tela no modo rápido.
+
+        Args:
+            campos: dict {element_id: texto} ou lista de pares (element_id, texto), na ordem.
+        """
+        pares = list(campos.items()) if isinstance(campos, dict) else list(campos)
+        # Estado dos campos lido uma vez, antes de digitar (a digitação invalida o snapshot)
+        vazios = {element_id: self._campo_vazio_no_snapshot(element_id) for element_id, _ in pares}
+        for element_id, texto in pares:
+            logger.info(EventoLog("digitar", LogStyle.DIGITAR, "Campo {locator} ← {valor}", locator=element_id, valor=texto))
+            campo = self.encontrar_por_id(element_id)
+            self._invalidar_snapshot()
+            self._definir_texto(campo, texto, vazios[element_id])
+
+    def _campo_vazio_no_snapshot(self, element_id: str) -> bool:
+        """
+        True se o snapshot em cache mostra o campo vazio (texto "" ou igual ao hint).
+        Não baixa a hierarquia: sem snapshot válido, retorna False.
+        """
+        snapshot = self._snapshot
+        if snapshot is None or snapshot.idade() > self.VALIDADE_SNAPSHOT:
+            return False
+        nos = snapshot.buscar_por_id(self._id_completo(element_id))
+        return bool(nos) and all(no.get('text', '') in ('', no.get('hint')) for no in nos)
+
+    def _definir_texto(self, campo, texto: str, vazio: bool = False):
+        """
+        Define o texto do campo com um único comando.
+        Campo vazio: send_keys direto. Com conteúdo: mobile: replaceElementValue
+        (substitui o texto sem clear); se o driver não suportar, clear + send_keys.
+        """
+        if vazio:
+            campo.send_keys(texto)
+            return
+        try:
+            self.driver.execute_script('mobile: replaceElementValue', {'elementId': campo.id, 'text': texto})
+        except WebDriverException:
+            campo.clear()
+            campo.send_keys(texto)
+
     # --- Ações de teclado ---
     def fechar_teclado(self, max_tentativas: int = 3) -> bool:
         """
-        Fecha o teclado virtual usando múltiplas estratégias.
+        Fecha o teclado virtual com comandos da sessão (hide_keyboard, KEYCODE_BACK, KEYCODE_ESCAPE).
         Compatível com diferentes ROMs Android (Stone, Cielo, etc).
+        Sem subprocess adb: vai sempre para o device da sessão.
         """
-        for tentativa in range(max_tentativas):
-            try:
-                if not self._teclado_visivel():
-                    return True
-
-                logger.info(f"   {LogStyle.TECLADO} Tentativa {tentativa + 1}/{max_tentativas} de fechar...")
-
-                # Método 1: Appium hide_keyboard
-                try:
-                    self.driver.hide_keyboard()
-                    time.sleep(0.5)
-                    if not self._teclado_visivel():
-                        logger.info(f"   {LogStyle.OK} Teclado fechado via hide_keyboard.")
-                        return True
-                except:
-                    pass
-
-                # Método 2: KEYCODE_BACK via ADB
-                try:
-                    subprocess.run(['adb', 'shell', 'input', 'keyevent', '4'],
-                                  timeout=3, capture_output=True)
-                    time.sleep(0.5)
-                    if not self._teclado_visivel():
-                        logger.info(f"   {LogStyle.OK} Teclado fechado via KEYCODE_BACK.")
-                        return True
-                except:
-                    pass
-
-                # Método 3: KEYCODE_ESCAPE (algumas ROMs respondem melhor)
-                try:
-                    subprocess.run(['adb', 'shell', 'input', 'keyevent', 'KEYCODE_ESCAPE'],
-                                  timeout=3, capture_output=True)
-                    time.sleep(0.5)
-                    if not self._teclado_visivel():
-                        logger.info(f"   {LogStyle.OK} Teclado fechado via KEYCODE_ESCAPE.")
-                        return True
-                except:
-                    pass
-
-            except:
-                pass
+        if not self._teclado_visivel():
+            return True
 
+        for tentativa in range(max_tentativas):
+            logger.info(EventoLog("teclado", LogStyle.TECLADO, "Tentativa {tentativa}/{max_tentativas} de fechar...",
+                                  tentativa=tentativa + 1, max_tentativas=max_tentativas))
+            fechado = fechar_teclado_da_sessao(self.driver, visivel=True if tentativa == 0 else None)
+            self._invalidar_snapshot()
+            if fechado:
+                self._estado_teclado = (False, time.monotonic())
+                return True
         return False
 
     def _teclado_visivel(self) -> bool:
-        """Verifica se teclado está visível."""
-        try:
-            return self.driver.execute_script('mobile: isKeyboardShown')
-        except:
-            return False
+        """
+        Verifica se teclado está visível.
+        O estado fica em cache junto com o snapshot da tela (descartado a cada ação).
+        """
+        estado = self._estado_teclado
+        if estado is not None and time.monotonic() - estado[1] <= self.VALIDADE_SNAPSHOT:
+            return estado[0]
+        visivel = teclado_visivel(self.driver)
+        self._estado_teclado = (visivel, time.monotonic())
+        return visivel
 
     def pressionar_pesquisar(self):
         """Pressiona tecla de pesquisa do teclado."""
+        self._invalidar_snapshot()
         self.driver.execute_script('mobile: performEditorAction', {'action': 'search'})
 
     # --- Ações de scroll ---
+    def _rolar(self, faixa: tuple, percentual: float = 1.0, direcao: str = 'down'):
+        """
+        Rola o conteúdo da faixa da tela com o gesto nativo (região pré-calculada por device).
+
+        Returns:
+            True/False (ainda dá para rolar), ou None se o backend não informa.
+        """
+        self._invalidar_snapshot()
+        regiao = regiao_scroll(self._tamanho_tela(), faixa)
+        return rolar(self.driver, regiao, percentual, direcao, backend=self.BACKEND_SCROLL)
+
     def realizar_scroll_para_baixo(self):
         """Realiza scroll para baixo."""
-        size = self.driver.get_window_size()
-        x = size['width'] // 2
-        start_y = int(size['height'] * 0.8)
-        end_y = int(size['height'] * 0.2)
-
-        actions = ActionChains(self.driver)
-        actions.w3c_actions = ActionBuilder(
-            self.driver, mouse=PointerInput(interaction.POINTER_TOUCH, "touch")
-        )
-        actions.w3c_actions.pointer_action.move_to_location(x, start_y)
-        actions.w3c_actions.pointer_action.pointer_down()
-        actions.w3c_actions.pointer_action.pause(0.2)
-        actions.w3c_actions.pointer_action.move_to_location(x, end_y)
-        actions.w3c_actions.pointer_action.release()
-        actions.perform()
+        return self._rolar(self.FAIXA_SCROLL)
 
     def realizar_scroll_ignorando_teclado(self, direcao: str = 'baixo'):
         """
         Realiza scroll MESMO COM TECLADO ABERTO.
-        Usa coordenadas na parte superior da tela para evitar o teclado.
+        Usa só a parte superior da tela (10% a 35%) para evitar o teclado.
         Universal - funciona em qualquer dispositivo.
         """
         try:
-            size = self.driver.get_window_size()
-            x = size['width'] // 2
-
-            if direcao == 'baixo':
-                # Área superior da tela (acima do teclado)
-                # Usa 35% a 10% para garantir que funciona com teclado grande
-                y_inicial = int(size['height'] * 0.35)
-                y_final = int(size['height'] * 0.10)
-            else:
-                y_inicial = int(size['height'] * 0.10)
-                y_final = int(size['height'] * 0.35)
-
-            logger.info(f"   {LogStyle.SCROLL} {direcao} - De Y:{y_inicial} ate Y:{y_final}")
-
-            actions = ActionChains(self.driver)
-            actions.w3c_actions = ActionBuilder(
-                self.driver, mouse=PointerInput(interaction.POINTER_TOUCH, "touch")
-            )
-            actions.w3c_actions.pointer_action.move_to_location(x, y_inicial)
-            actions.w3c_actions.pointer_action.pointer_down()
-            actions.w3c_actions.pointer_action.pause(0.3)
-            actions.w3c_actions.pointer_action.move_to_location(x, y_final)
-            actions.w3c_actions.pointer_action.release()
-            actions.perform()
-
-            time.sleep(0.5)
-
+            logger.info(EventoLog("scroll", LogStyle.SCROLL, "{direcao} (area acima do teclado)", direcao=direcao))
+            return self._rolar(self.FAIXA_SCROLL_TECLADO, direcao='down' if direcao == 'baixo' else 'up')
         except Exception as e:
             logger.warning(f"   {LogStyle.aviso('Erro ao fazer scroll:')} {e}")
+            return None
 
     def scroll_nativo_ate_id(self, element_id: str):
         """
         Usa UiScrollable nativo do Android para rolar até elemento.
-        Mais confiável em qualquer dispositivo.
+        Sem limite de tempo (o UiScrollable faz até 30 swipes) - as buscas
+        com orçamento usam rolar_ate_id.
         """
         try:
             full_id = self._id_completo(element_id)
             locator = f'new UiScrollable(new UiSelector().scrollable(true)).scrollIntoView(new UiSelector().resourceId("{full_id}"))'
-            logger.info(f"   {LogStyle.SCROLL_NATIVO} Buscando ID {LogStyle.elemento(element_id)}...")
+            logger.info(EventoLog("scroll_nativo", LogStyle.SCROLL_NATIVO, "Buscando ID {locator}...", locator=element_id))
+            self._invalidar_snapshot()
             elemento = self.driver.find_element(AppiumBy.ANDROID_UIAUTOMATOR, locator)
-            logger.info(f"   {LogStyle.OK} ID {LogStyle.elemento(element_id)} encontrado via scroll nativo!")
+            logger.info(EventoLog("scroll_nativo", LogStyle.OK, "ID {locator} encontrado via scroll nativo!",
+                                  locator=element_id))
             return elemento
         except Exception as e:
             logger.warning(f"   {LogStyle.aviso('Scroll nativo falhou:')} {e}")
@@ -385,113 +933,153 @@ class BasePage:
     def scroll_nativo_ate_texto(self, texto: str):
         """
         Usa UiScrollable nativo do Android para rolar até texto.
-        Mais confiável em qualquer dispositivo.
+        Sem limite de tempo (o UiScrollable faz até 30 swipes) - as buscas
+        com orçamento usam rolar_ate_texto.
         """
         try:
             locator = f'new UiScrollable(new UiSelector().scrollable(true)).scrollIntoView(new UiSelector().textContains("{texto}"))'
-            logger.info(f"   {LogStyle.SCROLL_NATIVO} Buscando texto {LogStyle.elemento(texto)}...")
+            logger.info(EventoLog("scroll_nativo", LogStyle.SCROLL_NATIVO, "Buscando texto {locator}...", locator=texto))
+            self._invalidar_snapshot()
             elemento = self.driver.find_element(AppiumBy.ANDROID_UIAUTOMATOR, locator)
-            logger.info(f"   {LogStyle.OK} Texto {LogStyle.elemento(texto)} encontrado via scroll nativo!")
+            logger.info(EventoLog("scroll_nativo", LogStyle.OK, "Texto {locator} encontrado via scroll nativo!", locator=texto))
             return elemento
         except Exception as e:
             logger.warning(f"   {LogStyle.aviso('Scroll nativo falhou:')} {e}")
             return None
 
-    def rolar_ate_texto(self, texto: str, max_scrolls: int = 5):
+    def _distancia_scroll(self, snapshot: SnapshotTela, candidatos: list, faixa: tuple) -> float:
         """
-        Rola até encontrar texto.
-        Usa scroll nativo do Android primeiro (mais confiável).
+        Distância do próximo swipe, em fração da faixa (percent do gesto).
+        Se o alvo já está na hierarquia abaixo da área útil, rola só o necessário
+        para trazê-lo ao meio da faixa (sem passar do ponto); senão, a faixa inteira.
         """
-        logger.info(f"   {LogStyle.BUSCA} Procurando texto {LogStyle.elemento(texto)}...")
-
-        # Primeiro tenta scroll nativo do Android
-        elemento = self.scroll_nativo_ate_texto(texto)
-        if elemento and self._elemento_realmente_visivel(elemento):
-            return elemento
-
-        # Fallback: scroll manual
-        logger.info(f"   {LogStyle.FALLBACK} Tentando scroll manual...")
-        for tentativa in range(max_scrolls):
-            try:
-                elemento = self.encontrar_por_texto(texto, tempo_espera=2)
-                if self._elemento_realmente_visivel(elemento):
-                    logger.info(f"   {LogStyle.OK} Texto {LogStyle.elemento(texto)} encontrado e visivel!")
+        altura = self._tamanho_tela()['height']
+        topo, base = int(altura * faixa[0]), int(altura * faixa[1])
+        distancia_max = base - topo
+        destino = (topo + base) // 2
+
+        abaixo = []
+        for atributos in candidatos:
+            limites = snapshot.limites(atributos)
+            if limites and limites[1] > destino:
+                abaixo.append(limites[1] - destino)
+        if not abaixo:
+            return 1.0
+        return max(0.25, min(min(abaixo) / distancia_max, 1.0))
+
+    def _rolar_ate(self, descricao: str, buscar, locator: tuple, max_scrolls: int,
+                   tempo_maximo: float = None, ignorar_teclado: bool = False):
+        """
+        Motor das buscas com scroll: lê a hierarquia, confere o alvo e rola, até achar.
+
+        Para assim que:
+          - o alvo está visível no snapshot (busca o elemento uma vez, sem espera);
+          - o gesto informou fim da lista, ou a hierarquia não mudou após o swipe;
+          - atingiu max_scrolls swipes ou tempo_maximo segundos no total.
+        Swipes, tempo e resultado de cada busca vão para ESTATISTICAS_SCROLL e para o log.
+
+        Args:
+            buscar: função(snapshot) -> atributos dos nós que correspondem ao alvo.
+            locator: (by, valor) do alvo, usado só quando ele aparece no snapshot.
+            ignorar_teclado: swipes apenas na parte superior (teclado pode estar aberto).
+        """
+        if tempo_maximo is None:
+            tempo_maximo = self.TEMPO_MAXIMO_SCROLL
+        faixa = self.FAIXA_SCROLL_TECLADO if ignorar_teclado else self.FAIXA_SCROLL
+
+        inicio = time.monotonic()
+        swipes = 0
+        assinatura_anterior = None
+        pode_rolar = None
+        while True:
+            snapshot = self._obter_snapshot(forcar=True)
+            candidatos = buscar(snapshot)
+            if any(snapshot.no_visivel(c) for c in candidatos):
+                try:
+                    elemento = self.driver.find_element(*locator)
+                    self._registrar_busca_scroll(descricao, swipes, inicio, encontrado=True)
                     return elemento
-            except:
-                pass
+                except Exception:
+                    pass  # Saiu da tela entre a leitura e a busca: segue rolando
+
+            if pode_rolar is False or snapshot.assinatura == assinatura_anterior:
+                motivo = "fim da lista"
+            elif swipes >= max_scrolls:
+                motivo = f"limite de {max_scrolls} scrolls"
+            elif time.monotonic() - inicio >= tempo_maximo:
+                motivo = f"limite de {tempo_maximo}s"
+            else:
+                assinatura_anterior = snapshot.assinatura
+                percentual = self._distancia_scroll(snapshot, candidatos, faixa)
+                swipes += 1
+                logger.info(EventoLog("busca_scroll", LogStyle.SCROLL, "Swipe {swipes}: {locator} nao visivel, rolando {percentual:.0%} da faixa...",
+                                      locator=descricao, swipes=swipes, percentual=percentual))
+                pode_rolar = self._rolar(faixa, percentual)
+                continue
 
-            if tentativa < max_scrolls - 1:
-                logger.info(f"   {LogStyle.SCROLL} Tentativa {tentativa + 1}: Texto nao visivel. Rolando...")
-                self.realizar_scroll_para_baixo()
-                time.sleep(0.5)
+            tempo = self._registrar_busca_scroll(descricao, swipes, inicio, encontrado=False)
+            raise Exception(f"{descricao} nao encontrado apos {swipes} scrolls em {tempo:.1f}s ({motivo})")
 
-        raise Exception(f"Texto '{texto}' nao encontrado apos {max_scrolls} scrolls")
+    def _registrar_busca_scroll(self, descricao: str, swipes: int, inicio: float, encontrado: bool) -> float:
+        """Registra o custo da busca (swipes e tempo) em ESTATISTICAS_SCROLL e no log."""
+        tempo = time.monotonic() - inicio
+        ESTATISTICAS_SCROLL.setdefault(descricao, []).append(
+            {'swipes': swipes, 'tempo': tempo, 'encontrado': encontrado}
+        )
+        if encontrado:
+            logger.info(EventoLog("busca_scroll", LogStyle.OK, "{locator} encontrado e visivel ({swipes} swipe(s), {duracao:.1f}s)",
+                                  locator=descricao, swipes=swipes, duracao=tempo))
+        return tempo
+
+    def rolar_ate_texto(self, texto: str, max_scrolls: int = 5, tempo_maximo: float = None):
+        """Rola até o texto ficar visível (motor _rolar_ate, com orçamento de tempo)."""
+        logger.info(EventoLog("busca", LogStyle.BUSCA, "Procurando texto {locator}...", locator=texto))
+        return self._rolar_ate(
+            f"Texto '{texto}'",
+            lambda snapshot: snapshot.buscar_por_texto(texto),
+            self._locator_texto(texto),
+            max_scrolls, tempo_maximo,
+        )
 
-    def rolar_ate_texto_ignorando_teclado(self, texto: str, max_scrolls: int = 10):
+    def rolar_ate_texto_ignorando_teclado(self, texto: str, max_scrolls: int = 10, tempo_maximo: float = None):
         """
         Rola ate encontrar texto MESMO COM TECLADO ABERTO.
-        Versao melhorada que funciona com teclado na tela.
+        Os swipes usam só a parte superior da tela (acima do teclado).
         """
-        logger.info(f"   {LogStyle.BUSCA} Procurando {LogStyle.elemento(texto)} (pode ter teclado aberto)...")
-
-        for tentativa in range(max_scrolls):
-            try:
-                elemento = self.encontrar_por_texto(texto, tempo_espera=2)
-                if self._elemento_realmente_visivel(elemento):
-                    logger.info(f"   {LogStyle.OK} Elemento {LogStyle.elemento(texto)} encontrado e visivel!")
-                    return elemento
-            except:
-                pass
-
-            if tentativa < max_scrolls - 1:
-                logger.info(f"   {LogStyle.SCROLL} Tentativa {tentativa + 1}: Elemento nao encontrado. Rolando...")
-                self.realizar_scroll_ignorando_teclado(direcao='baixo')
-
-        raise Exception(f"Texto '{texto}' nao encontrado apos {max_scrolls} scrolls")
+        logger.info(EventoLog("busca", LogStyle.BUSCA, "Procurando {locator} (pode ter teclado aberto)...", locator=texto))
+        return self._rolar_ate(
+            f"Texto '{texto}'",
+            lambda snapshot: snapshot.buscar_por_texto(texto),
+            self._locator_texto(texto),
+            max_scrolls, tempo_maximo, ignorar_teclado=True,
+        )
 
-    def rolar_ate_id(self, element_id: str, max_scrolls: int = 10):
+    def rolar_ate_id(self, element_id: str, max_scrolls: int = 10, tempo_maximo: float = None):
         """
         Rola até encontrar elemento por ID.
         Funciona MESMO COM TECLADO ABERTO - não tenta fechar.
-        Usa scroll nativo do Android primeiro (mais confiável).
         """
-        logger.info(f"   {LogStyle.BUSCA} Procurando ID {LogStyle.elemento(element_id)}...")
-
-        # Primeiro tenta scroll nativo do Android (mais confiável)
-        elemento = self.scroll_nativo_ate_id(element_id)
-        if elemento and self._elemento_realmente_visivel(elemento):
-            return elemento
-
-        # Fallback: scroll manual
-        logger.info(f"   {LogStyle.FALLBACK} Tentando scroll manual...")
-        for tentativa in range(max_scrolls):
-            try:
-                elemento = WebDriverWait(self.driver, 2).until(
-                    EC.presence_of_element_located((AppiumBy.ID, self._id_completo(element_id)))
-                )
-                if self._elemento_realmente_visivel(elemento):
-                    logger.info(f"   {LogStyle.OK} ID {LogStyle.elemento(element_id)} encontrado e visivel!")
-                    return elemento
-            except:
-                pass
-
-            if tentativa < max_scrolls - 1:
-                logger.info(f"   {LogStyle.SCROLL} Tentativa {tentativa + 1}: Rolando...")
-                self.realizar_scroll_ignorando_teclado(direcao='baixo')
-
-        raise Exception(f"ID '{element_id}' nao encontrado apos {max_scrolls} scrolls")
+        logger.info(EventoLog("busca", LogStyle.BUSCA, "Procurando ID {locator}...", locator=element_id))
+        full_id = self._id_completo(element_id)
+        return self._rolar_ate(
+            f"ID '{element_id}'",
+            lambda snapshot: snapshot.buscar_por_id(full_id),
+            self._locator_id(element_id),
+            max_scrolls, tempo_maximo, ignorar_teclado=True,
+        )
 
     # --- Navegação ---
     def voltar_tela(self, confirmar: bool = False) -> bool:
         """Volta para tela anterior usando driver (funciona com múltiplos devices)."""
-        logger.info(f"{LogStyle.ACAO} Voltando tela...")
+        logger.info(EventoLog("voltar", LogStyle.ACAO, "Voltando tela...", recuo=False))
         try:
             # Usa driver.back() que funciona no device correto
             self.driver.back()
+            self._invalidar_snapshot()
             time.sleep(0.5)
             if confirmar:
                 self._confirmar_dialogo_sair()
-            logger.info(f"   {LogStyle.OK} Voltou tela")
+            logger.info(EventoLog("voltar", LogStyle.OK, "Voltou tela"))
             return True
         except Exception as e:
             logger.warning(f"   {LogStyle.aviso('Erro ao voltar tela:')} {e}")
@@ -508,17 +1096,24 @@ class BasePage:
 
         for locator, by in botoes_confirmar:
             try:
-                elemento = WebDriverWait(self.driver, 2).until(
+                elemento = EsperaAdaptativa(self.driver, 2).until(
                     EC.element_to_be_clickable((by, locator))
                 )
                 elemento.click()
+                self._invalidar_snapshot()
                 return
             except:
                 continue
 
     # --- Validações ---
     def texto_exibido(self, texto: str, tempo_espera: int = 5) -> bool:
-        """Verifica se texto está visível na tela."""
+        """
+        Verifica se texto está visível na tela.
+        Consulta primeiro o snapshot da tela; só espera pelo elemento se não estiver lá.
+        """
+        snapshot = self._obter_snapshot()
+        if any(snapshot.no_visivel(no, self._tamanho_tela()) for no in snapshot.buscar_por_texto(texto)):
+            return True
         try:
             elemento = self.encontrar_por_texto(texto, tempo_espera)
             return self._elemento_realmente_visivel(elemento)
@@ -530,7 +1125,13 @@ class BasePage:
         return self.encontrar_por_texto(texto, tempo_espera)
 
     def elemento_existe(self, element_id: str, tempo_espera: int = 3) -> bool:
-        """Verifica se elemento existe e está visível."""
+        """
+        Verifica se elemento existe e está visível.
+        Consulta primeiro o snapshot da tela; só espera pelo elemento se não estiver lá.
+        """
+        snapshot = self._obter_snapshot()
+        if any(snapshot.no_visivel(no, self._tamanho_tela()) for no in snapshot.buscar_por_id(self._id_completo(element_id))):
+            return True
         try:
             elemento = self.encontrar_por_id(element_id, tempo_espera)
             return self._elemento_realmente_visivel(elemento)
@@ -1,9 +1,9 @@
 """
 Consulta Pedido Page - Page Object para tela de consulta de pedidos.
 """
-import time
 from appium.webdriver.common.appiumby import AppiumBy
-from pages.base_page import BasePage
+from pages.base_page import BasePage, cronometrar_fluxo
+from pages.interrupcoes import BONUS
 from config import logger, LogStyle, Cores
 
 
@@ -22,6 +22,7 @@ class ConsultaPedidoPage(BasePage):
     BTN_MAIS_TARDE = "btn_mais_tarde"
     BTN_IMPRIMIR_NAO = "android:id/button2"
     BTN_CONFIRMAR_VENDA = "btn_confirmar_venda"
+    TXT_VENDA_REALIZADA = "Venda realizada com sucesso!"
 
     # --- Ações de Configuração ---
     def abrir_menu_lateral(self):
@@ -30,7 +31,8 @@ class ConsultaPedidoPage(BasePage):
         try:
             menu = self.driver.find_element(AppiumBy.ACCESSIBILITY_ID, self.ACCESSIBILITY_MENU)
             menu.click()
-            time.sleep(1)
+            self._invalidar_snapshot()
+            self.aguardar_tela_estavel(tempo_maximo=1)
             logger.info(f"   {LogStyle.OK} Menu lateral aberto")
         except Exception as e:
             logger.warning(f"   {LogStyle.aviso('Erro ao abrir menu:')} {e}")
@@ -40,7 +42,7 @@ class ConsultaPedidoPage(BasePage):
         """Acessa tela de configurações."""
         logger.info(f"{LogStyle.ACAO} Acessando {LogStyle.elemento('Configurações')}...")
         self.clicar_por_texto("Configurações")
-        time.sleep(1)
+        self.aguardar_tela_estavel(tempo_maximo=1)
 
     def garantir_flag_buscar_todos_pedidos(self):
         """Garante que a flag 'Buscar todos os pedidos' está ativa."""
@@ -73,7 +75,8 @@ class ConsultaPedidoPage(BasePage):
                             if checked == "false":
                                 logger.info(f"   {LogStyle.INFO} Flag desativada, ativando...")
                                 switch.click()
-                                time.sleep(0.5)
+                                self._invalidar_snapshot()
+                                self.aguardar_tela_estavel(tempo_maximo=0.5)
                             else:
                                 logger.info(f"   {LogStyle.OK} Flag já está ativa")
                             return True
@@ -83,7 +86,7 @@ class ConsultaPedidoPage(BasePage):
             # Fallback: clica no texto para alternar
             logger.info(f"   {LogStyle.FALLBACK} Clicando no texto para alternar...")
             self.clicar_por_texto("Buscar todos os pedidos")
-            time.sleep(0.5)
+            self.aguardar_tela_estavel(tempo_maximo=0.5)
             return True
 
         except Exception as e:
@@ -94,8 +97,10 @@ class ConsultaPedidoPage(BasePage):
         """Volta para a tela inicial."""
         logger.info(f"{LogStyle.ACAO} Voltando para Home...")
         self.driver.back()
-        time.sleep(1)
+        self._invalidar_snapshot()
+        self.aguardar_tela_estavel(tempo_maximo=1)
 
+    @cronometrar_fluxo
     def configurar_buscar_todos_pedidos(self):
         """Fluxo completo para configurar flag de buscar todos os pedidos."""
         logger.info(f"{LogStyle.secao('⚙️  CONFIG - Configurando busca de pedidos')}")
@@ -111,12 +116,12 @@ class ConsultaPedidoPage(BasePage):
         logger.info(f"{LogStyle.ACAO} Acessando {LogStyle.elemento('Cons. Pedido')}...")
         self.rolar_ate_texto("Cons. Pedido")
         self.clicar_por_texto("Cons. Pedido")
-        time.sleep(2)
+        self.aguardar_tela_estavel(tempo_maximo=2)
 
     def selecionar_primeiro_pedido(self):
         """Seleciona o primeiro pedido da lista."""
         logger.info(f"{LogStyle.ACAO} Selecionando primeiro pedido da lista...")
-        time.sleep(2)  # Aguarda lista carregar
+        self.aguardar_tela_estavel(tempo_maximo=2)  # Aguarda lista carregar
 
         try:
             # Tenta clicar no primeiro item da lista
@@ -126,6 +131,7 @@ class ConsultaPedidoPage(BasePage):
 
             if elementos:
                 elementos[0].click()
+                self._invalidar_snapshot()
                 logger.info(f"   {LogStyle.OK} Primeiro pedido selecionado")
                 return True
             else:
@@ -141,14 +147,12 @@ class ConsultaPedidoPage(BasePage):
         logger.info(f"{LogStyle.ACAO} Clicando em {LogStyle.elemento('Finalizar Pedido')}...")
         self.rolar_ate_texto("Finalizar Pedido")
         self.clicar_por_texto("Finalizar Pedido")
-        time.sleep(2)
+        self.aguardar_tela_estavel(tempo_maximo=2)
 
     def tratar_popup_bonus(self):
-        """Trata popup de bônus se aparecer."""
-        logger.info(f"{LogStyle.ACAO} Verificando popup de bônus...")
-        if self.clicar_se_existir(self.BTN_MAIS_TARDE, tempo_espera=3):
+        """Dispensa o popup de bônus se estiver na tela (sem esperar por ele)."""
+        if self.tratar_interrupcoes(BONUS):
             logger.info(f"   {LogStyle.OK} Popup de bônus fechado")
-            time.sleep(1)
         else:
             logger.info(f"   {LogStyle.SKIP} Nenhum popup de bônus")
 
@@ -162,8 +166,8 @@ class ConsultaPedidoPage(BasePage):
     def responder_impressao(self, imprimir: bool = False):
         """Responde ao diálogo de impressão."""
         logger.info(f"{LogStyle.ACAO} Respondendo impressão: {LogStyle.valor('SIM' if imprimir else 'NÃO')}")
-        self.clicar_se_existir(self.BTN_IMPRIMIR_NAO, tempo_espera=20)
-        time.sleep(2)
+        # Terminal pode pular o diálogo: a tela de sucesso também encerra o passo
+        self.passo_opcional(self.BTN_IMPRIMIR_NAO, self._locator_texto(self.TXT_VENDA_REALIZADA), tempo_espera=20)
 
     def concluir_venda(self):
         """Clica em CONCLUIR VENDA."""
@@ -171,6 +175,7 @@ class ConsultaPedidoPage(BasePage):
         self.rolar_ate_texto("CONCLUIR VENDA")
         self.clicar_por_texto("CONCLUIR VENDA")
 
+    @cronometrar_fluxo
     def executar_consulta_e_finalizar_pedido(self):
         """Executa fluxo completo de consulta e finalização de pedido."""
         logger.info(f"{LogStyle.secao('📋 FLUXO - Consulta e finalização de pedido')}")
@@ -186,7 +191,7 @@ class ConsultaPedidoPage(BasePage):
     # --- Validações ---
     def venda_sucesso_exibida(self, timeout: int = 10) -> bool:
         """Verifica se mensagem de sucesso apareceu."""
-        return self.texto_exibido("Venda realizada com sucesso!", timeout)
+        return self.texto_exibido(self.TXT_VENDA_REALIZADA, timeout)
 
     def validar_sucesso_e_concluir(self):
         """Valida sucesso e conclui venda."""
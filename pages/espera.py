@@ -0,0 +1,111 @@
+"""
+Espera adaptativa - WebDriverWait com cronograma de consultas em vez de poll fixo de 0,5s.
+
+As primeiras consultas são rápidas (elemento que aparece logo é detectado em
+dezenas de ms) e o intervalo cresce exponencialmente até um teto (esperas longas
+fazem poucas chamadas ao Appium). A última pausa nunca passa do prazo.
+
+Cada espera registra condição, alvo, número de consultas, tempo e resultado em
+ESTATISTICAS_ESPERAS (resumo no final da execução, em conftest.py).
+"""
+import time
+
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException
+
+
+# Cronograma padrão: POLLS_RAPIDOS consultas a cada POLL_INICIAL, depois x POLL_FATOR até POLL_MAXIMO
+POLL_INICIAL = 0.05
+POLLS_RAPIDOS = 3
+POLL_FATOR = 2.0
+POLL_MAXIMO = 1.0
+
+# Esperas executadas, por condição: [{'alvo', 'consultas', 'tempo', 'sucesso'}]
+ESTATISTICAS_ESPERAS = {}
+
+
+def intervalos(inicial: float = POLL_INICIAL, rapidos: int = POLLS_RAPIDOS,
+               fator: float = POLL_FATOR, maximo: float = POLL_MAXIMO):
+    """Gera os intervalos entre consultas: 'rapidos' vezes 'inicial', depois backoff exponencial até 'maximo'."""
+    intervalo = inicial
+    for _ in range(rapidos):
+        yield intervalo
+    while True:
+        intervalo = min(intervalo * fator, maximo)
+        yield intervalo
+
+
+def descrever_condicao(metodo) -> tuple:
+    """
+    (condição, alvo) para as estatísticas.
+    Para expected_conditions, condição é o nome da função e alvo o valor do locator;
+    para funções/lambdas locais, o método que as criou (ex: BasePage.aguardar_primeiro).
+    """
+    nome = getattr(metodo, '__qualname__', type(metodo).__name__).split('.<locals>')[0]
+    alvo = ""
+    for celula in getattr(metodo, '__closure__', None) or ():
+        try:
+            conteudo = celula.cell_contents
+        except ValueError:
+            continue
+        if isinstance(conteudo, tuple) and len(conteudo) == 2 and isinstance(conteudo[1], str):
+            alvo = conteudo[1]
+            break
+    return nome, alvo
+
+
+class EsperaAdaptativa(WebDriverWait):
+    """
+    WebDriverWait com cronograma de consultas (rápidas no início, backoff depois).
+    Mesma interface: until / until_not, timeout, ignored_exceptions.
+    """
+
+    def __init__(self, driver, timeout: float, ignored_exceptions=None, inicial: float = POLL_INICIAL,
+                 rapidos: int = POLLS_RAPIDOS, fator: float = POLL_FATOR, maximo: float = POLL_MAXIMO):
+        super().__init__(driver, timeout, poll_frequency=inicial, ignored_exceptions=ignored_exceptions)
+        self._cronograma = (inicial, rapidos, fator, maximo)
+
+    def _esperar(self, metodo, message: str, esperado: bool):
+        inicio = time.monotonic()
+        fim = inicio + self._timeout
+        pausas = intervalos(*self._cronograma)
+        consultas = 0
+        screen = stacktrace = None
+        try:
+            while True:
+                consultas += 1
+                try:
+                    valor = metodo(self._driver)
+                    if bool(valor) == esperado:
+                        self._registrar(metodo, consultas, inicio, True)
+                        return valor
+                except self._ignored_exceptions as exc:
+                    if not esperado:
+                        self._registrar(metodo, consultas, inicio, True)
+                        return True
+                    screen = getattr(exc, "screen", None)
+                    stacktrace = getattr(exc, "stacktrace", None)
+                restante = fim - time.monotonic()
+                if restante <= 0:
+                    break
+                time.sleep(min(next(pausas), restante))
+        except Exception:
+            self._registrar(metodo, consultas, inicio, False)
+            raise
+        self._registrar(metodo, consultas, inicio, False)
+        raise TimeoutException(message, screen, stacktrace)
+
+    @staticmethod
+    def _registrar(metodo, consultas: int, inicio: float, sucesso: bool):
+        condicao, alvo = descrever_condicao(metodo)
+        ESTATISTICAS_ESPERAS.setdefault(condicao, []).append({
+            'alvo': alvo, 'consultas': consultas, 'tempo': time.monotonic() - inicio, 'sucesso': sucesso,
+        })
+
+    def until(self, method, message: str = ""):
+        """Aguarda method(driver) retornar valor verdadeiro (TimeoutException no prazo)."""
+        return self._esperar(method, message, esperado=True)
+
+    def until_not(self, method, message: str = ""):
+        """Aguarda method(driver) retornar valor falso ou lançar exceção ignorada."""
+        return self._esperar(method, message, esperado=False)
@@ -0,0 +1,151 @@
+"""
+Gestos de scroll - backend nativo do UiAutomator2 (mobile: scrollGesture / swipeGesture / flingGesture).
+
+O gesto inteiro é executado no device em uma única chamada, sem montar
+ActionChains + ActionBuilder + PointerInput a cada scroll. As regiões de scroll
+são calculadas uma vez por tamanho de tela (device) e reaproveitadas.
+
+O arrasto W3C (ActionChains) continua como fallback quando o comando nativo não
+existe no servidor, e como referência no benchmark (benchmark_gestos.py).
+
+tocar() usa o mesmo caminho (mobile: clickGesture) para tocar em coordenadas
+lidas do snapshot, sem find_element.
+"""
+import functools
+
+from selenium.webdriver.common.action_chains import ActionChains
+from selenium.webdriver.common.actions.action_builder import ActionBuilder
+from selenium.webdriver.common.actions.pointer_input import PointerInput
+from selenium.webdriver.common.actions import interaction
+from selenium.common.exceptions import WebDriverException
+
+from config import logger, LogStyle
+
+
+BACKEND_NATIVO = "nativo"
+BACKEND_W3C = "w3c"
+
+# Faixas verticais da região de scroll, em fração da altura: (topo, base)
+FAIXA_PADRAO = (0.2, 0.8)
+FAIXA_TECLADO = (0.10, 0.35)  # Acima do teclado
+
+# Tamanho da tela por sessão Appium (não muda durante a sessão nos terminais POS)
+_TAMANHO_TELA_POR_SESSAO = {}
+
+# Direção do conteúdo -> direção do dedo (swipeGesture usa a do dedo)
+_DIRECAO_DEDO = {'down': 'up', 'up': 'down'}
+
+
+def tamanho_da_sessao(driver, alternativa=None) -> dict:
+    """
+    Tamanho da tela, buscado uma vez por sessão.
+
+    Args:
+        alternativa: função que devolve o tamanho sem round trip (ex: raiz do snapshot),
+            ou None. Só usa get_window_size se ela não resolver.
+    """
+    chave = getattr(driver, 'session_id', None) or id(driver)
+    tamanho = _TAMANHO_TELA_POR_SESSAO.get(chave)
+    if tamanho is None:
+        tamanho = alternativa() if alternativa else None
+        if tamanho is None:
+            tamanho = driver.get_window_size()
+        tamanho = {'width': tamanho['width'], 'height': tamanho['height']}
+        _TAMANHO_TELA_POR_SESSAO[chave] = tamanho
+    return tamanho
+
+
+@functools.lru_cache(maxsize=32)
+def _regiao(largura: int, altura: int, faixa: tuple) -> tuple:
+    margem = largura // 10
+    topo, base = int(altura * faixa[0]), int(altura * faixa[1])
+    return (('left', margem), ('top', topo), ('width', largura - 2 * margem), ('height', base - topo))
+
+
+def regiao_scroll(tamanho: dict, faixa: tuple = FAIXA_PADRAO) -> dict:
+    """Região {left, top, width, height} da faixa, com 10% de margem lateral (pré-calculada por tela)."""
+    return dict(_regiao(tamanho['width'], tamanho['height'], tuple(faixa)))
+
+
+def scroll(driver, regiao: dict, percentual: float = 1.0, direcao: str = 'down') -> bool:
+    """
+    mobile: scrollGesture - rolagem precisa (sem inércia) do conteúdo na direção pedida.
+
+    Returns:
+        True se ainda dá para rolar nessa direção; False no fim da lista.
+    """
+    return bool(driver.execute_script('mobile: scrollGesture', {
+        **regiao, 'direction': direcao, 'percent': percentual,
+    }))
+
+
+def swipe(driver, regiao: dict, percentual: float = 1.0, direcao: str = 'down', velocidade: int = None):
+    """mobile: swipeGesture - direcao é a do conteúdo (o dedo vai no sentido oposto)."""
+    argumentos = {**regiao, 'direction': _DIRECAO_DEDO[direcao], 'percent': percentual}
+    if velocidade:
+        argumentos['speed'] = velocidade
+    driver.execute_script('mobile: swipeGesture', argumentos)
+
+
+def fling(driver, regiao: dict, direcao: str = 'down', velocidade: int = None) -> bool:
+    """
+    mobile: flingGesture - rolagem rápida com inércia (sem precisão de distância).
+
+    Returns:
+        True se ainda dá para rolar nessa direção; False no fim da lista.
+    """
+    argumentos = {**regiao, 'direction': direcao}
+    if velocidade:
+        argumentos['speed'] = velocidade
+    return bool(driver.execute_script('mobile: flingGesture', argumentos))
+
+
+def arrastar_w3c(driver, x: int, y_inicial: int, y_final: int, pausa: float = 0.2):
+    """Arrasto vertical W3C (ActionChains) - backend antigo."""
+    actions = ActionChains(driver)
+    actions.w3c_actions = ActionBuilder(driver, mouse=PointerInput(interaction.POINTER_TOUCH, "touch"))
+    actions.w3c_actions.pointer_action.move_to_location(x, y_inicial)
+    actions.w3c_actions.pointer_action.pointer_down()
+    actions.w3c_actions.pointer_action.pause(pausa)
+    actions.w3c_actions.pointer_action.move_to_location(x, y_final)
+    actions.w3c_actions.pointer_action.release()
+    actions.perform()
+
+
+def rolar(driver, regiao: dict, percentual: float = 1.0, direcao: str = 'down', backend: str = BACKEND_NATIVO):
+    """
+    Rola o conteúdo da região pelo backend pedido.
+    Se o servidor não tiver o gesto nativo, faz o arrasto W3C equivalente.
+
+    Returns:
+        True/False (ainda dá para rolar) no backend nativo; None no W3C (não informa).
+    """
+    if backend == BACKEND_NATIVO:
+        try:
+            return scroll(driver, regiao, percentual, direcao)
+        except WebDriverException as e:
+            logger.info(f"   {LogStyle.FALLBACK} Gesto nativo indisponivel ({type(e).__name__}), usando W3C")
+
+    x = regiao['left'] + regiao['width'] // 2
+    distancia = int(regiao['height'] * percentual)
+    base = regiao['top'] + regiao['height']
+    if direcao == 'down':
+        arrastar_w3c(driver, x, base, base - distancia)
+    else:
+        arrastar_w3c(driver, x, regiao['top'], regiao['top'] + distancia)
+    return None
+
+
+def tocar(driver, x: int, y: int):
+    """Toque em um ponto da tela (mobile: clickGesture; W3C se o servidor não tiver o gesto)."""
+    try:
+        driver.execute_script('mobile: clickGesture', {'x': x, 'y': y})
+        return
+    except WebDriverException as e:
+        logger.info(f"   {LogStyle.FALLBACK} Toque nativo indisponivel ({type(e).__name__}), usando W3C")
+    actions = ActionChains(driver)
+    actions.w3c_actions = ActionBuilder(driver, mouse=PointerInput(interaction.POINTER_TOUCH, "touch"))
+    actions.w3c_actions.pointer_action.move_to_location(x, y)
+    actions.w3c_actions.pointer_action.pointer_down()
+    actions.w3c_actions.pointer_action.release()
+    actions.perform()
@@ -2,6 +2,7 @@
 Home Page - Page Object para tela inicial (pós-login).
 """
 import time
+from selenium.common.exceptions import TimeoutException
 from pages.base_page import BasePage
 from config import logger, LogStyle, Cores
 
@@ -21,28 +22,28 @@ class HomePage(BasePage):
     def iniciar_venda(self):
         """Inicia uma venda. Tenta 'Venda' (Playstore) ou 'Iniciar Venda' (devices)."""
         logger.info(f"{LogStyle.ACAO} Iniciando venda...")
-        time.sleep(2)  # Aguarda tela estabilizar
 
-        # Tenta clicar diretamente sem scroll (botão sempre visível na home)
-        # Primeiro tenta "Iniciar Venda" (devices: Stone, L400, etc)
-        logger.info(f"   {LogStyle.DEBUG} Verificando {LogStyle.elemento('Iniciar Venda')}...")
+        # "Iniciar Venda" (devices: Stone, L400, etc) ou "Venda" (versão Playstore)
+        # Versão pelo flavor da sessão; se desconhecido, consulta as duas no mesmo loop
         try:
-            if self.texto_exibido(self.TXT_INICIAR_VENDA, tempo_espera=5):
-                logger.info(f"   {LogStyle.OK} Encontrado {LogStyle.elemento('Iniciar Venda')} (versão device)")
+            versao = self.identificar_versao({
+                "device": self._locator_texto(self.TXT_INICIAR_VENDA),
+                "playstore": self._locator_texto(self.TXT_VENDA, exato=True),
+            }, tempo_espera=5)
+        except TimeoutException:
+            versao = None
+            logger.info(f"   {LogStyle.DEBUG} Nem 'Iniciar Venda' nem 'Venda' visiveis")
+
+        try:
+            if versao == "device":
                 self.clicar_por_texto(self.TXT_INICIAR_VENDA)
                 return
-        except Exception as e:
-            logger.info(f"   {LogStyle.DEBUG} 'Iniciar Venda' não encontrado: {e}")
 
-        # Depois tenta "Venda" (versão Playstore)
-        logger.info(f"   {LogStyle.DEBUG} Verificando {LogStyle.elemento('Venda')}...")
-        try:
-            if self.texto_exibido(self.TXT_VENDA, tempo_espera=5):
-                logger.info(f"   {LogStyle.OK} Encontrado {LogStyle.elemento('Venda')} (versão Playstore)")
+            if versao == "playstore":
                 self.clicar_por_texto(self.TXT_VENDA)
                 return
         except Exception as e:
-            logger.info(f"   {LogStyle.DEBUG} 'Venda' não encontrado: {e}")
+            logger.info(f"   {LogStyle.DEBUG} Botão da versão {versao} não clicável: {e}")
 
         # Última tentativa: usa scroll nativo para encontrar
         logger.info(f"   {LogStyle.DEBUG} Tentando com scroll nativo...")
@@ -67,7 +68,7 @@ class HomePage(BasePage):
         logger.info(f"{LogStyle.ACAO} Iniciando troca...")
         # Rola até encontrar o botão se necessário
         self.rolar_ate_texto(self.TXT_REALIZAR_TROCA, max_scrolls=5)
-        time.sleep(0.5)
+        self.aguardar_tela_estavel(tempo_maximo=0.5)
         self.clicar_por_texto(self.TXT_REALIZAR_TROCA)
         logger.info(f"   {LogStyle.OK} Clicou em {LogStyle.elemento('Realizar Troca')}")
 
@@ -78,7 +79,7 @@ class HomePage(BasePage):
         Usa ID para clicar no primeiro vendedor da lista.
         """
         logger.info(f"{LogStyle.ACAO} Selecionando vendedor...")
-        time.sleep(2)  # Aguarda tela estabilizar
+        self.aguardar_tela_estavel(tempo_maximo=2)
 
         for tentativa in range(max_tentativas):
             try:
@@ -89,7 +90,7 @@ class HomePage(BasePage):
                     # Clica no PRIMEIRO vendedor da lista por ID
                     self.clicar_no_primeiro_da_lista_por_id(self.DIALOGO_VENDEDOR)
                     logger.info(f"   {LogStyle.OK} Primeiro vendedor da lista selecionado!")
-                    time.sleep(1)
+                    self.aguardar_tela_estavel(tempo_maximo=1)
                     return
 
                 # 2. Verifica se é diálogo popup (mesmo ID)
@@ -112,6 +113,11 @@ class HomePage(BasePage):
     # --- Validações ---
     def tela_inicial_exibida(self, timeout: int = 10) -> bool:
         """Verifica se está na tela inicial."""
+        # Flavor conhecido: só o texto da versão (evita esperar o timeout da outra)
+        if self.layout == "device":
+            return self.texto_exibido(self.TXT_INICIAR_VENDA, timeout)
+        if self.layout == "playstore":
+            return self.texto_exibido(self.TXT_VENDA, timeout)
         return (
             self.texto_exibido(self.TXT_INICIAR_VENDA, timeout) or
             self.texto_exibido(self.TXT_VENDA, timeout)
@@ -0,0 +1,94 @@
+"""
+Interrupções conhecidas - diálogos e popups que podem cobrir a tela no meio de um fluxo.
+
+Cada interrupção diz como reconhecê-la na hierarquia (texto e/ou botão visível) e
+qual botão a dispensa. O reconhecimento é feito sobre o snapshot que a BasePage já
+baixou, sem nenhuma espera:
+  - automáticas (bônus, permissões do Android): dispensadas em todo snapshot novo
+    (BasePage.INTERCEPTAR_INTERRUPCOES; desligado, só por tratar_interrupcoes() sem
+    argumentos e antes de cada nova tentativa de clique);
+  - sob demanda (impressão, confirmação "SIM"): só quando o fluxo pede, porque a
+    resposta muda o caminho do fluxo.
+
+Interrupções dispensadas ficam em INTERRUPCOES_TRATADAS (resumo no final da
+execução, em conftest.py).
+"""
+
+
+class Interrupcao:
+    """Diálogo/popup que interrompe o fluxo: como reconhecer e como dispensar."""
+
+    def __init__(self, nome: str, botoes_id: tuple = (), botao_texto: str = None,
+                 texto: str = None, automatica: bool = False):
+        """
+        Args:
+            botoes_id: IDs do botão que dispensa (o primeiro visível é usado). ID sem
+                package ("btn_mais_tarde") vale para qualquer package do app.
+            botao_texto: texto exato do botão, quando ele não tem ID estável.
+            texto: texto que precisa estar visível para a interrupção valer (título).
+            automatica: dispensada sem o fluxo pedir por ela (ver AUTOMATICAS).
+        """
+        self.nome = nome
+        self.botoes_id = botoes_id
+        self.botao_texto = botao_texto
+        self.texto = texto
+        self.automatica = automatica
+
+    def _eh_botao(self, atributos: dict) -> bool:
+        if self.botao_texto is not None and (atributos.get('text') or '').strip() == self.botao_texto:
+            return True
+        resource_id = atributos.get('resource-id') or ''
+        for botao in self.botoes_id:
+            completo = botao if ':id/' in botao else None
+            if resource_id == completo or (completo is None and resource_id.endswith(f":id/{botao}")):
+                return True
+        return False
+
+    def botao_na_tela(self, snapshot, tela: dict = None):
+        """Atributos do botão que dispensa a interrupção, se ela estiver na tela (senão None)."""
+        botao = titulo = None
+        for no in snapshot.nos():
+            atributos = no.attrib
+            if botao is None and self._eh_botao(atributos) and snapshot.no_visivel(atributos, tela):
+                botao = atributos
+            if titulo is None and self.texto and self.texto in (atributos.get('text') or '') \
+                    and snapshot.no_visivel(atributos, tela):
+                titulo = atributos
+        if botao is None or (self.texto and titulo is None):
+            return None
+        return botao
+
+    def __repr__(self):
+        return f"Interrupcao({self.nome!r})"
+
+
+BONUS = Interrupcao("bonus", botoes_id=("btn_mais_tarde",), texto="BÔNUS DISPONÍVEL", automatica=True)
+PERMISSAO_ANDROID = Interrupcao("permissao_android", botoes_id=(
+    "com.android.permissioncontroller:id/permission_allow_foreground_only_button",
+    "com.android.permissioncontroller:id/permission_allow_button",
+    "com.android.packageinstaller:id/permission_allow_button",
+), automatica=True)
+IMPRESSAO = Interrupcao("impressao", botoes_id=("android:id/button2",))
+CONFIRMACAO_SIM = Interrupcao("confirmacao_sim", botao_texto="SIM")
+
+REGISTRO = (BONUS, PERMISSAO_ANDROID, IMPRESSAO, CONFIRMACAO_SIM)
+AUTOMATICAS = tuple(i for i in REGISTRO if i.automatica)
+
+# Quantas vezes cada interrupção foi dispensada, por nome
+INTERRUPCOES_TRATADAS = {}
+
+
+def detectar(snapshot, interrupcoes=AUTOMATICAS, tela: dict = None):
+    """(interrupção, atributos do botão) da primeira interrupção na tela, ou None."""
+    if snapshot.raiz is None:
+        return None
+    for interrupcao in interrupcoes:
+        botao = interrupcao.botao_na_tela(snapshot, tela)
+        if botao is not None:
+            return interrupcao, botao
+    return None
+
+
+def registrar(interrupcao: Interrupcao):
+    """Conta uma interrupção dispensada."""
+    INTERRUPCOES_TRATADAS[interrupcao.nome] = INTERRUPCOES_TRATADAS.get(interrupcao.nome, 0) + 1
@@ -0,0 +1,259 @@
+"""
+Locators compilados - traduz os formatos de XPath usados nas páginas para UiSelector.
+
+No UiAutomator2 toda busca por XPath serializa a hierarquia inteira no device;
+UiSelector é resolvido direto pelo UiAutomator. Formatos suportados:
+
+    //*[@resource-id='R']                      -> resourceId("R")
+    //*[@text='T'] | //*[contains(@text,'T')]  -> text("T") | textContains("T")
+    //android.widget.X[@...]                   -> className("android.widget.X")...
+    //A//B                                     -> A.childSelector(B)
+    //A/..//B                                  -> A.fromParent(B)
+
+Qualquer outro formato (ex: /../.., índices, eixos) continua como XPath.
+
+Também guarda, por modelo de device, qual estratégia equivalente (ID, UiSelector
+ou XPath) foi a mais rápida para cada locator das páginas (benchmark_locators.py).
+"""
+import re
+import json
+import time
+import functools
+from datetime import datetime
+
+from appium.webdriver.common.appiumby import AppiumBy
+from selenium.webdriver.support import expected_conditions as EC
+
+from config import logger, LogStyle, BENCHMARK_DIR
+from pages.espera import EsperaAdaptativa
+
+
+# Passo: nó + predicado opcional entre colchetes (o valor pode conter '/', ex: "pkg:id/x")
+_PASSO_XPATH = r"[^/\[\]]+(?:\[[^\]]*\])?"
+_XPATH_SUPORTADO = re.compile(
+    rf"//(?P<ancora>{_PASSO_XPATH})(?P<subidas>(?:/\.\.)*)(?://(?P<alvo>{_PASSO_XPATH}))?"
+)
+_PASSO = re.compile(r"(?P<no>\*|[\w.]+)(?:\[(?P<predicado>.+)\])?")
+_PREDICADO_IGUAL = re.compile(r"@(?P<atributo>[\w-]+)\s*=\s*'(?P<valor>[^']*)'")
+_PREDICADO_CONTAINS = re.compile(r"contains\(\s*@(?P<atributo>[\w-]+)\s*,\s*'(?P<valor>[^']*)'\s*\)")
+
+# (atributo XPath, contains?) -> método do UiSelector
+_METODO_POR_ATRIBUTO = {
+    ('resource-id', False): 'resourceId',
+    ('text', False): 'text',
+    ('text', True): 'textContains',
+    ('content-desc', False): 'description',
+    ('content-desc', True): 'descriptionContains',
+    ('class', False): 'className',
+}
+
+
+def _seletor_do_passo(passo: str):
+    """Converte um passo ('*[@text='X']', 'android.widget.EditText') em UiSelector, ou None."""
+    m = _PASSO.fullmatch(passo.strip())
+    if not m:
+        return None
+
+    metodos = []
+    if m.group('no') != '*':
+        metodos.append(f'className("{m.group("no")}")')
+
+    predicado = m.group('predicado')
+    if predicado:
+        contains = _PREDICADO_CONTAINS.fullmatch(predicado.strip())
+        igual = None if contains else _PREDICADO_IGUAL.fullmatch(predicado.strip())
+        p = contains or igual
+        if not p:
+            return None
+        metodo = _METODO_POR_ATRIBUTO.get((p.group('atributo'), bool(contains)))
+        if not metodo:
+            return None
+        valor = p.group('valor').replace('\\', '\\\\').replace('"', '\\"')
+        metodos.append(f'{metodo}("{valor}")')
+
+    if not metodos:
+        return None
+    return "new UiSelector()." + ".".join(metodos)
+
+
+@functools.lru_cache(maxsize=256)
+def xpath_para_uiselector(xpath: str):
+    """
+    Traduz o XPath para uma cadeia UiSelector.
+
+    Returns:
+        String para AppiumBy.ANDROID_UIAUTOMATOR, ou None se o formato não é suportado.
+    """
+    m = _XPATH_SUPORTADO.fullmatch(xpath.strip())
+    if not m:
+        return None
+
+    subidas = len(m.group('subidas')) // 3
+    ancora = _seletor_do_passo(m.group('ancora'))
+    if ancora is None:
+        return None
+
+    alvo_xpath = m.group('alvo')
+    if alvo_xpath is None:
+        # Sem descendente: só o próprio nó (subir até o pai não tem equivalente)
+        return ancora if subidas == 0 else None
+
+    alvo = _seletor_do_passo(alvo_xpath)
+    if alvo is None or subidas > 1:
+        return None
+    if subidas == 1:
+        return f"{ancora}.fromParent({alvo})"
+    return f"{ancora}.childSelector({alvo})"
+
+
+def compilar_xpath(xpath: str) -> tuple:
+    """Locator (by, valor): UiSelector quando possível, senão o próprio XPath."""
+    seletor = xpath_para_uiselector(xpath)
+    if seletor:
+        return (AppiumBy.ANDROID_UIAUTOMATOR, seletor)
+    return (AppiumBy.XPATH, xpath)
+
+
+# Tempo em que só o UiSelector é consultado; depois o XPath original entra no mesmo poll
+ORCAMENTO_UISELECTOR = 1.0
+
+
+def aguardar_por_xpath(driver, xpath: str, timeout: float):
+    """
+    Aguarda o elemento do XPath usando o locator compilado.
+    Se o UiSelector não achar nada em ORCAMENTO_UISELECTOR, o XPath original passa a
+    ser consultado junto no mesmo poll (fallback para diferenças de semântica entre
+    os dois), sem esgotar o timeout antes de tentar o XPath.
+    """
+    by, valor = compilar_xpath(xpath)
+    if by == AppiumBy.XPATH:
+        return EsperaAdaptativa(driver, timeout).until(EC.presence_of_element_located((by, valor)))
+
+    locator = (by, valor)
+    inicio_xpath = time.monotonic() + min(ORCAMENTO_UISELECTOR, timeout)
+
+    def _uiselector_ou_xpath(drv):
+        elementos = drv.find_elements(*locator)
+        if elementos:
+            return elementos[0]
+        if time.monotonic() < inicio_xpath:
+            return False
+        elementos = drv.find_elements(AppiumBy.XPATH, xpath)
+        if elementos:
+            logger.info(f"   {LogStyle.FALLBACK} UiSelector sem resultado, encontrado pelo XPath: {xpath}")
+            return elementos[0]
+        return False
+
+    return EsperaAdaptativa(driver, timeout).until(_uiselector_ou_xpath)
+
+
+# --- Estratégias equivalentes por locator ---
+ESTRATEGIAS_ID = ('id', 'uiselector', 'xpath')
+ESTRATEGIAS_TEXTO = ('uiselector', 'xpath')
+
+# Preferências carregadas por modelo de device ({modelo: {chave: estratégia}})
+_PREFERENCIAS_POR_MODELO = {}
+
+
+def tipo_locator(valor: str) -> str:
+    """'id' para resource-ids (ex: btn_ok, android:id/button1), 'texto' para textos de tela."""
+    if ':id/' in valor or re.fullmatch(r"[a-z][A-Za-z0-9_]*", valor):
+        return 'id'
+    return 'texto'
+
+
+def chave_locator(tipo: str, valor: str) -> str:
+    """Chave do locator nos resultados (independe do package/ambiente)."""
+    return f"{tipo}:{valor}"
+
+
+def locator_por_estrategia(tipo: str, valor: str, estrategia: str) -> tuple:
+    """
+    Locator (by, valor) equivalente na estratégia pedida.
+
+    Args:
+        tipo: 'id' (valor = resource-id completo) ou 'texto' (valor = texto contido).
+        estrategia: 'id', 'uiselector' ou 'xpath'.
+    """
+    valor_java = valor.replace('\\', '\\\\').replace('"', '\\"')
+    if tipo == 'id':
+        if estrategia == 'uiselector':
+            return (AppiumBy.ANDROID_UIAUTOMATOR, f'new UiSelector().resourceId("{valor_java}")')
+        if estrategia == 'xpath':
+            return (AppiumBy.XPATH, f"//*[@resource-id='{valor}']")
+        return (AppiumBy.ID, valor)
+    if estrategia == 'xpath':
+        return (AppiumBy.XPATH, f"//*[contains(@text,'{valor}')]")
+    return (AppiumBy.ANDROID_UIAUTOMATOR, f'new UiSelector().textContains("{valor_java}")')
+
+
+def escolher_preferida(estrategias: dict):
+    """
+    Estratégia mais rápida entre as equivalentes.
+    Só escolhe se todas acharam a mesma quantidade de elementos (senão não são equivalentes).
+
+    Args:
+        estrategias: {nome: {"media_ms": float, "encontrados": int}}
+    """
+    if not estrategias:
+        return None
+    if len({r['encontrados'] for r in estrategias.values()}) != 1:
+        return None
+    return min(estrategias, key=lambda nome: estrategias[nome]['media_ms'])
+
+
+def arquivo_resultados(modelo: str):
+    """Arquivo JSON de resultados do modelo de device."""
+    nome = re.sub(r"[^\w.-]+", "_", modelo or "desconhecido")
+    return BENCHMARK_DIR / f"locators_{nome}.json"
+
+
+def salvar_resultados(modelo: str, resultados: dict, origem: str = "sessao"):
+    """
+    Mescla os resultados do benchmark no arquivo do modelo.
+    Resultados de sessão real não são sobrescritos por medições de hierarquia gravada.
+
+    Args:
+        resultados: {chave: {nome_estrategia: {"media_ms", "encontrados"}}}
+        origem: "sessao" (device) ou "hierarquia" (XML gravado).
+    """
+    arquivo = arquivo_resultados(modelo)
+    dados = {"modelo": modelo, "locators": {}}
+    if arquivo.exists():
+        dados = json.loads(arquivo.read_text(encoding='utf-8'))
+
+    for chave, estrategias in resultados.items():
+        atual = dados["locators"].get(chave)
+        if atual and atual.get("origem") == "sessao" and origem != "sessao":
+            continue
+        dados["locators"][chave] = {
+            "origem": origem,
+            "estrategias": estrategias,
+            "preferida": escolher_preferida(estrategias),
+        }
+
+    dados["atualizado_em"] = datetime.now().isoformat(timespec='seconds')
+    arquivo.parent.mkdir(parents=True, exist_ok=True)
+    arquivo.write_text(json.dumps(dados, indent=2, ensure_ascii=False), encoding='utf-8')
+    _PREFERENCIAS_POR_MODELO.pop(modelo, None)
+    return arquivo
+
+
+def preferencias_do_modelo(modelo: str) -> dict:
+    """{chave: estratégia preferida} do modelo, lido do disco uma vez por execução."""
+    prefs = _PREFERENCIAS_POR_MODELO.get(modelo)
+    if prefs is None:
+        prefs = {}
+        arquivo = arquivo_resultados(modelo)
+        if modelo and arquivo.exists():
+            try:
+                dados = json.loads(arquivo.read_text(encoding='utf-8'))
+                prefs = {
+                    chave: info["preferida"]
+                    for chave, info in dados.get("locators", {}).items()
+                    if info.get("preferida")
+                }
+            except (ValueError, KeyError, OSError) as e:
+                logger.warning(f"[AVISO] Resultados de benchmark invalidos em {arquivo}: {e}")
+        _PREFERENCIAS_POR_MODELO[modelo] = prefs
+    return prefs
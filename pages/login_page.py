@@ -30,8 +30,10 @@ class LoginPage(BasePage):
         """Configura conexao com servidor apenas se o botao existir."""
         if self.clicar_se_existir(self.BTN_CONFIGURAR_CONEXAO, tempo_espera=3):
             logger.info("   Configurando conexao...")
-            self.digitar_por_id(self.EDT_IP_SERVIDOR, ip)
-            self.digitar_por_id(self.EDT_GATEWAY_SERVIDOR, porta)
+            self.preencher_formulario([
+                (self.EDT_IP_SERVIDOR, ip),
+                (self.EDT_GATEWAY_SERVIDOR, porta),
+            ])
             self.clicar_por_id(self.BTN_SALVAR_DIALOGO)
             return True
         logger.info("   Conexao ja configurada, pulando...")
@@ -40,9 +42,11 @@ class LoginPage(BasePage):
     def preencher_credenciais(self, empresa: str, usuario: str, senha: str):
         """Preenche credenciais de login."""
         logger.info("   Preenchendo credenciais...")
-        self.digitar_por_id(self.EDT_EMPRESA, empresa)
-        self.digitar_por_id(self.EDT_USUARIO, usuario)
-        self.digitar_por_id(self.EDT_SENHA, senha)
+        self.preencher_formulario([
+            (self.EDT_EMPRESA, empresa),
+            (self.EDT_USUARIO, usuario),
+            (self.EDT_SENHA, senha),
+        ])
         # Fecha o teclado
         self.fechar_teclado()
 
@@ -84,6 +88,11 @@ class LoginPage(BasePage):
     # --- Validações ---
     def esta_logado(self, timeout: int = 5) -> bool:
         """Verifica se usuario esta logado."""
+        # Flavor conhecido: só o texto da versão (evita esperar o timeout da outra)
+        if self.layout == "device":
+            return self.texto_exibido("Iniciar Venda", timeout)
+        if self.layout == "playstore":
+            return self.texto_exibido("Venda", timeout)
         return (
             self.texto_exibido("Iniciar Venda", timeout) or
             self.texto_exibido("Venda", timeout)
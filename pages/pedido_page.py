@@ -1,8 +1,8 @@
 """
 Pedido Page - Page Object para tela de pedido de venda.
 """
-import time
-from pages.base_page import BasePage
+from pages.base_page import BasePage, cronometrar_fluxo
+from pages.interrupcoes import BONUS
 from config import logger, LogStyle, Cores
 
 
@@ -60,7 +60,7 @@ class PedidoPage(BasePage):
     def adicionar_produto(self, codigo: str = "123"):
         """Adiciona produto pelo código."""
         logger.info(f"{LogStyle.ACAO} Adicionando produto: {LogStyle.valor(codigo)}")
-        time.sleep(2)  # Aguarda tela carregar após selecionar cliente
+        self.aguardar_tela_estavel(tempo_maximo=2)  # Aguarda tela carregar após selecionar cliente
 
         # Tenta encontrar o botão, pode precisar de scroll em algumas telas
         try:
@@ -78,25 +78,24 @@ class PedidoPage(BasePage):
         """Clica no botão avançar."""
         logger.info(f"{LogStyle.ACAO} Clicando em {LogStyle.elemento('Avançar')}...")
         self.rolar_ate_id(self.BTN_PROXIMO)
+        self.aguardar_tela_estavel()
         elemento = self.encontrar_clicavel_por_id(self.BTN_PROXIMO)
-        time.sleep(1.5)
         elemento.click()
+        self._invalidar_snapshot()
 
     def selecionar_pagamento_dinheiro(self):
         """Seleciona forma de pagamento dinheiro."""
         logger.info(f"{LogStyle.ACAO} Selecionando pagamento: {LogStyle.valor('DINHEIRO')}")
-        time.sleep(3)
+        self.aguardar_tela_estavel(tempo_maximo=3)
         self.rolar_ate_texto("DINHEIRO")
         self.clicar_por_texto("DINHEIRO")
         self.rolar_ate_id(self.BTN_AVANCAR)
         self.clicar_por_id(self.BTN_AVANCAR)
 
     def tratar_popup_bonus(self):
-        """Trata popup de BÔNUS DISPONÍVEL se aparecer."""
-        if self.texto_exibido(self.TXT_BONUS_DISPONIVEL, tempo_espera=3):
-            logger.info(f"{LogStyle.ACAO} Popup {LogStyle.elemento('BÔNUS DISPONÍVEL')} detectado. Clicando em 'Mais tarde'...")
-            self.clicar_por_id(self.BTN_MAIS_TARDE)
-            time.sleep(1)
+        """Dispensa o popup de BÔNUS DISPONÍVEL se estiver na tela (sem esperar por ele)."""
+        if self.tratar_interrupcoes(BONUS):
+            logger.info(f"   {LogStyle.OK} Popup {LogStyle.elemento('BÔNUS DISPONÍVEL')} fechado")
 
     def finalizar_pedido(self):
         """Finaliza o pedido."""
@@ -113,6 +112,7 @@ class PedidoPage(BasePage):
         self.rolar_ate_id(self.BTN_PEDIDO_GERADO)
         self.clicar_por_id(self.BTN_PEDIDO_GERADO)
 
+    @cronometrar_fluxo
     def executar_pedido_venda_consumidor(self, codigo_produto: str = "123"):
         """Executa fluxo completo de pedido de venda para consumidor (sem cliente)."""
         logger.info(f"{LogStyle.secao('📋 FLUXO - Pedido de venda (CONSUMIDOR)')}")
@@ -127,6 +127,7 @@ class PedidoPage(BasePage):
 
         logger.info(f"{LogStyle.secao('📋 FLUXO - Pedido (CONSUMIDOR) concluído ✅')}")
 
+    @cronometrar_fluxo
     def executar_pedido_venda_cliente(self, id_cliente: str = "1", codigo_produto: str = "123"):
         """Executa fluxo completo de pedido de venda para cliente cadastrado."""
         logger.info(f"{LogStyle.secao('📋 FLUXO - Pedido de venda (CLIENTE)')}")
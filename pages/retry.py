@@ -0,0 +1,109 @@
+"""
+Política de retry - decide, pela exceção, se vale tentar de novo.
+
+Retentáveis: a tela ainda está se acomodando (elemento stale, clique interceptado,
+elemento ainda não interativo ou não apareceu a tempo). Tentam de novo com
+backoff exponencial e jitter.
+
+Fatais: nenhuma nova tentativa vai funcionar (sessão encerrada, UiAutomator2 caiu,
+locator inválido, erro de programação). Falham na hora, sem esperar.
+
+Tentativas, retries e falhas de cada locator ficam em CONTADORES_RETRY
+(resumo no final da execução, em conftest.py).
+"""
+import time
+import random
+
+from selenium.common.exceptions import (
+    WebDriverException, StaleElementReferenceException, ElementClickInterceptedException,
+    ElementNotInteractableException, InvalidElementStateException, NoSuchElementException,
+    TimeoutException, InvalidSessionIdException, InvalidSelectorException, InvalidArgumentException,
+    NoSuchDriverException, SessionNotCreatedException, UnknownMethodException,
+)
+
+from config import logger, LogStyle
+
+
+RETENTAVEL = "retentavel"
+FATAL = "fatal"
+
+# Backoff: BASE_BACKOFF * 2^tentativa, limitado a MAXIMO_BACKOFF, com jitter de 50%-100%
+BASE_BACKOFF = 0.3
+MAXIMO_BACKOFF = 2.0
+
+_RETENTAVEIS = (
+    StaleElementReferenceException, ElementClickInterceptedException, ElementNotInteractableException,
+    InvalidElementStateException, NoSuchElementException, TimeoutException,
+)
+_FATAIS = (
+    InvalidSessionIdException, InvalidSelectorException, InvalidArgumentException,
+    NoSuchDriverException, SessionNotCreatedException, UnknownMethodException,
+)
+# Mensagens do Appium/UiAutomator2 quando a sessão não existe mais
+_MENSAGENS_FATAIS = (
+    "session is either terminated or not started",
+    "instrumentation process is not running",
+    "cannot be proxied to uiautomator2 server",
+    "socket hang up",
+    "econnrefused",
+)
+
+# Por locator: {'tentativas', 'retries', 'fatais', 'esgotados'}
+CONTADORES_RETRY = {}
+
+
+def classificar_falha(excecao: Exception) -> str:
+    """RETENTAVEL ou FATAL para a exceção. WebDriverException desconhecida é retentável."""
+    if isinstance(excecao, _FATAIS):
+        return FATAL
+    if isinstance(excecao, _RETENTAVEIS):
+        return RETENTAVEL
+    if isinstance(excecao, WebDriverException):
+        mensagem = (excecao.msg or "").lower()
+        if any(trecho in mensagem for trecho in _MENSAGENS_FATAIS):
+            return FATAL
+        return RETENTAVEL
+    # Erros fora do Selenium/Appium (AttributeError, TypeError...) não melhoram tentando de novo
+    return FATAL
+
+
+def atraso_backoff(tentativa: int, base: float = BASE_BACKOFF, maximo: float = MAXIMO_BACKOFF) -> float:
+    """Pausa antes da próxima tentativa (tentativa começa em 0), com jitter para não sincronizar devices."""
+    return min(maximo, base * 2 ** tentativa) * random.uniform(0.5, 1.0)
+
+
+def _contador(chave: str) -> dict:
+    return CONTADORES_RETRY.setdefault(chave, {'tentativas': 0, 'retries': 0, 'fatais': 0, 'esgotados': 0})
+
+
+def executar_com_retry(chave: str, acao, max_tentativas: int = 3, classificar=classificar_falha):
+    """
+    Executa acao() com a política de retry.
+
+    Args:
+        chave: locator/ação para os contadores e o log (ex: 'btn_ok').
+        classificar: função(exceção) -> RETENTAVEL/FATAL.
+
+    Returns:
+        O retorno de acao().
+
+    Raises:
+        A exceção original: na hora se fatal, ou após max_tentativas se retentável.
+    """
+    contador = _contador(chave)
+    for tentativa in range(max_tentativas):
+        contador['tentativas'] += 1
+        try:
+            return acao()
+        except Exception as e:
+            if classificar(e) == FATAL:
+                contador['fatais'] += 1
+                logger.error(f"   {LogStyle.ERRO} Falha fatal em {LogStyle.elemento(chave)} ({type(e).__name__}), sem novas tentativas")
+                raise
+            if tentativa == max_tentativas - 1:
+                contador['esgotados'] += 1
+                raise
+            pausa = atraso_backoff(tentativa)
+            contador['retries'] += 1
+            logger.warning(f"   {LogStyle.RETRY} Tentativa {tentativa + 1} falhou: {e}. Tentando novamente em {pausa:.1f}s...")
+            time.sleep(pausa)
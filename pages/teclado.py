@@ -0,0 +1,68 @@
+"""
+Teclado virtual - controle só com comandos da sessão Appium (sem subprocess adb).
+
+Os comandos vão pelo driver para o device da própria sessão (mesmo com vários
+devices conectados) e não abrem processos. Em vez de pausas fixas, o fechamento
+é confirmado consultando mobile: isKeyboardShown em intervalos curtos.
+"""
+import time
+
+from selenium.common.exceptions import WebDriverException
+
+from config import logger, LogStyle
+
+
+KEYCODE_BACK = 4
+KEYCODE_ESCAPE = 111
+
+# Métodos de fechamento, na ordem de tentativa (compatível com ROMs Stone, Cielo etc.)
+_METODOS_FECHAR = (
+    ("hide_keyboard", lambda driver: driver.hide_keyboard()),
+    ("KEYCODE_BACK", lambda driver: driver.press_keycode(KEYCODE_BACK)),
+    ("KEYCODE_ESCAPE", lambda driver: driver.press_keycode(KEYCODE_ESCAPE)),
+)
+
+
+def teclado_visivel(driver) -> bool:
+    """mobile: isKeyboardShown (False se o comando falhar)."""
+    try:
+        return bool(driver.execute_script('mobile: isKeyboardShown'))
+    except Exception:
+        return False
+
+
+def aguardar_fechado(driver, tempo_maximo: float = 0.5, intervalo: float = 0.05) -> bool:
+    """Consulta o teclado até fechar ou estourar tempo_maximo."""
+    inicio = time.monotonic()
+    while teclado_visivel(driver):
+        if time.monotonic() - inicio >= tempo_maximo:
+            return False
+        time.sleep(intervalo)
+    return True
+
+
+def fechar(driver, visivel: bool = None, tempo_confirmacao: float = 0.5) -> bool:
+    """
+    Fecha o teclado tentando cada método até um funcionar.
+    KEYCODE_BACK só é enviado com o teclado aberto (senão voltaria de tela).
+
+    Args:
+        visivel: estado já conhecido do teclado (evita uma consulta); None consulta.
+
+    Returns:
+        True se o teclado ficou fechado (ou já estava).
+    """
+    if visivel is None:
+        visivel = teclado_visivel(driver)
+    if not visivel:
+        return True
+
+    for nome, acao in _METODOS_FECHAR:
+        try:
+            acao(driver)
+        except WebDriverException:
+            continue
+        if aguardar_fechado(driver, tempo_confirmacao):
+            logger.info(f"   {LogStyle.OK} Teclado fechado via {nome}.")
+            return True
+    return False
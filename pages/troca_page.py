@@ -1,9 +1,10 @@
 """
 Troca Page - Page Object para tela de troca/devolução.
 """
-import time
 from datetime import datetime
-from pages.base_page import BasePage
+from selenium.common.exceptions import TimeoutException
+from pages.base_page import BasePage, cronometrar_fluxo
+from pages.interrupcoes import BONUS, CONFIRMACAO_SIM, registrar as registrar_interrupcao
 from config import logger, LogStyle, Cores
 from test_data import test_data
 
@@ -18,6 +19,12 @@ class TrocaPage(BasePage):
     CHECKBOX_ITEM = "checkBox"
     BTN_DEVOLVER = "button12"
     BTN_DIALOGO_OK = "md_buttonDefaultPositive"
+    TXT_SUCESSO = "Sucesso!"
+
+    # Espera pelo segundo diálogo da devolução (ou pela tela de sucesso, que vem no lugar dele)
+    TEMPO_SEGUNDO_DIALOGO = 5
+    # Espera pela confirmação "SIM" após selecionar a nota (ou pelo item, que vem no lugar dela)
+    TEMPO_CONFIRMACAO_SIM = 10
 
     # Venda pós-troca (consumidor)
     BTN_ADICIONAR_PRODUTOS = "btn_adicionar_produtos"
@@ -51,8 +58,8 @@ class TrocaPage(BasePage):
 
         self.clicar_por_id(self.INPUT_DATA_INICIAL)
         xpath = f"//*[@resource-id='{self.app_package}:id/{self.INPUT_DATA_INICIAL}']//android.widget.EditText"
-        self.digitar_por_xpath(xpath, data)
-        time.sleep(0.5)
+        self.digitar_por_xpath(xpath, data, rapido=True)
+        self.aguardar_tela_estavel(tempo_maximo=0.5)
 
     def clicar_consultar(self):
         """Clica no botão consultar."""
@@ -63,20 +70,44 @@ class TrocaPage(BasePage):
     def selecionar_primeira_nota(self):
         """Seleciona primeira nota da lista."""
         logger.info(f"{LogStyle.ACAO} Selecionando primeira nota da lista...")
-        time.sleep(1)
+        self.aguardar_tela_estavel(tempo_maximo=1)
         self.clicar_no_primeiro_da_lista_por_id(self.ITEM_LISTA_NOTAS)
 
     def selecionar_cliente(self, identificador: str):
         """Seleciona cliente pelo identificador."""
         logger.info(f"{LogStyle.ACAO} Selecionando cliente: {LogStyle.valor(identificador)}")
-        self.digitar_por_id(self.EDT_BUSCA_CLIENTE, identificador)
+        self.digitar_por_id(self.EDT_BUSCA_CLIENTE, identificador, rapido=True)
         self.pressionar_pesquisar()
         self.clicar_por_id(self.BTN_CONFIRMAR_CLIENTE)
 
+    def responder_confirmacao_sim(self) -> bool:
+        """
+        Responde SIM à confirmação que pode abrir depois de selecionar a nota.
+        Disputa o botão SIM com o checkbox do item (tela seguinte): vence o que aparecer primeiro.
+
+        Returns:
+            True se a confirmação apareceu e foi respondida; False se o item veio direto.
+        """
+        try:
+            tela, elemento = self.aguardar_primeiro({
+                "sim": self._locator_texto(CONFIRMACAO_SIM.botao_texto, exato=True),
+                "item": self._locator_id(self.CHECKBOX_ITEM),
+            }, tempo_espera=self.TEMPO_CONFIRMACAO_SIM)
+        except TimeoutException:
+            logger.info(f"   {LogStyle.DEBUG} Nem 'SIM' nem o item em {self.TEMPO_CONFIRMACAO_SIM}s, seguindo...")
+            return False
+        if tela != "sim":
+            return False
+        logger.info(f"   {LogStyle.CLICK} Respondendo {LogStyle.elemento('SIM')}...")
+        elemento.click()
+        self._invalidar_snapshot()
+        registrar_interrupcao(CONFIRMACAO_SIM)
+        return True
+
     def marcar_item_para_devolucao(self):
         """Marca item para devolução. Checkbox está no início da tela."""
         logger.info(f"{LogStyle.ACAO} Marcando item para devolução...")
-        time.sleep(2)  # Aguarda tela carregar completamente
+        self.aguardar_tela_estavel(tempo_maximo=2)  # Aguarda tela carregar completamente
         self.clicar_por_id(self.CHECKBOX_ITEM)
 
     def clicar_devolver_itens(self):
@@ -85,39 +116,48 @@ class TrocaPage(BasePage):
 
     def confirmar_dialogos(self):
         """Confirma diálogos de atenção e confirmação."""
-        # Popup de atenção (opcional) - espera 5 segundos como no legado
-        self.clicar_se_existir(self.BTN_DIALOGO_OK, tempo_espera=5)
-        time.sleep(0.5)
-        # Popup de confirmação
-        self.clicar_por_id(self.BTN_DIALOGO_OK)
+        # Primeiro diálogo: aguarda aparecer (retorna assim que aparece)
+        self.clicar_por_id(self.BTN_DIALOGO_OK, confirmar=self.CONFIRMAR_SUMIU)
+        # Segundo diálogo disputado com a tela de sucesso, que tem o mesmo botão OK:
+        # "Sucesso!" tem prioridade no poll para o OK dela não ser clicado aqui
+        try:
+            tela, _ = self.aguardar_primeiro({
+                "sucesso": self._locator_texto(self.TXT_SUCESSO),
+                "dialogo": self._locator_id(self.BTN_DIALOGO_OK),
+            }, tempo_espera=self.TEMPO_SEGUNDO_DIALOGO)
+        except TimeoutException:
+            logger.info(f"   {LogStyle.DEBUG} Nem segundo dialogo nem {LogStyle.elemento(self.TXT_SUCESSO)} "
+                        f"em {self.TEMPO_SEGUNDO_DIALOGO}s, seguindo...")
+            return
+        if tela == "dialogo":
+            self.clicar_por_id(self.BTN_DIALOGO_OK)
 
     def adicionar_produto(self, codigo: str = "123"):
         """Adiciona produto pelo código."""
         logger.info(f"{LogStyle.ACAO} Adicionando produto: {LogStyle.valor(codigo)}")
-        self.clicar_por_id(self.BTN_ADICIONAR_PRODUTOS)
+        self.clicar_por_id(self.BTN_ADICIONAR_PRODUTOS, confirmar=self.EDT_BUSCA_PRODUTO)
         self.digitar_por_id(self.EDT_BUSCA_PRODUTO, codigo)
         self.clicar_por_id(self.IMG_PRODUTO)
 
     def clicar_avancar(self):
         """Clica no botão avançar."""
         logger.info(f"{LogStyle.ACAO} Clicando em {LogStyle.elemento('Avançar')}...")
+        self.aguardar_tela_estavel()
         elemento = self.encontrar_clicavel_por_id(self.BTN_PROXIMO)
-        time.sleep(1.5)
         elemento.click()
+        self._invalidar_snapshot()
 
     def selecionar_pagamento_bonus(self):
         """Seleciona pagamento via bônus da troca."""
         logger.info(f"{LogStyle.ACAO} Selecionando pagamento: {LogStyle.valor('BÔNUS')}")
-        time.sleep(3)
+        self.aguardar_tela_estavel(tempo_maximo=3)
         self.clicar_por_id(self.SWITCH_BONUS)
         self.clicar_por_id(self.BTN_AVANCAR)
 
     def tratar_popup_bonus(self):
-        """Trata popup de BÔNUS DISPONÍVEL se aparecer."""
-        if self.texto_exibido(self.TXT_BONUS_DISPONIVEL, tempo_espera=3):
-            logger.info(f"{LogStyle.ACAO} Popup {LogStyle.elemento('BÔNUS DISPONÍVEL')} detectado. Clicando em 'Mais tarde'...")
-            self.clicar_por_id(self.BTN_MAIS_TARDE)
-            time.sleep(1)
+        """Dispensa o popup de BÔNUS DISPONÍVEL se estiver na tela (sem esperar por ele)."""
+        if self.tratar_interrupcoes(BONUS):
+            logger.info(f"   {LogStyle.OK} Popup {LogStyle.elemento('BÔNUS DISPONÍVEL')} fechado")
 
     def finalizar_venda(self):
         """Finaliza a venda pós-troca."""
@@ -129,14 +169,15 @@ class TrocaPage(BasePage):
     def responder_impressao_nao(self):
         """Responde NÃO ao diálogo de impressão."""
         logger.info(f"{LogStyle.ACAO} Respondendo impressão: {LogStyle.valor('NÃO')}")
-        self.clicar_se_existir(self.BTN_IMPRIMIR_NAO, tempo_espera=20)
-        time.sleep(2)
+        # Terminal pode pular o diálogo: o botão de concluir também encerra o passo
+        self.passo_opcional(self.BTN_IMPRIMIR_NAO, self._locator_id(self.BTN_CONFIRMAR_VENDA), tempo_espera=20)
 
     def concluir_venda(self):
         """Clica em concluir venda após sucesso."""
         logger.info(f"{LogStyle.ACAO} Concluindo venda...")
         self.clicar_por_id(self.BTN_CONFIRMAR_VENDA)
 
+    @cronometrar_fluxo
     def executar_troca(self, data: str = None):
         """Executa fluxo de troca (cliente) até confirmação. Validação feita pelo teste."""
         logger.info(f"{LogStyle.secao('📋 FLUXO - Troca')}")
@@ -146,13 +187,14 @@ class TrocaPage(BasePage):
         self.clicar_consultar()
         self.selecionar_primeira_nota()
         # Confirma popup se aparecer
-        self.clicar_texto_se_existir("SIM", tempo_espera=3)
+        self.responder_confirmacao_sim()
         self.marcar_item_para_devolucao()
         self.clicar_devolver_itens()
         self.confirmar_dialogos()
 
         logger.info(f"{LogStyle.secao('📋 FLUXO - Troca executada ✅')}")
 
+    @cronometrar_fluxo
     def executar_troca_consumidor(self, data: str = None, codigo_produto: str = "123"):
         """Executa fluxo completo de troca para consumidor (com venda pós-troca)."""
         logger.info(f"{LogStyle.secao('📋 FLUXO - Troca consumidor')}")
@@ -163,7 +205,7 @@ class TrocaPage(BasePage):
         self.selecionar_primeira_nota()
 
         # Se aparecer popup de SIM, precisa selecionar cliente
-        if self.clicar_texto_se_existir("SIM", tempo_espera=3):
+        if self.responder_confirmacao_sim():
             self.selecionar_cliente(test_data.CUSTOMER_ID)
 
         self.marcar_item_para_devolucao()
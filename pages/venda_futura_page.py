@@ -1,9 +1,9 @@
 """
 Venda Futura Page - Page Object para tela de venda futura.
 """
-import time
 from appium.webdriver.common.appiumby import AppiumBy
-from pages.base_page import BasePage
+from pages.base_page import BasePage, cronometrar_fluxo
+from pages.interrupcoes import BONUS
 from config import logger, LogStyle, Cores
 
 
@@ -28,6 +28,7 @@ class VendaFuturaPage(BasePage):
     BTN_FINALIZAR = "btnFinalizar"
     BTN_CONFIRMAR_VENDA = "btn_confirmar_venda"
     BTN_IMPRIMIR_NAO = "android:id/button2"
+    TXT_VENDA_REALIZADA = "Venda realizada com sucesso!"
     BTN_MAIS_TARDE = "btn_mais_tarde"
 
     # --- Ações ---
@@ -78,7 +79,7 @@ class VendaFuturaPage(BasePage):
         """Adiciona produto com tamanho específico."""
         logger.info(f"-> Adicionando produto: {codigo}, tamanho: {tamanho}")
         self.rolar_ate_id(self.BTN_ADICIONAR_PRODUTOS)
-        self.clicar_por_id(self.BTN_ADICIONAR_PRODUTOS)
+        self.clicar_por_id(self.BTN_ADICIONAR_PRODUTOS, confirmar=self.EDT_BUSCA_PRODUTO)
         self.digitar_por_id(self.EDT_BUSCA_PRODUTO, codigo)
         self.clicar_por_id(self.IMG_PRODUTO)
         self.rolar_ate_texto(tamanho)
@@ -88,14 +89,15 @@ class VendaFuturaPage(BasePage):
         """Clica no botão avançar."""
         logger.info("-> Clicando em Avançar...")
         self.rolar_ate_id(self.BTN_PROXIMO)
+        self.aguardar_tela_estavel()
         elemento = self.encontrar_clicavel_por_id(self.BTN_PROXIMO)
-        time.sleep(1.5)
         elemento.click()
+        self._invalidar_snapshot()
 
     def selecionar_pagamento_avista(self):
         """Seleciona pagamento à vista (movimento e plano)."""
         logger.info("-> Selecionando pagamento à vista...")
-        time.sleep(3)
+        self.aguardar_tela_estavel(tempo_maximo=3)
 
         # Clica em pagamento personalizado
         self.rolar_ate_id(self.TXT_PAGAMENTO_TITULO)
@@ -107,9 +109,10 @@ class VendaFuturaPage(BasePage):
         )
         if len(elementos) > 0:
             elementos[0].click()
+            self._invalidar_snapshot()
             logger.info("   [OK] Movimento A VISTA selecionado")
 
-        time.sleep(1)
+        self.aguardar_tela_estavel(tempo_maximo=1)
 
         # Seleciona plano: A Vista (segundo elemento)
         elementos = self.driver.find_elements(
@@ -117,6 +120,7 @@ class VendaFuturaPage(BasePage):
         )
         if len(elementos) > 1:
             elementos[1].click()
+            self._invalidar_snapshot()
             logger.info("   [OK] Plano A Vista selecionado")
 
         # Avança
@@ -124,13 +128,9 @@ class VendaFuturaPage(BasePage):
         self.clicar_por_id(self.BTN_AVANCAR)
 
     def tratar_popup_bonus(self):
-        """Trata popup de bônus se aparecer."""
-        logger.info("-> Verificando popup de bônus...")
-        time.sleep(3)
-
-        if self.clicar_se_existir(self.BTN_MAIS_TARDE, tempo_espera=2):
+        """Dispensa o popup de bônus se estiver na tela quando ela estabilizar."""
+        if self.tratar_interrupcoes(BONUS, estavel=True):
             logger.info("   [OK] Popup de bônus fechado")
-            time.sleep(2)
         else:
             logger.info("   [INFO] Nenhum popup de bônus")
 
@@ -153,8 +153,8 @@ class VendaFuturaPage(BasePage):
     def responder_impressao(self, imprimir: bool = False):
         """Responde ao diálogo de impressão."""
         logger.info(f"-> Respondendo impressão: {'SIM' if imprimir else 'NÃO'}")
-        self.clicar_se_existir(self.BTN_IMPRIMIR_NAO, tempo_espera=20)
-        time.sleep(2)
+        # Terminal pode pular o diálogo: a tela de sucesso também encerra o passo
+        self.passo_opcional(self.BTN_IMPRIMIR_NAO, self._locator_texto(self.TXT_VENDA_REALIZADA), tempo_espera=20)
 
     def concluir_venda(self):
         """Clica em concluir venda após sucesso."""
@@ -162,6 +162,7 @@ class VendaFuturaPage(BasePage):
         self.rolar_ate_id(self.BTN_CONFIRMAR_VENDA)
         self.clicar_por_id(self.BTN_CONFIRMAR_VENDA)
 
+    @cronometrar_fluxo
     def executar_venda_futura(self, cpf: str = "1", codigo_produto: str = "123", tamanho: str = "36"):
         """Executa fluxo completo de venda futura com retirada em loja."""
         logger.info("--- [FLUXO] Iniciando venda futura (retirada loja) ---")
@@ -180,6 +181,7 @@ class VendaFuturaPage(BasePage):
 
         logger.info("--- [FLUXO] Venda futura (retirada loja) executada ---")
 
+    @cronometrar_fluxo
     def executar_venda_futura_domicilio(self, cpf: str = "1", codigo_produto: str = "123", tamanho: str = "36"):
         """Executa fluxo completo de venda futura com entrega em domicílio."""
         logger.info("--- [FLUXO] Iniciando venda futura (domicílio) ---")
@@ -200,7 +202,7 @@ class VendaFuturaPage(BasePage):
     # --- Validações ---
     def venda_sucesso_exibida(self, timeout: int = 10) -> bool:
         """Verifica se mensagem de sucesso apareceu."""
-        return self.texto_exibido("Venda realizada com sucesso!", timeout)
+        return self.texto_exibido(self.TXT_VENDA_REALIZADA, timeout)
 
     def validar_sucesso_e_concluir(self):
         """Valida sucesso e conclui venda."""
@@ -1,8 +1,9 @@
 """
 Venda Page - Page Object para tela de venda.
 """
-import time
-from pages.base_page import BasePage
+from selenium.common.exceptions import TimeoutException
+from pages.base_page import BasePage, cronometrar_fluxo
+from pages.interrupcoes import BONUS
 from config import logger, LogStyle, Cores
 
 
@@ -21,6 +22,7 @@ class VendaPage(BasePage):
     BTN_CONFIRMAR_VENDA = "btn_confirmar_venda"
     BTN_IMPRIMIR_SIM = "android:id/button1"
     BTN_IMPRIMIR_NAO = "android:id/button2"
+    TXT_VENDA_REALIZADA = "Venda realizada com sucesso!"
 
     # Busca cliente
     EDT_BUSCA_CLIENTE = "search_src_text"
@@ -38,35 +40,49 @@ class VendaPage(BasePage):
     def clicar_buscar_cliente(self):
         """Clica no botão buscar cliente."""
         logger.info(f"{LogStyle.ACAO} Clicando em {LogStyle.elemento('Buscar Cliente')}...")
-        time.sleep(1)
+
+        # Versão pelo flavor da sessão; se desconhecido, segue pela tela que aparecer primeiro
+        try:
+            tela = self.identificar_versao({
+                "device": self._locator_texto(self.TELA_SELECIONAR_CLIENTE),
+                "playstore": self._locator_id(self.BTN_BUSCAR_CLIENTE),
+            }, tempo_espera=15)
+        except TimeoutException:
+            tela = None
+            logger.info(f"   {LogStyle.DEBUG} Nem 'Selecionar Cliente' nem 'Buscar Cliente' visiveis")
 
         # Versão L400/Stone: Tela "Selecionar Cliente" com botão "Buscar Cliente" por texto
-        if self.texto_exibido(self.TELA_SELECIONAR_CLIENTE, tempo_espera=3):
-            logger.info(f"   {LogStyle.OK} Tela {LogStyle.elemento('Selecionar Cliente')} detectada")
-            if self.texto_exibido("Buscar Cliente", tempo_espera=2):
-                self.clicar_por_texto("Buscar Cliente")
-                logger.info(f"   {LogStyle.OK} Clicou em {LogStyle.elemento('Buscar Cliente')}")
-                return
+        if tela == "device" and self.texto_exibido("Buscar Cliente", tempo_espera=2):
+            self.clicar_por_texto("Buscar Cliente")
+            logger.info(f"   {LogStyle.OK} Clicou em {LogStyle.elemento('Buscar Cliente')}")
+            return
 
         # Versão Playstore: ID btn_select_customer
-        logger.info(f"   {LogStyle.INFO} Tentando versão Playstore (ID)...")
+        logger.info(f"   {LogStyle.INFO} Usando versão Playstore (ID)...")
         self.clicar_por_id(self.BTN_BUSCAR_CLIENTE)
 
     def iniciar_venda_sem_cliente(self):
         """Inicia venda sem selecionar cliente (consumidor)."""
         logger.info(f"{LogStyle.ACAO} Iniciando venda sem cliente...")
-        time.sleep(1)  # Aguarda tela estabilizar
+
+        # Versão pelo flavor da sessão; se desconhecido, segue pela tela que aparecer primeiro
+        try:
+            tela = self.identificar_versao({
+                "device": self._locator_texto(self.TELA_SELECIONAR_CLIENTE),
+                "playstore": self._locator_id(self.BTN_INICIAR_VENDA_SEM_CLIENTE),
+            }, tempo_espera=15)
+        except TimeoutException:
+            tela = None
+            logger.info(f"   {LogStyle.DEBUG} Nem 'Selecionar Cliente' nem 'button30' visiveis")
 
         # Versão L400/Stone: Tela "Selecionar Cliente" com botão "INICIAR VENDA"
-        if self.texto_exibido(self.TELA_SELECIONAR_CLIENTE, tempo_espera=3):
-            logger.info(f"   {LogStyle.OK} Tela {LogStyle.elemento('Selecionar Cliente')} detectada (versão L400/Stone)")
-            if self.texto_exibido(self.TXT_INICIAR_VENDA_BTN, tempo_espera=3):
-                self.clicar_por_texto(self.TXT_INICIAR_VENDA_BTN)
-                logger.info(f"   {LogStyle.OK} Clicou em {LogStyle.elemento('INICIAR VENDA')}")
-                return
+        if tela == "device" and self.texto_exibido(self.TXT_INICIAR_VENDA_BTN, tempo_espera=3):
+            self.clicar_por_texto(self.TXT_INICIAR_VENDA_BTN)
+            logger.info(f"   {LogStyle.OK} Clicou em {LogStyle.elemento('INICIAR VENDA')}")
+            return
 
         # Versão Playstore: botão button30
-        logger.info(f"   {LogStyle.INFO} Tentando versão Playstore (button30)...")
+        logger.info(f"   {LogStyle.INFO} Usando versão Playstore (button30)...")
         self.clicar_por_id(self.BTN_INICIAR_VENDA_SEM_CLIENTE)
 
     def selecionar_cliente(self, identificador: str):
@@ -79,31 +95,30 @@ class VendaPage(BasePage):
     def adicionar_produto(self, codigo: str = "123"):
         """Adiciona produto pelo código."""
         logger.info(f"{LogStyle.ACAO} Adicionando produto: {LogStyle.valor(codigo)}")
-        self.clicar_por_id(self.BTN_ADICIONAR_PRODUTOS)
+        self.clicar_por_id(self.BTN_ADICIONAR_PRODUTOS, confirmar=self.EDT_BUSCA_PRODUTO)
         self.digitar_por_id(self.EDT_BUSCA_PRODUTO, codigo)
         self.clicar_por_id(self.IMG_PRODUTO)
 
     def clicar_avancar(self):
         """Clica no botão avançar."""
         logger.info(f"{LogStyle.ACAO} Clicando em {LogStyle.elemento('Avançar')}...")
-        # Espera extra para estabilizar transição
+        # Aguarda transição terminar antes de localizar o botão
+        self.aguardar_tela_estavel()
         elemento = self.encontrar_clicavel_por_id(self.BTN_PROXIMO)
-        time.sleep(1.5)
         elemento.click()
+        self._invalidar_snapshot()
 
     def selecionar_pagamento_dinheiro(self):
         """Seleciona forma de pagamento dinheiro."""
         logger.info(f"{LogStyle.ACAO} Selecionando pagamento: {LogStyle.valor('DINHEIRO')}")
-        time.sleep(3)  # Pausa para estabilizar tela de pagamento
+        self.aguardar_tela_estavel(tempo_maximo=3)
         self.clicar_por_texto("DINHEIRO")
         self.clicar_por_id(self.BTN_AVANCAR)
 
     def tratar_popup_bonus(self):
-        """Trata popup de BÔNUS DISPONÍVEL se aparecer."""
-        if self.texto_exibido(self.TXT_BONUS_DISPONIVEL, tempo_espera=3):
-            logger.info(f"{LogStyle.ACAO} Popup {LogStyle.elemento('BÔNUS DISPONÍVEL')} detectado. Clicando em 'Mais tarde'...")
-            self.clicar_por_id(self.BTN_MAIS_TARDE)
-            time.sleep(1)
+        """Dispensa o popup de BÔNUS DISPONÍVEL se estiver na tela (sem esperar por ele)."""
+        if self.tratar_interrupcoes(BONUS):
+            logger.info(f"   {LogStyle.OK} Popup {LogStyle.elemento('BÔNUS DISPONÍVEL')} fechado")
 
     def finalizar_venda(self):
         """Finaliza a venda."""
@@ -116,14 +131,15 @@ class VendaPage(BasePage):
         """Responde ao diálogo de impressão."""
         logger.info(f"{LogStyle.ACAO} Respondendo impressão: {LogStyle.valor('SIM' if imprimir else 'NÃO')}")
         btn = self.BTN_IMPRIMIR_SIM if imprimir else self.BTN_IMPRIMIR_NAO
-        self.clicar_se_existir(btn, tempo_espera=20)
-        time.sleep(2)  # Aguarda fechamento do diálogo
+        # Terminal pode pular o diálogo: a tela de sucesso também encerra o passo
+        self.passo_opcional(btn, self._locator_texto(self.TXT_VENDA_REALIZADA), tempo_espera=20)
 
     def concluir_venda(self):
         """Clica em concluir venda após sucesso."""
         logger.info(f"{LogStyle.ACAO} Concluindo venda...")
         self.clicar_por_id(self.BTN_CONFIRMAR_VENDA)
 
+    @cronometrar_fluxo
     def executar_venda_cliente(self, id_cliente: str = "1", codigo_produto: str = "123"):
         """Executa fluxo completo de venda para cliente."""
         logger.info(f"{LogStyle.secao('📋 FLUXO - Venda para cliente')}")
@@ -138,6 +154,7 @@ class VendaPage(BasePage):
 
         logger.info(f"{LogStyle.secao('📋 FLUXO - Venda cliente concluída ✅')}")
 
+    @cronometrar_fluxo
     def executar_venda_consumidor(self, codigo_produto: str = "123"):
         """Executa fluxo completo de venda para consumidor (sem cliente)."""
         logger.info(f"{LogStyle.secao('📋 FLUXO - Venda consumidor')}")
@@ -154,7 +171,7 @@ class VendaPage(BasePage):
     # --- Validações ---
     def venda_sucesso_exibida(self, timeout: int = 10) -> bool:
         """Verifica se mensagem de sucesso apareceu."""
-        return self.texto_exibido("Venda realizada com sucesso!", timeout)
+        return self.texto_exibido(self.TXT_VENDA_REALIZADA, timeout)
 
     def validar_sucesso_e_concluir(self):
         """Valida sucesso e conclui venda."""
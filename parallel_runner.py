@@ -5,16 +5,25 @@ Detecta dispositivos conectados, inicia Appium e roda testes em paralelo.
 import subprocess
 import sys
 import time
+import json
 import argparse
 import socket
 import shutil
+import urllib.request
 from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+import adb_client
+import port_leases
+
 
 # Lista para guardar processos Appium iniciados
 processos_appium = []
 
+# Prontidao do Appium: GET /status a cada INTERVALO_STATUS, ate TIMEOUT_APPIUM segundos
+INTERVALO_STATUS = 0.2
+TIMEOUT_APPIUM = 30
+
 # Diretório de resultados Allure
 ALLURE_RESULTS_DIR = Path(__file__).parent / "allure-results"
 
@@ -39,13 +48,53 @@ def porta_em_uso(porta: int) -> bool:
         return False
 
 
-def iniciar_servidor_appium(porta: int) -> subprocess.Popen:
-    """Inicia servidor Appium em uma porta especifica."""
+def servidor_appium_pronto(porta: int, timeout: float = 1.0) -> bool:
+    """True se o Appium da porta responde ao GET /status pronto para novas sessoes."""
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{porta}/status", timeout=timeout) as resposta:
+            if resposta.status != 200:
+                return False
+            corpo = json.loads(resposta.read().decode('utf-8') or '{}')
+    except (OSError, ValueError):
+        return False
+    # Appium 2 informa value.ready; o Appium 1 so responde 200 quando esta no ar
+    valor = corpo.get('value') if isinstance(corpo, dict) else None
+    return not isinstance(valor, dict) or valor.get('ready', True) is not False
+
+
+def aguardar_servidor_appium(porta: int, timeout: float = TIMEOUT_APPIUM,
+                             processo: subprocess.Popen = None) -> bool:
+    """Consulta o /status a cada INTERVALO_STATUS ate o servidor ficar pronto (ou o processo morrer)."""
+    limite = time.monotonic() + timeout
+    while True:
+        if servidor_appium_pronto(porta):
+            return True
+        if processo is not None and processo.poll() is not None:
+            print(f"[ERRO] Appium na porta {porta} encerrou ao iniciar (codigo {processo.returncode})")
+            return False
+        if time.monotonic() >= limite:
+            return False
+        time.sleep(INTERVALO_STATUS)
+
+
+def iniciar_servidor_appium(porta: int, timeout: float = TIMEOUT_APPIUM) -> bool:
+    """
+    Garante um servidor Appium pronto na porta.
+    Servidor que ja responde ao /status (de uma execucao anterior) e reaproveitado.
+    """
+    if servidor_appium_pronto(porta):
+        print(f"[APPIUM] Servidor na porta {porta} ja esta pronto (reaproveitado)")
+        return True
     if porta_em_uso(porta):
-        print(f"[APPIUM] Porta {porta} ja esta em uso (Appium rodando)")
-        return None
+        # Algo escuta na porta mas nao responde como Appium: espera um pouco (pode estar subindo)
+        if aguardar_servidor_appium(porta, timeout):
+            print(f"[APPIUM] Servidor na porta {porta} pronto (reaproveitado)")
+            return True
+        print(f"[ERRO] Porta {porta} em uso, mas o /status do Appium nao respondeu")
+        return False
 
     print(f"[APPIUM] Iniciando servidor na porta {porta}...")
+    inicio = time.monotonic()
 
     # Windows: cria nova janela de console
     if sys.platform == 'win32':
@@ -60,21 +109,39 @@ def iniciar_servidor_appium(porta: int) -> subprocess.Popen:
             stdout=subprocess.DEVNULL,
             stderr=subprocess.DEVNULL
         )
+    processos_appium.append(processo)
 
-    # Aguarda servidor iniciar (max 30 segundos)
-    for i in range(30):
-        time.sleep(1)
-        if porta_em_uso(porta):
-            print(f"[APPIUM] Servidor na porta {porta} pronto!")
-            processos_appium.append(processo)
-            return processo
+    if aguardar_servidor_appium(porta, timeout, processo):
+        print(f"[APPIUM] Servidor na porta {porta} pronto em {time.monotonic() - inicio:.1f}s")
+        return True
 
     print(f"[ERRO] Timeout ao iniciar Appium na porta {porta}")
-    return None
+    processos_appium.remove(processo)
+    processo.kill()
+    return False
 
 
-def parar_servidores_appium():
-    """Para todos os servidores Appium iniciados."""
+def iniciar_servidores_appium(portas: list, timeout: float = TIMEOUT_APPIUM) -> dict:
+    """Inicia (ou reaproveita) os servidores de todas as portas ao mesmo tempo. Retorna {porta: pronto}."""
+    if not portas:
+        return {}
+    inicio = time.monotonic()
+    with ThreadPoolExecutor(max_workers=len(portas)) as executor:
+        prontos = dict(zip(portas, executor.map(lambda porta: iniciar_servidor_appium(porta, timeout), portas)))
+    print(f"[APPIUM] {sum(prontos.values())}/{len(portas)} servidor(es) pronto(s) em {time.monotonic() - inicio:.1f}s")
+    return prontos
+
+
+def parar_servidores_appium(manter: bool = False):
+    """
+    Para todos os servidores Appium iniciados.
+    Com manter=True eles continuam rodando e a proxima execucao os reaproveita.
+    """
+    if manter:
+        if processos_appium:
+            print(f"[APPIUM] Mantendo {len(processos_appium)} servidor(es) no ar para a proxima execucao")
+        processos_appium.clear()
+        return
     for processo in processos_appium:
         try:
             processo.terminate()
@@ -87,22 +154,7 @@ def parar_servidores_appium():
 def obter_dispositivos_conectados():
     """Retorna lista de dispositivos conectados via ADB."""
     try:
-        resultado = subprocess.run(
-            ['adb', 'devices'],
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
-
-        dispositivos = []
-        linhas = resultado.stdout.strip().split('\n')[1:]
-
-        for linha in linhas:
-            if '\tdevice' in linha:
-                device_id = linha.split('\t')[0]
-                dispositivos.append(device_id)
-
-        return dispositivos
+        return adb_client.cliente().dispositivos()
     except Exception as e:
         print(f"[ERRO] Falha ao detectar dispositivos: {e}")
         return []
@@ -111,15 +163,10 @@ def obter_dispositivos_conectados():
 def obter_info_dispositivo(device_id: str) -> dict:
     """Retorna informacoes do dispositivo."""
     try:
-        modelo = subprocess.run(
-            ['adb', '-s', device_id, 'shell', 'getprop', 'ro.product.model'],
-            capture_output=True, text=True, timeout=5
-        ).stdout.strip()
-
-        versao = subprocess.run(
-            ['adb', '-s', device_id, 'shell', 'getprop', 'ro.build.version.release'],
-            capture_output=True, text=True, timeout=5
-        ).stdout.strip()
+        # Mesmo shell persistente do device para as duas consultas
+        adb = adb_client.cliente()
+        modelo = adb.getprop(device_id, 'ro.product.model')
+        versao = adb.getprop(device_id, 'ro.build.version.release')
 
         return {
             'id': device_id,
@@ -195,7 +242,7 @@ def listar_dispositivos():
         print()
 
 
-def rodar_paralelo(testes: str = None, max_workers: int = None):
+def rodar_paralelo(testes: str = None, max_workers: int = None, manter_appium: bool = False):
     """Roda testes em todos os dispositivos em paralelo."""
     dispositivos = obter_dispositivos_conectados()
 
@@ -210,27 +257,32 @@ def rodar_paralelo(testes: str = None, max_workers: int = None):
     print(f" EXECUCAO PARALELA - {len(dispositivos)} DISPOSITIVOS")
     print(f"{'='*60}\n")
 
-    porta_base = 4723
-
     # Prepara configuracao e inicia Appium para cada dispositivo
     configs = []
     print("[INFO] Preparando servidores Appium...\n")
 
     for i, device_id in enumerate(dispositivos):
-        porta = porta_base + (i * 2)  # 4723, 4725, 4727...
+        porta = port_leases.alugar(device_id)["appium"]  # Mesma porta para o device entre execucoes
         info = obter_info_dispositivo(device_id)
         print(f"  [{i+1}] {info['modelo']} -> Porta {porta}")
-
-        # Inicia Appium se necessario
-        iniciar_servidor_appium(porta)
         configs.append((device_id, porta))
 
-    print(f"\n[INFO] Iniciando testes em paralelo...\n")
-    time.sleep(2)  # Pequena pausa para estabilizar
+    # Inicia os Appium necessarios ao mesmo tempo (prontos = /status respondendo)
+    prontos = iniciar_servidores_appium([porta for _, porta in configs])
 
     # Executa em paralelo
     workers = max_workers or len(dispositivos)
     resultados = []
+    for device_id, porta in configs:
+        if not prontos.get(porta):
+            resultados.append({
+                'device_id': device_id,
+                'sucesso': False,
+                'erro': f"Servidor Appium da porta {porta} nao ficou pronto"
+            })
+    configs = [(device_id, porta) for device_id, porta in configs if prontos.get(porta)]
+
+    print(f"\n[INFO] Iniciando testes em paralelo...\n")
 
     try:
         with ThreadPoolExecutor(max_workers=workers) as executor:
@@ -256,7 +308,7 @@ def rodar_paralelo(testes: str = None, max_workers: int = None):
     finally:
         # Para servidores Appium ao finalizar
         print("\n[INFO] Finalizando servidores Appium...")
-        parar_servidores_appium()
+        parar_servidores_appium(manter_appium)
 
     # Resumo
     print(f"\n{'='*60}")
@@ -290,7 +342,7 @@ def rodar_paralelo(testes: str = None, max_workers: int = None):
     return all(r.get('sucesso') for r in resultados)
 
 
-def rodar_sequencial(dispositivo_index: int = None, testes: str = None):
+def rodar_sequencial(dispositivo_index: int = None, testes: str = None, manter_appium: bool = False):
     """Roda testes em um dispositivo especifico."""
     dispositivos = obter_dispositivos_conectados()
 
@@ -307,12 +359,12 @@ def rodar_sequencial(dispositivo_index: int = None, testes: str = None):
     else:
         device_id = dispositivos[0]
 
-    porta = 4723
+    porta = port_leases.alugar(device_id)["appium"]
 
     # Inicia Appium se necessario
     print(f"\n[INFO] Verificando Appium na porta {porta}...")
-    iniciar_servidor_appium(porta)
-    time.sleep(2)
+    if not iniciar_servidor_appium(porta):
+        return
 
     try:
         resultado = rodar_testes_dispositivo(device_id, porta, testes)
@@ -324,10 +376,10 @@ def rodar_sequencial(dispositivo_index: int = None, testes: str = None):
             if resultado.get('output'):
                 print(resultado['output'][-2000:])  # Ultimos 2000 chars
     finally:
-        parar_servidores_appium()
+        parar_servidores_appium(manter_appium)
 
 
-def rodar_sequencial_todos(testes: str = None):
+def rodar_sequencial_todos(testes: str = None, manter_appium: bool = False):
     """
     Roda testes em TODOS os dispositivos, um por vez (sequencial).
     Mostra logs em tempo real. Ideal para evitar conflitos no servidor.
@@ -351,8 +403,8 @@ def rodar_sequencial_todos(testes: str = None):
 
     # Inicia Appium uma vez
     print(f"[INFO] Verificando Appium na porta {porta}...")
-    iniciar_servidor_appium(porta)
-    time.sleep(2)
+    if not iniciar_servidor_appium(porta):
+        return False
 
     try:
         for i, device_id in enumerate(dispositivos, 1):
@@ -397,7 +449,7 @@ def rodar_sequencial_todos(testes: str = None):
                 time.sleep(8)
 
     finally:
-        parar_servidores_appium()
+        parar_servidores_appium(manter_appium)
 
     # Resumo final
     print(f"\n{'='*60}")
@@ -429,6 +481,7 @@ Exemplos:
   python parallel_runner.py --all                     # Roda em todos (paralelo, pode conflitar)
   python parallel_runner.py --device 1                # Roda no dispositivo 1
   python parallel_runner.py --device 2 --test tests/test_venda_cliente.py
+  python parallel_runner.py --seq --manter-appium     # Deixa o Appium no ar para a proxima execucao
 
 RECOMENDADO: Use --seq para rodar em todos os devices um por vez.
 Isso evita conflitos no servidor e mostra logs em tempo real.
@@ -447,19 +500,21 @@ Isso evita conflitos no servidor e mostra logs em tempo real.
                         help='Testes especificos (ex: tests/test_venda.py)')
     parser.add_argument('--workers', '-w', type=int,
                         help='Numero maximo de workers paralelos')
+    parser.add_argument('--manter-appium', action='store_true',
+                        help='Nao encerra os servidores Appium no final (a proxima execucao os reaproveita)')
 
     args = parser.parse_args()
 
     if args.list:
         listar_dispositivos()
     elif args.seq:
-        sucesso = rodar_sequencial_todos(args.test)
+        sucesso = rodar_sequencial_todos(args.test, args.manter_appium)
         sys.exit(0 if sucesso else 1)
     elif args.all:
-        sucesso = rodar_paralelo(args.test, args.workers)
+        sucesso = rodar_paralelo(args.test, args.workers, args.manter_appium)
         sys.exit(0 if sucesso else 1)
     elif args.device:
-        rodar_sequencial(args.device, args.test)
+        rodar_sequencial(args.device, args.test, args.manter_appium)
     else:
         parser.print_help()
 
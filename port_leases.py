@@ -0,0 +1,181 @@
+"""
+Portas por device - Appium, systemPort, mjpeg e chromedriver alugadas por UDID.
+
+O systemPort era hash(device_id) % 100: o hash de string muda a cada processo
+(PYTHONHASHSEED), então dois pytest em paralelo podiam escolher a mesma porta e
+a sessão UiAutomator2 do segundo falhava. As portas do Appium eram 4723 + 2*i,
+pela ordem dos devices.
+
+Aqui as portas ficam num arquivo compartilhado entre os processos, alterado só
+com a trava de arquivo:
+  - cada UDID recebe portas próprias na primeira vez e as mantém nas próximas
+    execuções (o Appium mantido no ar é reaproveitado na mesma porta);
+  - porta nova só é entregue depois de um bind de teste, e nunca uma porta de
+    outro device;
+  - o processo que aluga fica registrado na entrada e sai dela ao terminar
+    (atexit); processos que morreram sem liberar são limpos no próximo aluguel.
+Se a faixa de um tipo acabar, portas de devices sem processo ativo são reaproveitadas.
+"""
+import os
+import sys
+import json
+import time
+import atexit
+import socket
+import logging
+from pathlib import Path
+from contextlib import contextmanager
+
+
+logger = logging.getLogger("appium_test")
+
+ARQUIVO_LEASES = Path("logs") / "cache" / "portas_por_device.json"
+ARQUIVO_TRAVA = Path("logs") / "cache" / "portas_por_device.lock"
+
+# Faixa de cada tipo de porta: (início, fim exclusivo, passo)
+FAIXAS = {
+    "appium": (4723, 4923, 2),
+    "systemPort": (8200, 8300, 1),
+    "mjpegServerPort": (9200, 9300, 1),
+    "chromedriverPort": (9515, 9615, 1),
+}
+
+# UDIDs alugados por este processo (liberados no atexit)
+_ALUGADOS = set()
+
+
+@contextmanager
+def _travado():
+    """Trava exclusiva entre processos sobre ARQUIVO_TRAVA."""
+    ARQUIVO_TRAVA.parent.mkdir(parents=True, exist_ok=True)
+    with open(ARQUIVO_TRAVA, "a+b") as trava:
+        if sys.platform == "win32":
+            import msvcrt
+
+            trava.seek(0)
+            while True:
+                try:
+                    # LK_LOCK tenta por ~10s e então falha: continua tentando
+                    msvcrt.locking(trava.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    time.sleep(0.05)
+            try:
+                yield
+            finally:
+                trava.seek(0)
+                msvcrt.locking(trava.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(trava.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(trava.fileno(), fcntl.LOCK_UN)
+
+
+def _ler() -> dict:
+    try:
+        return json.loads(ARQUIVO_LEASES.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _gravar(leases: dict):
+    temporario = ARQUIVO_LEASES.with_suffix(".tmp")
+    temporario.write_text(json.dumps(leases, indent=2), encoding="utf-8")
+    os.replace(temporario, ARQUIVO_LEASES)
+
+
+def processo_vivo(pid: int) -> bool:
+    """True se o processo ainda existe."""
+    if sys.platform == "win32":
+        # os.kill no Windows encerra o processo: consulta pela API
+        import ctypes
+
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return False
+        try:
+            codigo = ctypes.c_ulong()
+            return bool(kernel32.GetExitCodeProcess(handle, ctypes.byref(codigo))) and codigo.value == 259
+        finally:
+            kernel32.CloseHandle(handle)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def porta_livre(porta: int) -> bool:
+    """Bind de teste em 127.0.0.1: True se ninguém está usando a porta."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        try:
+            sock.bind(("127.0.0.1", porta))
+        except OSError:
+            return False
+    return True
+
+
+def _nova_porta(tipo: str, udid: str, leases: dict) -> int:
+    outras = {u: e for u, e in leases.items() if u != udid}
+    ocupadas = {e["portas"][tipo] for e in outras.values() if tipo in e.get("portas", {})}
+    for porta in range(*FAIXAS[tipo]):
+        if porta not in ocupadas and porta_livre(porta):
+            return porta
+    # Faixa cheia: reaproveita a porta de um device sem processo ativo
+    for outro, entrada in outras.items():
+        porta = entrada.get("portas", {}).get(tipo)
+        if porta is not None and not entrada.get("pids") and porta_livre(porta):
+            logger.info(f"[PORTAS] {tipo} {porta} retomada de {outro} (sem processo ativo)")
+            del entrada["portas"][tipo]
+            return porta
+    inicio, fim, _ = FAIXAS[tipo]
+    raise RuntimeError(f"Nenhuma porta livre para {tipo} na faixa {inicio}-{fim - 1}")
+
+
+def alugar(udid: str) -> dict:
+    """
+    Portas do device para este processo: {'appium', 'systemPort', 'mjpegServerPort', 'chromedriverPort'}.
+    O mesmo UDID recebe as mesmas portas entre execuções.
+    """
+    with _travado():
+        leases = _ler()
+        for entrada in leases.values():
+            entrada["pids"] = [pid for pid in entrada.get("pids", []) if processo_vivo(pid)]
+
+        entrada = leases.setdefault(udid, {"portas": {}, "pids": []})
+        for tipo in FAIXAS:
+            if tipo not in entrada["portas"]:
+                entrada["portas"][tipo] = _nova_porta(tipo, udid, leases)
+                logger.info(f"[PORTAS] {udid}: {tipo} {entrada['portas'][tipo]}")
+        if os.getpid() not in entrada["pids"]:
+            entrada["pids"].append(os.getpid())
+        entrada["atualizado_em"] = time.time()
+        _gravar(leases)
+        portas = dict(entrada["portas"])
+
+    if udid not in _ALUGADOS:
+        _ALUGADOS.add(udid)
+        atexit.register(liberar, udid)
+    return portas
+
+
+def liberar(udid: str):
+    """Tira este processo da entrada do device. As portas continuam reservadas para o UDID."""
+    _ALUGADOS.discard(udid)
+    try:
+        with _travado():
+            leases = _ler()
+            entrada = leases.get(udid)
+            if entrada is None or os.getpid() not in entrada.get("pids", []):
+                return
+            entrada["pids"].remove(os.getpid())
+            _gravar(leases)
+    except OSError as e:
+        logger.warning(f"[PORTAS] Falha ao liberar portas de {udid}: {e}")
@@ -18,6 +18,8 @@ import socket
 from pathlib import Path
 from datetime import datetime
 
+import adb_client
+
 # Fix encoding para Windows
 if sys.platform == 'win32':
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -106,21 +108,14 @@ def start_appium_server() -> subprocess.Popen:
 def check_device() -> bool:
     """Verifica se há dispositivo Android conectado."""
     try:
-        result = subprocess.run(
-            ['adb', 'devices'],
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
-        lines = result.stdout.strip().split('\n')[1:]
-        devices = [l for l in lines if l.strip() and 'device' in l]
+        devices = adb_client.cliente().dispositivos()
 
         if not devices:
             print(f"{Colors.RED}✗ Nenhum dispositivo Android conectado{Colors.RESET}")
             print(f"  Conecte um dispositivo ou inicie um emulador")
             return False
 
-        print(f"{Colors.GREEN}✓ Dispositivo encontrado: {devices[0].split()[0]}{Colors.RESET}")
+        print(f"{Colors.GREEN}✓ Dispositivo encontrado: {devices[0]}{Colors.RESET}")
         return True
 
     except Exception as e:
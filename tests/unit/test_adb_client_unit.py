@@ -0,0 +1,210 @@
+"""
+Testes unitários para o cliente adb (adb_client.py).
+Usa um servidor adb local de mentira (mesmo protocolo do socket 5037), com o
+shell do "device" rodando no /bin/sh da máquina - não precisa de device nem de adb.
+"""
+import shutil
+import threading
+import subprocess
+import socketserver
+
+import pytest
+
+
+pytestmark = pytest.mark.skipif(shutil.which("sh") is None, reason="precisa de /bin/sh")
+
+
+class _ServidorAdbLocal(socketserver.ThreadingTCPServer):
+    """Servidor adb de mentira: host:devices, host:transport, shell,raw: e shell:<comando>."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, devices: dict):
+        # devices: {serial: suporta shell,raw?}
+        super().__init__(("127.0.0.1", 0), _AtendimentoAdb)
+        self.devices = devices
+        self.shells_abertos = 0
+
+
+class _AtendimentoAdb(socketserver.BaseRequestHandler):
+
+    def _ler_pedido(self) -> str:
+        tamanho = int(self._ler(4), 16)
+        return self._ler(tamanho).decode('utf-8')
+
+    def _ler(self, tamanho: int) -> bytes:
+        dados = b""
+        while len(dados) < tamanho:
+            parte = self.request.recv(tamanho - len(dados))
+            if not parte:
+                raise ConnectionError
+            dados += parte
+        return dados
+
+    def _falhar(self, mensagem: str):
+        dados = mensagem.encode('utf-8')
+        self.request.sendall(b"FAIL" + f"{len(dados):04x}".encode('ascii') + dados)
+
+    def handle(self):
+        servidor = self.server
+        try:
+            pedido = self._ler_pedido()
+            if pedido == "host:devices":
+                lista = "".join(f"{serial}\tdevice\n" for serial in servidor.devices).encode('utf-8')
+                self.request.sendall(b"OKAY" + f"{len(lista):04x}".encode('ascii') + lista)
+                return
+
+            serial = pedido.split(":", 2)[2] if pedido.startswith("host:transport:") else next(iter(servidor.devices))
+            if serial not in servidor.devices:
+                self._falhar(f"device '{serial}' not found")
+                return
+            self.request.sendall(b"OKAY")
+
+            servico = self._ler_pedido()
+            if servico == "shell,raw:":
+                if not servidor.devices[serial]:
+                    self._falhar("closed")
+                    return
+                self.request.sendall(b"OKAY")
+                servidor.shells_abertos += 1
+                self._shell_interativo()
+            elif servico.startswith("shell:"):
+                self.request.sendall(b"OKAY")
+                saida = subprocess.run(["sh", "-c", servico[len("shell:"):]], capture_output=True)
+                self.request.sendall(saida.stdout)
+        except ConnectionError:
+            pass
+
+    def _shell_interativo(self):
+        processo = subprocess.Popen(["sh"], stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+
+        def _repassar_saida():
+            for bloco in iter(lambda: processo.stdout.read1(65536), b""):
+                self.request.sendall(bloco)
+
+        threading.Thread(target=_repassar_saida, daemon=True).start()
+        while True:
+            dados = self.request.recv(65536)
+            if not dados:
+                break
+            processo.stdin.write(dados)
+            processo.stdin.flush()
+        processo.kill()
+
+
+@pytest.fixture
+def servidor_adb():
+    servidor = _ServidorAdbLocal({"L400-01": True, "N960-ANTIGO": False})
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    yield servidor
+    servidor.shutdown()
+    servidor.server_close()
+
+
+@pytest.fixture
+def cliente(servidor_adb):
+    from adb_client import ClienteAdb
+
+    cliente = ClienteAdb(porta=servidor_adb.server_address[1], timeout=5)
+    yield cliente
+    cliente.fechar()
+
+
+class TestClienteAdbDispositivos:
+    """Testes para a lista de devices via host:devices."""
+
+    def test_lista_devices_prontos(self, cliente):
+        """
+        Deve devolver os seriais no estado 'device', como 'adb devices'.
+        """
+        # Act
+        dispositivos = cliente.dispositivos()
+
+        # Assert
+        assert dispositivos == ["L400-01", "N960-ANTIGO"]
+
+
+class TestClienteAdbShell:
+    """Testes para o shell persistente por device."""
+
+    def test_comandos_reaproveitam_o_mesmo_shell(self, cliente, servidor_adb):
+        """
+        Vários comandos no mesmo device usam um único shell aberto.
+        """
+        # Act
+        primeira = cliente.shell("L400-01", "echo modelo")
+        segunda = cliente.shell("L400-01", "echo 10").strip()
+
+        # Assert
+        assert primeira == "modelo\n"
+        assert segunda == "10"
+        assert servidor_adb.shells_abertos == 1
+
+    def test_saida_sem_quebra_de_linha_e_codigo_de_saida(self, cliente):
+        """
+        Saída sem '\\n' final é preservada; código de saída != 0 vira ErroAdb.
+        """
+        from adb_client import ErroAdb
+
+        # Act
+        saida = cliente.shell("L400-01", "printf abc")
+
+        # Assert
+        assert saida == "abc"
+        with pytest.raises(ErroAdb, match="codigo 3"):
+            cliente.shell("L400-01", "exit_com() { return 3; }; exit_com")
+
+    def test_adbd_sem_shell_raw_usa_shell_por_comando(self, cliente, servidor_adb):
+        """
+        Device que recusa shell,raw: continua funcionando com shell:<comando>.
+        """
+        # Act
+        saida = cliente.shell("N960-ANTIGO", "echo ok")
+
+        # Assert
+        assert saida == "ok\n"
+        assert servidor_adb.shells_abertos == 0
+
+    def test_device_inexistente_lanca_erro(self, cliente):
+        """
+        Serial desconhecido pelo servidor: ErroAdb com a mensagem do servidor.
+        """
+        from adb_client import ErroAdb
+
+        # Act & Assert
+        with pytest.raises(ErroAdb, match="not found"):
+            cliente.shell("NAO-EXISTE", "echo x")
+
+    def test_shell_abrindo_em_um_device_nao_trava_os_outros(self, cliente):
+        """
+        Enquanto o shell de um device conecta, comandos em outro device seguem.
+        """
+        from unittest.mock import patch
+        import adb_client
+
+        # Arrange
+        liberar = threading.Event()
+        original = adb_client.ShellPersistente
+
+        def _abrir_shell(serial, *args):
+            if serial == "L400-01":
+                liberar.wait(5)  # Conexão lenta
+            return original(serial, *args)
+
+        with patch('adb_client.ShellPersistente', side_effect=_abrir_shell):
+            lento = threading.Thread(target=cliente.shell, args=("L400-01", "echo lento"))
+            lento.start()
+
+            # Act
+            saida = {}
+            outro = threading.Thread(target=lambda: saida.update(ok=cliente.shell("N960-ANTIGO", "echo ok")))
+            outro.start()
+            outro.join(timeout=3)
+            terminou_antes = not outro.is_alive()
+            liberar.set()
+            lento.join(timeout=5)
+
+        # Assert
+        assert terminou_antes is True
+        assert saida["ok"] == "ok\n"
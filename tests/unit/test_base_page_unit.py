@@ -0,0 +1,1053 @@
+"""
+Testes unitários para BasePage.
+Utiliza mocks para evitar interação real com Appium/emulador.
+"""
+import itertools
+import pytest
+from unittest.mock import MagicMock, PropertyMock, patch
+from selenium.common.exceptions import WebDriverException
+
+
+HIERARQUIA_HOME = """<?xml version='1.0' encoding='UTF-8' standalone='yes' ?>
+<hierarchy index="0" class="hierarchy" rotation="0" width="720" height="1280">
+  <android.widget.FrameLayout index="0" text="" resource-id="" displayed="true" enabled="true" bounds="[0,0][720,1280]">
+    <android.widget.TextView index="0" text="Iniciar Venda" resource-id="com.test.app:id/txt_menu" displayed="true" enabled="true" bounds="[40,200][680,280]" />
+    <android.widget.Button index="1" text="OK" resource-id="com.test.app:id/btn_ok" displayed="true" enabled="true" bounds="[40,300][680,380]" />
+    <android.widget.Button index="2" text="Oculto" resource-id="com.test.app:id/btn_oculto" displayed="false" enabled="true" bounds="[40,400][680,480]" />
+    <android.widget.Button index="3" text="Fora da tela" resource-id="com.test.app:id/btn_fora" displayed="true" enabled="true" bounds="[40,1500][680,1580]" />
+    <android.widget.EditText index="4" text="" resource-id="com.test.app:id/edt_vazio" displayed="true" enabled="true" bounds="[40,500][680,580]" />
+    <android.widget.EditText index="5" text="ANTIGO" resource-id="com.test.app:id/edt_preenchido" displayed="true" enabled="true" bounds="[40,600][680,680]" />
+  </android.widget.FrameLayout>
+</hierarchy>"""
+
+HIERARQUIA_POPUP_BONUS = """<?xml version='1.0' encoding='UTF-8' standalone='yes' ?>
+<hierarchy index="0" class="hierarchy" rotation="0" width="720" height="1280">
+  <android.widget.FrameLayout index="0" text="" resource-id="" displayed="true" enabled="true" bounds="[0,0][720,1280]">
+    <android.widget.TextView index="0" text="BÔNUS DISPONÍVEL" resource-id="com.test.app:id/txt_titulo" displayed="true" enabled="true" bounds="[40,400][680,480]" />
+    <android.widget.Button index="1" text="Mais tarde" resource-id="com.test.app:id/btn_mais_tarde" displayed="true" enabled="true" bounds="[100,800][300,900]" />
+  </android.widget.FrameLayout>
+</hierarchy>"""
+
+HIERARQUIA_CONFIRMACAO_SIM = """<?xml version='1.0' encoding='UTF-8' standalone='yes' ?>
+<hierarchy index="0" class="hierarchy" rotation="0" width="720" height="1280">
+  <android.widget.FrameLayout index="0" text="" resource-id="" displayed="true" enabled="true" bounds="[0,0][720,1280]">
+    <android.widget.Button index="0" text="SIM" resource-id="android:id/button1" displayed="true" enabled="true" bounds="[400,700][600,780]" />
+  </android.widget.FrameLayout>
+</hierarchy>"""
+
+
+def _criar_pagina(page_source: str = HIERARQUIA_HOME):
+    """Cria BasePage com driver mockado e page_source contável."""
+    from pages.base_page import BasePage
+
+    driver = MagicMock()
+    driver.capabilities = {'appPackage': 'com.test.app'}
+    page_source_mock = PropertyMock(return_value=page_source)
+    type(driver).page_source = page_source_mock
+    return BasePage(driver), page_source_mock
+
+
+class TestBasePageSnapshot:
+    """Testes para o cache de snapshot da hierarquia."""
+
+    @patch('pages.base_page.logger')
+    def test_texto_exibido_le_do_snapshot_sem_buscar_elemento(self, mock_logger):
+        """
+        Quando o texto está no snapshot, não deve fazer find_element.
+        """
+        # Arrange
+        page, page_source = _criar_pagina()
+
+        # Act
+        resultado = page.texto_exibido("Iniciar Venda", tempo_espera=5)
+
+        # Assert
+        assert resultado is True
+        page.driver.find_element.assert_not_called()
+
+    @patch('pages.base_page.logger')
+    def test_consultas_na_mesma_tela_baixam_page_source_uma_vez(self, mock_logger):
+        """
+        Várias consultas na mesma tela devem reaproveitar o mesmo page_source.
+        """
+        # Arrange
+        page, page_source = _criar_pagina()
+
+        # Act
+        page.texto_exibido("Iniciar Venda")
+        page.elemento_existe("btn_ok")
+        page.texto_exibido("OK")
+
+        # Assert
+        assert page_source.call_count == 1
+
+    @patch('pages.base_page.time.sleep')
+    @patch('pages.base_page.logger')
+    def test_pages_no_mesmo_driver_compartilham_o_snapshot(self, mock_logger, mock_sleep):
+        """
+        Ação feita por outro page object no mesmo driver descarta o snapshot de todos.
+        """
+        from pages.base_page import BasePage
+
+        # Arrange
+        page, page_source = _criar_pagina()
+        outra = BasePage(page.driver)
+        page.texto_exibido("Iniciar Venda")
+
+        # Act
+        reaproveitou = outra.elemento_existe("btn_ok") and page_source.call_count == 1
+        outra.voltar_tela()
+        page_source.return_value = HIERARQUIA_CONFIRMACAO_SIM
+        exibido = page.texto_exibido("SIM", tempo_espera=0)
+
+        # Assert
+        assert reaproveitou is True
+        assert exibido is True
+        assert page_source.call_count == 2
+
+    @patch('pages.base_page.logger')
+    def test_invalidar_snapshot_forca_nova_captura(self, mock_logger):
+        """
+        Após uma ação que altera a tela, o próximo acesso deve baixar a hierarquia de novo.
+        """
+        # Arrange
+        page, page_source = _criar_pagina()
+        page.texto_exibido("Iniciar Venda")
+
+        # Act
+        page._invalidar_snapshot()
+        page.texto_exibido("Iniciar Venda")
+
+        # Assert
+        assert page_source.call_count == 2
+
+    @patch('pages.base_page.logger')
+    def test_elemento_existe_ignora_no_oculto_ou_fora_da_tela(self, mock_logger):
+        """
+        Nós com displayed=false ou fora da tela não contam como visíveis no snapshot.
+        """
+        # Arrange
+        page, _ = _criar_pagina()
+        page.encontrar_por_id = MagicMock(side_effect=Exception("nao encontrado"))
+
+        # Act & Assert
+        assert page.elemento_existe("btn_oculto", tempo_espera=0) is False
+        assert page.elemento_existe("btn_fora", tempo_espera=0) is False
+        assert page.elemento_existe("btn_ok", tempo_espera=0) is True
+
+    @patch('pages.base_page.logger')
+    def test_texto_ausente_no_snapshot_usa_espera(self, mock_logger):
+        """
+        Quando o texto não está no snapshot, deve cair na espera pelo elemento.
+        """
+        # Arrange
+        page, _ = _criar_pagina()
+        page.encontrar_por_texto = MagicMock(side_effect=Exception("timeout"))
+
+        # Act
+        resultado = page.texto_exibido("Venda realizada", tempo_espera=1)
+
+        # Assert
+        assert resultado is False
+        page.encontrar_por_texto.assert_called_once_with("Venda realizada", 1)
+
+    @patch('pages.base_page.logger')
+    def test_clicar_por_id_descarta_snapshot(self, mock_logger):
+        """
+        Clicar deve descartar o snapshot para que a próxima consulta veja a tela nova.
+        """
+        # Arrange
+        page, page_source = _criar_pagina()
+        page.encontrar_clicavel_por_id = MagicMock()
+        page.texto_exibido("Iniciar Venda")
+
+        # Act
+        page.clicar_por_id("btn_ok")
+        page.texto_exibido("Iniciar Venda")
+
+        # Assert
+        assert page_source.call_count == 2
+
+
+class TestBasePageConfirmarClique:
+    """Testes para as pós-condições opcionais de clicar_por_id."""
+
+    @patch('pages.base_page.logger')
+    def test_clique_sem_confirmacao_nao_baixa_hierarquia(self, mock_logger):
+        """
+        Sem pós-condição, o clique custa só a busca + click (nenhum page_source).
+        """
+        # Arrange
+        page, page_source = _criar_pagina()
+        elemento = MagicMock()
+        page.encontrar_clicavel_por_id = MagicMock(return_value=elemento)
+
+        # Act
+        resultado = page.clicar_por_id("btn_ok")
+
+        # Assert
+        assert resultado is True
+        elemento.click.assert_called_once()
+        assert page_source.call_count == 0
+
+    @patch('pages.base_page.logger')
+    def test_confirmar_sumiu_aguarda_elemento_ficar_stale(self, mock_logger):
+        """
+        Com CONFIRMAR_SUMIU, o clique é confirmado quando o elemento sai da tela.
+        """
+        from selenium.common.exceptions import StaleElementReferenceException
+        from pages.base_page import BasePage
+
+        # Arrange
+        page, page_source = _criar_pagina()
+        elemento = MagicMock()
+        elemento.is_enabled.side_effect = StaleElementReferenceException("sumiu")
+        page.encontrar_clicavel_por_id = MagicMock(return_value=elemento)
+
+        # Act
+        resultado = page.clicar_por_id("btn_mais_tarde", confirmar=BasePage.CONFIRMAR_SUMIU)
+
+        # Assert
+        assert resultado is True
+        assert page_source.call_count == 0
+
+    @patch('pages.retry.time')
+    @patch('pages.base_page.logger')
+    def test_confirmar_proximo_id_tenta_de_novo_se_nao_aparece(self, mock_logger, mock_time):
+        """
+        Se o próximo elemento não aparece, conta como tentativa falha.
+        """
+        from selenium.common.exceptions import TimeoutException
+
+        # Arrange
+        page, _ = _criar_pagina()
+        elemento = MagicMock()
+        page.encontrar_clicavel_por_id = MagicMock(return_value=elemento)
+
+        # Act
+        with patch('pages.base_page.EsperaAdaptativa') as mock_wait:
+            mock_wait.return_value.until.side_effect = [TimeoutException("nao apareceu"), MagicMock()]
+            resultado = page.clicar_por_id("btn_adicionar_produtos", confirmar="editText")
+
+        # Assert
+        assert resultado is True
+        assert elemento.click.call_count == 2
+
+    @patch('pages.retry.time')
+    @patch('pages.base_page.logger')
+    def test_elemento_ainda_fora_da_tela_tenta_de_novo(self, mock_logger, mock_time):
+        """
+        Elemento clicável mas ainda não visível (animação) é retentável, não fatal.
+        """
+        # Arrange
+        page, _ = _criar_pagina()
+        elemento = MagicMock()
+        page._elemento_realmente_visivel = MagicMock(side_effect=[False, True])
+
+        # Act
+        with patch('pages.base_page.EsperaAdaptativa') as mock_wait:
+            mock_wait.return_value.until.return_value = elemento
+            resultado = page.clicar_por_id("btn_ok")
+
+        # Assert
+        assert resultado is True
+        assert page._elemento_realmente_visivel.call_count == 2
+        elemento.click.assert_called_once()
+        mock_time.sleep.assert_called_once()
+
+    @patch('pages.retry.time')
+    @patch('pages.base_page.logger')
+    def test_sessao_encerrada_falha_sem_novas_tentativas(self, mock_logger, mock_time):
+        """
+        Falha fatal (sessão encerrada) não repete o clique nem espera backoff.
+        """
+        from selenium.common.exceptions import InvalidSessionIdException
+
+        # Arrange
+        page, _ = _criar_pagina()
+        elemento = MagicMock()
+        elemento.click.side_effect = InvalidSessionIdException("session is either terminated or not started")
+        page.encontrar_clicavel_por_id = MagicMock(return_value=elemento)
+
+        # Act & Assert
+        with pytest.raises(Exception, match="Nao foi possivel clicar em 'btn_ok'"):
+            page.clicar_por_id("btn_ok")
+        assert elemento.click.call_count == 1
+        mock_time.sleep.assert_not_called()
+
+    @patch('pages.retry.time')
+    @patch('pages.base_page.logger')
+    def test_timeout_com_outro_app_em_primeiro_plano_e_fatal(self, mock_logger, mock_time):
+        """
+        Elemento não apareceu porque outro app está na frente: não adianta tentar de novo.
+        """
+        from selenium.common.exceptions import TimeoutException
+
+        # Arrange
+        page, _ = _criar_pagina()
+        page.driver.current_package = "com.android.launcher3"
+        page.encontrar_clicavel_por_id = MagicMock(side_effect=TimeoutException("nao apareceu"))
+
+        # Act & Assert
+        with pytest.raises(Exception, match="Nao foi possivel clicar"):
+            page.clicar_por_id("btn_ok")
+        assert page.encontrar_clicavel_por_id.call_count == 1
+
+    @patch('pages.base_page.logger')
+    def test_estrutura_ignora_mudanca_de_texto(self, mock_logger):
+        """
+        A impressão digital estrutural não muda quando só um texto muda.
+        """
+        from pages.base_page import SnapshotTela
+
+        # Arrange
+        original = SnapshotTela(HIERARQUIA_HOME)
+        texto_mudou = SnapshotTela(HIERARQUIA_HOME.replace("Iniciar Venda", "Carregando..."))
+        tela_mudou = SnapshotTela(HIERARQUIA_HOME.replace("btn_ok", "btn_confirmar"))
+
+        # Act & Assert
+        assert original.estrutura == texto_mudou.estrutura
+        assert original.estrutura != tela_mudou.estrutura
+
+
+class TestBasePageVisibilidade:
+    """Testes para a checagem de visibilidade em uma única chamada."""
+
+    @patch('pages.base_page.logger')
+    def test_elemento_validado_pela_espera_custa_uma_chamada(self, mock_logger):
+        """
+        Elemento vindo de element_to_be_clickable: só o rect deve ser consultado.
+        """
+        # Arrange
+        page, _ = _criar_pagina()
+        page._obter_snapshot()  # tamanho da tela vem da raiz do snapshot
+        elemento = MagicMock()
+        elemento.rect = {'x': 10, 'y': 20, 'width': 100, 'height': 50}
+
+        # Act
+        resultado = page._elemento_realmente_visivel(elemento, estado_validado=True)
+
+        # Assert
+        assert resultado is True
+        elemento.is_displayed.assert_not_called()
+        elemento.is_enabled.assert_not_called()
+        page.driver.get_window_size.assert_not_called()
+
+    @patch('pages.base_page.logger')
+    def test_tamanho_tela_consultado_uma_vez_por_sessao(self, mock_logger):
+        """
+        get_window_size deve ser chamado no máximo uma vez por sessão.
+        """
+        # Arrange
+        page, _ = _criar_pagina()
+        page.driver.session_id = "sessao-unica-visibilidade"
+        page.driver.get_window_size.return_value = {'width': 720, 'height': 1280}
+        elemento = MagicMock()
+        elemento.rect = {'x': 10, 'y': 20, 'width': 100, 'height': 50}
+
+        # Act
+        page._elemento_realmente_visivel(elemento)
+        page._elemento_realmente_visivel(elemento)
+
+        # Assert
+        page.driver.get_window_size.assert_called_once()
+
+    @patch('pages.base_page.logger')
+    def test_elemento_fora_da_tela_nao_e_visivel(self, mock_logger):
+        """
+        Elemento com posição além da altura da tela não está visível.
+        """
+        # Arrange
+        page, _ = _criar_pagina()
+        page._obter_snapshot()
+        elemento = MagicMock()
+        elemento.rect = {'x': 10, 'y': 5000, 'width': 100, 'height': 50}
+
+        # Act & Assert
+        assert page._elemento_realmente_visivel(elemento, estado_validado=True) is False
+
+
+class TestBasePageAguardarTelaEstavel:
+    """Testes para o método aguardar_tela_estavel."""
+
+    @patch('pages.base_page.time')
+    @patch('pages.base_page.logger')
+    def test_retorna_quando_hierarquia_para_de_mudar(self, mock_logger, mock_time):
+        """
+        Deve retornar True assim que duas leituras seguidas forem iguais (janela mínima zerada).
+        """
+        # Arrange
+        page, page_source = _criar_pagina()
+        animando = HIERARQUIA_HOME.replace("[40,300][680,380]", "[40,340][680,420]")
+        page_source.side_effect = [animando, HIERARQUIA_HOME, HIERARQUIA_HOME, HIERARQUIA_HOME]
+        mock_time.monotonic.return_value = 0
+
+        # Act
+        resultado = page.aguardar_tela_estavel(leituras_estaveis=2, janela_minima=0)
+
+        # Assert
+        assert resultado is True
+        assert page_source.call_count == 3
+
+    @patch('pages.base_page.time')
+    @patch('pages.base_page.logger')
+    def test_leituras_iguais_precisam_cobrir_a_janela_minima(self, mock_logger, mock_time):
+        """
+        Duas leituras iguais logo em seguida não bastam: a tela precisa ficar igual por janela_minima.
+        """
+        # Arrange
+        page, page_source = _criar_pagina()
+        mock_time.monotonic.side_effect = itertools.count(0, 0.15)  # +0.15s a cada leitura do relógio
+
+        # Act
+        resultado = page.aguardar_tela_estavel(leituras_estaveis=2, janela_minima=0.4)
+
+        # Assert
+        assert resultado is True
+        assert page_source.call_count > 2  # Duas leituras bastariam sem a janela
+
+    @patch('pages.base_page.time')
+    @patch('pages.base_page.logger')
+    def test_mudou_de_ignora_a_tela_de_antes_da_acao(self, mock_logger, mock_time):
+        """
+        Com a disposição de antes da ação, a tela antiga estável não conta: espera mudar e estabilizar.
+        """
+        # Arrange
+        page, page_source = _criar_pagina()
+        antes = page.assinatura_tela()
+        nova = HIERARQUIA_HOME.replace("Iniciar Venda", "Venda realizada").replace("txt_menu", "txt_sucesso")
+        page_source.side_effect = [HIERARQUIA_HOME, HIERARQUIA_HOME, HIERARQUIA_HOME, nova, nova, nova]
+        mock_time.monotonic.return_value = 0
+
+        # Act
+        resultado = page.aguardar_tela_estavel(janela_minima=0, mudou_de=antes)
+
+        # Assert
+        assert resultado is True
+        assert page.texto_exibido("Venda realizada", tempo_espera=0) is True
+        assert page_source.call_count == 1 + 5
+
+    @patch('pages.base_page.time')
+    @patch('pages.base_page.logger')
+    def test_mudou_de_sem_transicao_estoura_o_tempo(self, mock_logger, mock_time):
+        """
+        Se a tela nunca sai da de antes da ação, retorna False no tempo máximo.
+        """
+        # Arrange
+        page, page_source = _criar_pagina()
+        antes = page.assinatura_tela()
+        mock_time.monotonic.side_effect = itertools.count()
+
+        # Act
+        resultado = page.aguardar_tela_estavel(tempo_maximo=3, janela_minima=0, mudou_de=antes)
+
+        # Assert
+        assert resultado is False
+
+    @patch('pages.base_page.time')
+    @patch('pages.base_page.logger')
+    def test_retorna_false_quando_tela_nao_estabiliza(self, mock_logger, mock_time):
+        """
+        Se a tela continuar mudando até o tempo máximo, deve retornar False e seguir.
+        """
+        # Arrange
+        page, page_source = _criar_pagina()
+        page_source.side_effect = [HIERARQUIA_HOME.replace("[40,300]", f"[40,{300 + i}]") for i in range(10)]
+        mock_time.monotonic.side_effect = [0, 0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
+
+        # Act
+        resultado = page.aguardar_tela_estavel(tempo_maximo=3)
+
+        # Assert
+        assert resultado is False
+
+    @patch('pages.base_page.time')
+    @patch('pages.base_page.logger')
+    def test_relogio_na_tela_nao_impede_estabilidade(self, mock_logger, mock_time):
+        """
+        Texto que muda a cada leitura (relógio, contador) não conta como tela mudando.
+        """
+        # Arrange
+        page, page_source = _criar_pagina()
+        page_source.side_effect = [HIERARQUIA_HOME.replace("Iniciar Venda", f"10:00:0{i}") for i in range(10)]
+        mock_time.monotonic.side_effect = itertools.count(0, 0.2)
+
+        # Act
+        resultado = page.aguardar_tela_estavel()
+
+        # Assert
+        assert resultado is True
+        assert page_source.call_count <= 3
+
+    @patch('pages.base_page.time')
+    @patch('pages.base_page.logger')
+    def test_snapshot_estavel_fica_em_cache(self, mock_logger, mock_time):
+        """
+        Após estabilizar, consultas seguintes usam o último snapshot sem nova captura.
+        """
+        # Arrange
+        page, page_source = _criar_pagina()
+        mock_time.monotonic.return_value = 0
+
+        # Act
+        page.aguardar_tela_estavel(janela_minima=0)
+        page.texto_exibido("Iniciar Venda")
+
+        # Assert
+        assert page_source.call_count == 2
+
+
+class TestBasePageAguardarPrimeiro:
+    """Testes para a espera com várias alternativas de locator."""
+
+    @patch('pages.base_page.logger')
+    def test_retorna_alternativa_que_aparece_primeiro(self, mock_logger):
+        """
+        Deve retornar a alternativa visível sem esperar o timeout das outras.
+        """
+        # Arrange
+        page, _ = _criar_pagina()
+        elemento = MagicMock()
+        elemento.rect = {'x': 10, 'y': 20, 'width': 100, 'height': 50}
+        page.driver.get_window_size.return_value = {'width': 720, 'height': 1280}
+
+        def find_elements(by, valor):
+            return [elemento] if "button30" in valor else []
+
+        page.driver.find_elements.side_effect = find_elements
+
+        # Act
+        nome, encontrado = page.aguardar_primeiro({
+            "l400_stone": page._locator_texto("Selecionar Cliente"),
+            "playstore": page._locator_id("button30"),
+        }, tempo_espera=1)
+
+        # Assert
+        assert nome == "playstore"
+        assert encontrado is elemento
+
+    @patch('pages.base_page.logger')
+    def test_lanca_timeout_quando_nenhuma_aparece(self, mock_logger):
+        """
+        Deve lançar TimeoutException quando nenhuma alternativa aparece.
+        """
+        from selenium.common.exceptions import TimeoutException
+
+        # Arrange
+        page, _ = _criar_pagina()
+        page.driver.find_elements.return_value = []
+
+        # Act & Assert
+        with pytest.raises(TimeoutException):
+            page.aguardar_primeiro({"a": page._locator_id("x"), "b": page._locator_texto("y")}, tempo_espera=0.1)
+
+
+class TestBasePagePassoOpcional:
+    """Testes para o diálogo opcional disputado com a próxima tela."""
+
+    @patch('pages.base_page.logger')
+    def test_proxima_tela_primeiro_segue_sem_clicar(self, mock_logger):
+        """
+        Se a próxima tela aparece antes do diálogo, não clica e não espera a tela estabilizar.
+        """
+        # Arrange
+        page, _ = _criar_pagina()
+        elemento = MagicMock()
+        page.aguardar_primeiro = MagicMock(return_value=("proxima", elemento))
+        page.aguardar_tela_estavel = MagicMock()
+
+        # Act
+        resultado = page.passo_opcional("android:id/button2", page._locator_texto("Venda realizada"))
+
+        # Assert
+        assert resultado is False
+        elemento.click.assert_not_called()
+        page.aguardar_tela_estavel.assert_not_called()
+
+    @patch('pages.base_page.logger')
+    def test_dialogo_primeiro_e_respondido(self, mock_logger):
+        """
+        Se o diálogo aparece primeiro, clica no botão e aguarda o fechamento no prazo restante.
+        """
+        # Arrange
+        page, _ = _criar_pagina()
+        elemento = MagicMock()
+        page.aguardar_primeiro = MagicMock(return_value=("dialogo", elemento))
+        page.aguardar_tela_estavel = MagicMock()
+
+        # Act
+        resultado = page.passo_opcional("android:id/button2", page._locator_texto("Venda realizada"), tempo_espera=20)
+
+        # Assert
+        assert resultado is True
+        elemento.click.assert_called_once()
+        alternativas = page.aguardar_primeiro.call_args.args[0]
+        assert list(alternativas) == ["dialogo", "proxima"]
+        assert page.aguardar_tela_estavel.call_args.kwargs['tempo_maximo'] <= 20
+
+
+class TestBasePagePerfilFlavor:
+    """Testes para o perfil de flavor resolvido pelo package da sessão."""
+
+    @pytest.mark.parametrize("package, flavor, layout", [
+        ("com.serverinfo.bshoppdv.stone.qa", "Stone", "device"),
+        ("com.serverinfo.bshoppdv.redel400", "REDEL400", "device"),
+        ("com.serverinfo.bshoppdv.playstore.qa", "Playstore", "playstore"),
+        ("com.serverinfo.bshoppdv.pagseguro", "Pagseguro", None),
+        ("com.desconhecido.app", None, None),
+    ])
+    @patch('pages.base_page.logger')
+    def test_perfil_pelo_package(self, mock_logger, package, flavor, layout):
+        """
+        O flavor vem de APP_TARGETS; flavors não mapeados ficam sem layout.
+        """
+        # Arrange
+        page, _ = _criar_pagina()
+        page.driver.capabilities = {'appPackage': package}
+
+        # Act & Assert
+        assert page.perfil == {'flavor': flavor, 'layout': layout}
+
+    @patch('pages.base_page.logger')
+    def test_identificar_versao_com_flavor_conhecido_nao_sonda_tela(self, mock_logger):
+        """
+        Com layout conhecido, não deve consultar a tela.
+        """
+        # Arrange
+        page, page_source = _criar_pagina()
+        page.driver.capabilities = {'appPackage': 'com.serverinfo.bshoppdv.playstore'}
+        page.aguardar_primeiro = MagicMock()
+
+        # Act
+        versao = page.identificar_versao({
+            "device": page._locator_texto("Iniciar Venda"),
+            "playstore": page._locator_texto("Venda", exato=True),
+        })
+
+        # Assert
+        assert versao == "playstore"
+        page.aguardar_primeiro.assert_not_called()
+        page.driver.find_elements.assert_not_called()
+
+    @patch('pages.base_page.logger')
+    def test_identificar_versao_com_flavor_desconhecido_sonda_tela(self, mock_logger):
+        """
+        Sem layout mapeado, deve sondar as alternativas.
+        """
+        # Arrange
+        page, _ = _criar_pagina()
+        page.aguardar_primeiro = MagicMock(return_value=("device", MagicMock()))
+
+        # Act
+        versao = page.identificar_versao({"device": ("id", "a"), "playstore": ("id", "b")}, tempo_espera=5)
+
+        # Assert
+        assert versao == "device"
+        page.aguardar_primeiro.assert_called_once()
+
+
+class TestBasePageEstrategiaPreferida:
+    """Testes para o uso da estratégia de locator mais rápida do device."""
+
+    @patch('pages.base_page.logger')
+    def test_locator_id_usa_estrategia_preferida_do_modelo(self, mock_logger):
+        """
+        Com benchmark do modelo indicando UiSelector, o ID vira resourceId().
+        """
+        from appium.webdriver.common.appiumby import AppiumBy
+
+        # Arrange
+        page, _ = _criar_pagina()
+        page.driver.capabilities = {'appPackage': 'com.test.app', 'deviceModel': 'L400'}
+
+        # Act
+        with patch('pages.base_page.preferencias_do_modelo', return_value={'id:btn_ok': 'uiselector'}):
+            locator = page._locator_id("btn_ok")
+            locator_sem_benchmark = page._locator_id("btn_cancelar")
+
+        # Assert
+        assert locator == (AppiumBy.ANDROID_UIAUTOMATOR, 'new UiSelector().resourceId("com.test.app:id/btn_ok")')
+        assert locator_sem_benchmark == (AppiumBy.ID, "com.test.app:id/btn_cancelar")
+
+
+class TestBasePageDigitacaoRapida:
+    """Testes para o modo rápido de digitação e preencher_formulario."""
+
+    @patch('pages.base_page.logger')
+    def test_campo_vazio_no_snapshot_usa_so_send_keys(self, mock_logger):
+        """
+        Campo vazio no snapshot: um único send_keys, sem clear nem checagem de visibilidade.
+        """
+        # Arrange
+        page, _ = _criar_pagina()
+        page._obter_snapshot()
+        campo = MagicMock()
+        page.encontrar_por_id = MagicMock(return_value=campo)
+
+        # Act
+        page.digitar_por_id("edt_vazio", "382", rapido=True)
+
+        # Assert
+        campo.send_keys.assert_called_once_with("382")
+        campo.clear.assert_not_called()
+        campo.is_displayed.assert_not_called()
+        page.driver.execute_script.assert_not_called()
+
+    @patch('pages.base_page.logger')
+    def test_campo_com_texto_usa_replace_element_value(self, mock_logger):
+        """
+        Campo com conteúdo: substitui com um único mobile: replaceElementValue.
+        """
+        # Arrange
+        page, _ = _criar_pagina()
+        page._obter_snapshot()
+        campo = MagicMock()
+        campo.id = "elemento-1"
+        page.encontrar_por_id = MagicMock(return_value=campo)
+
+        # Act
+        page.digitar_por_id("edt_preenchido", "NOVO", rapido=True)
+
+        # Assert
+        page.driver.execute_script.assert_called_once_with(
+            'mobile: replaceElementValue', {'elementId': "elemento-1", 'text': "NOVO"}
+        )
+        campo.clear.assert_not_called()
+        campo.send_keys.assert_not_called()
+
+    @patch('pages.base_page.logger')
+    def test_preencher_formulario_le_hierarquia_no_maximo_uma_vez(self, mock_logger):
+        """
+        O formulário inteiro usa o snapshot em cache e não baixa page_source.
+        """
+        # Arrange
+        page, page_source = _criar_pagina()
+        page._obter_snapshot()
+        campos = {"edt_vazio": MagicMock(), "edt_preenchido": MagicMock()}
+        page.encontrar_por_id = MagicMock(side_effect=lambda element_id: campos[element_id])
+
+        # Act
+        page.preencher_formulario([("edt_vazio", "A"), ("edt_preenchido", "B")])
+
+        # Assert
+        assert page_source.call_count == 1
+        campos["edt_vazio"].send_keys.assert_called_once_with("A")
+        page.driver.execute_script.assert_called_once()
+
+
+class TestBasePageRolarAte:
+    """Testes para o motor de busca com scroll (orçamento de tempo e fim da lista)."""
+
+    @patch.dict('pages.base_page.ESTATISTICAS_SCROLL', clear=True)
+    @patch('pages.base_page.time')
+    @patch('pages.base_page.logger')
+    def test_alvo_ja_visivel_nao_rola(self, mock_logger, mock_time):
+        """
+        Alvo visível no primeiro snapshot: nenhum swipe e uma única busca do elemento.
+        """
+        from pages.base_page import ESTATISTICAS_SCROLL
+
+        # Arrange
+        page, _ = _criar_pagina()
+        page._rolar = MagicMock()
+        mock_time.monotonic.return_value = 0
+
+        # Act
+        elemento = page.rolar_ate_id("btn_ok")
+
+        # Assert
+        assert elemento is page.driver.find_element.return_value
+        page._rolar.assert_not_called()
+        assert ESTATISTICAS_SCROLL["ID 'btn_ok'"] == [{'swipes': 0, 'tempo': 0, 'encontrado': True}]
+
+    @patch.dict('pages.base_page.ESTATISTICAS_SCROLL', clear=True)
+    @patch('pages.base_page.time')
+    @patch('pages.base_page.logger')
+    def test_para_no_fim_da_lista(self, mock_logger, mock_time):
+        """
+        Hierarquia idêntica após o swipe: fim da lista, para sem gastar os scrolls restantes.
+        """
+        from pages.base_page import ESTATISTICAS_SCROLL
+
+        # Arrange
+        page, page_source = _criar_pagina()
+        page._rolar = MagicMock()
+        mock_time.monotonic.return_value = 0
+
+        # Act & Assert
+        with pytest.raises(Exception, match="fim da lista"):
+            page.rolar_ate_texto("Inexistente", max_scrolls=10)
+        assert page._rolar.call_count == 1
+        assert page_source.call_count == 2
+        assert ESTATISTICAS_SCROLL["Texto 'Inexistente'"][0]['encontrado'] is False
+
+    @patch.dict('pages.base_page.ESTATISTICAS_SCROLL', clear=True)
+    @patch('pages.base_page.time')
+    @patch('pages.base_page.logger')
+    def test_para_no_orcamento_de_tempo(self, mock_logger, mock_time):
+        """
+        Lista que continua mudando: para quando o tempo total da busca estoura.
+        """
+        # Arrange
+        page, page_source = _criar_pagina()
+        page_source.side_effect = [HIERARQUIA_HOME.replace("OK", f"OK {i}") for i in range(10)]
+        page._rolar = MagicMock()
+        mock_time.monotonic.side_effect = itertools.count()  # +1s a cada leitura do relógio
+
+        # Act & Assert
+        with pytest.raises(Exception, match="limite de 5s"):
+            page.rolar_ate_texto("Inexistente", max_scrolls=10, tempo_maximo=5)
+        assert page._rolar.call_count == 2
+
+    @patch.dict('pages.base_page.ESTATISTICAS_SCROLL', clear=True)
+    @patch('pages.base_page.time')
+    @patch('pages.base_page.logger')
+    def test_swipe_curto_quando_alvo_esta_logo_abaixo(self, mock_logger, mock_time):
+        """
+        Alvo na hierarquia abaixo da tela: rola só o necessário para trazê-lo ao meio da faixa.
+        """
+        # Arrange
+        abaixo = HIERARQUIA_HOME.replace("[40,1500][680,1580]", "[40,1300][680,1380]")
+        page, page_source = _criar_pagina(abaixo)
+        page_source.side_effect = [abaixo, HIERARQUIA_HOME.replace("[40,1500][680,1580]", "[40,600][680,680]")]
+        page._rolar = MagicMock()
+        mock_time.monotonic.return_value = 0
+
+        # Act
+        page.rolar_ate_texto("Fora da tela")
+
+        # Assert - faixa 20%-80% de 1280px (768px), meio em 640; alvo em 1300 -> 660px
+        page._rolar.assert_called_once_with(page.FAIXA_SCROLL, pytest.approx(660 / 768))
+
+    @patch.dict('pages.base_page.ESTATISTICAS_SCROLL', clear=True)
+    @patch('pages.base_page.time')
+    @patch('pages.base_page.logger')
+    def test_para_quando_gesto_informa_fim_da_lista(self, mock_logger, mock_time):
+        """
+        scrollGesture devolve False (não dá para rolar mais): para após conferir a última tela.
+        """
+        # Arrange
+        page, page_source = _criar_pagina()
+        page_source.side_effect = [HIERARQUIA_HOME.replace("OK", f"OK {i}") for i in range(10)]
+        page._rolar = MagicMock(return_value=False)
+        mock_time.monotonic.return_value = 0
+
+        # Act & Assert
+        with pytest.raises(Exception, match="fim da lista"):
+            page.rolar_ate_texto("Inexistente", max_scrolls=10)
+        assert page._rolar.call_count == 1
+        assert page_source.call_count == 2
+
+
+class TestBasePageTeclado:
+    """Testes para o controle do teclado com comandos da sessão."""
+
+    @patch('pages.base_page.logger')
+    def test_estado_do_teclado_fica_em_cache_ate_a_proxima_acao(self, mock_logger):
+        """
+        Consultas seguidas reutilizam o estado; uma ação na tela descarta o cache.
+        """
+        # Arrange
+        page, _ = _criar_pagina()
+        page.driver.execute_script.return_value = False
+
+        # Act
+        page.fechar_teclado()
+        page.fechar_teclado()
+        page._invalidar_snapshot()
+        page.fechar_teclado()
+
+        # Assert
+        assert page.driver.execute_script.call_count == 2
+
+    @patch('pages.teclado.time')
+    @patch('pages.teclado.logger')
+    @patch('pages.base_page.logger')
+    def test_fecha_com_keycode_da_sessao_sem_adb(self, mock_logger, mock_logger_teclado, mock_time):
+        """
+        hide_keyboard não resolve: usa press_keycode(BACK) pelo driver da sessão.
+        """
+        from pages.teclado import KEYCODE_BACK
+
+        # Arrange
+        page, _ = _criar_pagina()
+        mock_time.monotonic.return_value = 0
+        page.driver.execute_script.side_effect = [True, True, False]
+        page.driver.hide_keyboard.side_effect = WebDriverException("nao suportado")
+
+        # Act
+        resultado = page.fechar_teclado()
+
+        # Assert
+        assert resultado is True
+        page.driver.press_keycode.assert_called_once_with(KEYCODE_BACK)
+
+    @patch('pages.base_page.logger')
+    def test_nao_envia_back_com_teclado_fechado(self, mock_logger):
+        """
+        Teclado já fechado: nenhum comando é enviado (BACK voltaria de tela).
+        """
+        # Arrange
+        page, _ = _criar_pagina()
+        page.driver.execute_script.return_value = False
+
+        # Act
+        resultado = page.fechar_teclado()
+
+        # Assert
+        assert resultado is True
+        page.driver.hide_keyboard.assert_not_called()
+        page.driver.press_keycode.assert_not_called()
+
+
+class TestBasePageInterrupcoes:
+    """Testes para o registro de interrupções lido dos snapshots."""
+
+    @patch('pages.base_page.tocar')
+    @patch('pages.base_page.logger')
+    def test_popup_automatico_dispensado_no_snapshot(self, mock_logger, mock_tocar):
+        """
+        Popup de bônus no snapshot novo é dispensado tocando no centro do botão.
+        """
+        # Arrange
+        page, page_source = _criar_pagina()
+        page_source.side_effect = [HIERARQUIA_POPUP_BONUS, HIERARQUIA_HOME]
+
+        # Act
+        snapshot = page._obter_snapshot()
+
+        # Assert
+        mock_tocar.assert_called_once_with(page.driver, 200, 850)
+        assert snapshot.buscar_por_texto("Iniciar Venda")
+
+    @patch('pages.base_page.tocar')
+    @patch('pages.base_page.logger')
+    def test_popup_que_abre_depois_da_checagem_e_dispensado_na_leitura_seguinte(self, mock_logger, mock_tocar):
+        """
+        tratar_interrupcoes(BONUS) não viu o popup; ele abre depois e a próxima leitura da tela dispensa.
+        """
+        from pages.interrupcoes import BONUS
+
+        # Arrange
+        page, page_source = _criar_pagina()
+        tratadas = page.tratar_interrupcoes(BONUS)
+        page._invalidar_snapshot()  # ação do fluxo
+        page_source.side_effect = [HIERARQUIA_POPUP_BONUS, HIERARQUIA_HOME]
+
+        # Act
+        exibido = page.texto_exibido("Iniciar Venda")
+
+        # Assert
+        assert tratadas == []
+        assert exibido is True
+        mock_tocar.assert_called_once_with(page.driver, 200, 850)
+
+    @patch('pages.base_page.tocar')
+    @patch('pages.base_page.logger')
+    def test_consulta_nao_toca_na_tela_com_intercepcao_desligada(self, mock_logger, mock_tocar):
+        """
+        INTERCEPTAR_INTERRUPCOES desligado: ler a tela não dispensa popup; tratar_interrupcoes() dispensa.
+        """
+        # Arrange
+        page, page_source = _criar_pagina(HIERARQUIA_POPUP_BONUS)
+        page.INTERCEPTAR_INTERRUPCOES = False
+
+        # Act
+        exibido = page.texto_exibido("BÔNUS DISPONÍVEL")
+        tocou_na_consulta = mock_tocar.called
+        page_source.return_value = HIERARQUIA_HOME
+        tratadas = page.tratar_interrupcoes()
+
+        # Assert
+        assert exibido is True
+        assert tocou_na_consulta is False
+        assert tratadas == ["bonus"]
+        mock_tocar.assert_called_once_with(page.driver, 200, 850)
+
+    @patch('pages.base_page.tocar')
+    @patch('pages.base_page.logger')
+    def test_botao_sem_bounds_e_pulado(self, mock_logger, mock_tocar):
+        """
+        Botão de interrupção com bounds malformado não derruba a leitura: é pulado e a próxima interrupção é dispensada.
+        """
+        from pages.interrupcoes import BONUS, PERMISSAO_ANDROID
+
+        # Arrange
+        page, page_source = _criar_pagina()
+        botao_permissao = {'bounds': '[100,800][300,900]'}
+        detectados = [(BONUS, {'bounds': '[100,800]'}), (PERMISSAO_ANDROID, botao_permissao), None]
+
+        # Act
+        with patch('pages.base_page.detectar', side_effect=detectados) as mock_detectar, \
+                patch.object(PERMISSAO_ANDROID, 'botao_na_tela', return_value=None):
+            page._obter_snapshot()
+
+        # Assert
+        mock_tocar.assert_called_once_with(page.driver, 200, 850)
+        assert BONUS not in mock_detectar.call_args_list[1].args[1]
+
+    @patch('pages.retry.time')
+    @patch('pages.base_page.tocar')
+    @patch('pages.base_page.logger')
+    def test_nova_tentativa_de_clique_dispensa_popup(self, mock_logger, mock_tocar, mock_time):
+        """
+        Clique que falhou por popup na frente: a nova tentativa dispensa o popup antes de buscar o elemento.
+        """
+        from selenium.common.exceptions import ElementClickInterceptedException
+
+        # Arrange
+        page, page_source = _criar_pagina(HIERARQUIA_POPUP_BONUS)
+        elemento = MagicMock()
+        elemento.click.side_effect = [ElementClickInterceptedException("popup na frente"), None]
+        page.encontrar_clicavel_por_id = MagicMock(return_value=elemento)
+
+        def _tocou(*args):
+            page_source.return_value = HIERARQUIA_HOME
+
+        mock_tocar.side_effect = _tocou
+
+        # Act
+        resultado = page.clicar_por_id("btn_ok")
+
+        # Assert
+        assert resultado is True
+        mock_tocar.assert_called_once_with(page.driver, 200, 850)
+        assert elemento.click.call_count == 2
+
+    @patch('pages.base_page.tocar')
+    @patch('pages.base_page.logger')
+    def test_tela_sem_popup_nao_toca_nem_espera(self, mock_logger, mock_tocar):
+        """
+        Sem interrupção na tela, o snapshot custa só o page_source.
+        """
+        # Arrange
+        page, page_source = _criar_pagina()
+
+        # Act
+        page._obter_snapshot()
+
+        # Assert
+        mock_tocar.assert_not_called()
+        assert page_source.call_count == 1
+
+    @patch('pages.base_page.tocar')
+    @patch('pages.base_page.logger')
+    def test_interrupcao_sob_demanda_so_quando_pedida(self, mock_logger, mock_tocar):
+        """
+        O "SIM" não é dispensado sozinho; tratar_interrupcoes(CONFIRMACAO_SIM) dispensa.
+        """
+        from pages.interrupcoes import CONFIRMACAO_SIM
+
+        # Arrange
+        page, page_source = _criar_pagina(HIERARQUIA_CONFIRMACAO_SIM)
+
+        # Act
+        page._obter_snapshot()
+        tocou_sozinho = mock_tocar.called
+        page_source.return_value = HIERARQUIA_HOME
+        tratadas = page.tratar_interrupcoes(CONFIRMACAO_SIM)
+
+        # Assert
+        assert tocou_sozinho is False
+        assert tratadas == ["confirmacao_sim"]
+        mock_tocar.assert_called_once_with(page.driver, 500, 740)
@@ -0,0 +1,297 @@
+"""
+Testes unitários para a detecção do app alvo (config.py).
+Utiliza um cliente adb mockado e um diretório de cache temporário.
+"""
+import json
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+
+PM_LIST = "package:com.android.settings\npackage:com.serverinfo.bshoppdv.stone.qa\npackage:com.google.android.gms\n"
+DUMPSYS = "    lastUpdateTime=2026-01-10 09:00:00\n"
+
+
+@pytest.fixture
+def cache_apps(tmp_path):
+    import config
+
+    arquivo = tmp_path / "cache" / "apps_por_device.json"
+    with patch.object(config, 'CACHE_DIR', tmp_path / "cache"), \
+            patch.object(config, 'CACHE_APPS_ARQUIVO', arquivo), \
+            patch.dict(config._APPS_POR_DEVICE, clear=True):
+        yield arquivo
+
+
+@pytest.fixture
+def adb():
+    cliente = MagicMock()
+    cliente.shell.side_effect = lambda serial, comando, timeout=None: DUMPSYS if "dumpsys" in comando else PM_LIST
+    with patch('config.adb_client.cliente', return_value=cliente):
+        yield cliente
+
+
+class TestConfigIndicePacotes:
+    """Testes para o índice package -> flavor."""
+
+    def test_flavor_do_pacote_pelo_indice(self):
+        """
+        O flavor sai direto do índice; package desconhecido retorna None.
+        """
+        from config import flavor_do_pacote, APPS_POR_PACOTE
+
+        # Act & Assert
+        assert flavor_do_pacote("com.serverinfo.bshoppdv.stone.qa") == "Stone"
+        assert APPS_POR_PACOTE["com.serverinfo.bshoppdv.redel400"]["ambiente"] == "PROD"
+        assert flavor_do_pacote("com.outro.app") is None
+
+
+class TestConfigCacheApps:
+    """Testes para o cache device -> app detectado."""
+
+    @patch('builtins.print')
+    def test_device_ja_visto_nao_chama_adb(self, mock_print, cache_apps, adb):
+        """
+        Depois da primeira detecção, o mesmo device é resolvido sem adb.
+        """
+        import config
+
+        # Arrange
+        config.discover_target_app("L400-01")
+        adb.shell.reset_mock()
+        config._APPS_POR_DEVICE.clear()  # Novo processo: só o arquivo em disco
+
+        # Act
+        package, _ = config.discover_target_app("L400-01")
+
+        # Assert
+        assert package == "com.serverinfo.bshoppdv.stone.qa"
+        adb.shell.assert_not_called()
+        assert json.loads(cache_apps.read_text())["L400-01"]["instalado_em"] == "2026-01-10 09:00:00"
+
+    @patch('builtins.print')
+    def test_validade_vencida_confere_so_a_instalacao(self, mock_print, cache_apps, adb):
+        """
+        Vencida a validade, com a mesma data de instalação, não refaz o pm list packages.
+        """
+        import config
+
+        # Arrange
+        config.discover_target_app("L400-01")
+        config._APPS_POR_DEVICE["L400-01"]["verificado_em"] = 0
+        adb.shell.reset_mock()
+
+        # Act
+        config.discover_target_app("L400-01")
+
+        # Assert
+        comandos = [c.args[1] for c in adb.shell.call_args_list]
+        assert len(comandos) == 1 and "dumpsys" in comandos[0]
+
+    @patch('builtins.print')
+    def test_app_reinstalado_refaz_deteccao(self, mock_print, cache_apps, adb):
+        """
+        Data de instalação diferente da do cache: detecta o app de novo.
+        """
+        import config
+
+        # Arrange
+        config.discover_target_app("L400-01")
+        config._APPS_POR_DEVICE["L400-01"].update(verificado_em=0, instalado_em="2025-12-01 08:00:00")
+        adb.shell.reset_mock()
+
+        # Act
+        config.discover_target_app("L400-01")
+
+        # Assert
+        comandos = [c.args[1] for c in adb.shell.call_args_list]
+        assert "pm list packages" in comandos
+
+    @patch('builtins.print')
+    def test_sem_data_de_instalacao_refaz_deteccao_apos_validade(self, mock_print, cache_apps, adb):
+        """
+        dumpsys sem resposta na gravação e na conferência: None == None não valida o cache.
+        """
+        import config
+
+        # Arrange
+        adb.shell.side_effect = lambda serial, comando, timeout=None: "" if "dumpsys" in comando else PM_LIST
+        config.discover_target_app("L400-01")
+        config._APPS_POR_DEVICE["L400-01"]["verificado_em"] = 0
+        adb.shell.reset_mock()
+
+        # Act
+        config.discover_target_app("L400-01")
+
+        # Assert
+        comandos = [c.args[1] for c in adb.shell.call_args_list]
+        assert "pm list packages" in comandos
+
+
+class TestConfigDescobertaPreguicosa:
+    """Testes para DEVICE_NAME/APP_PACKAGE resolvidos no primeiro acesso."""
+
+    @patch('builtins.print')
+    def test_descobre_no_primeiro_acesso_e_memoriza(self, mock_print, cache_apps, adb):
+        """
+        Nada é consultado até a primeira leitura; a segunda leitura não chama o adb de novo.
+        """
+        import config
+
+        # Arrange
+        adb.dispositivos.return_value = ["L400-01"]
+        with patch.dict(config._DESCOBERTA, clear=True):
+            assert adb.dispositivos.call_count == 0
+
+            # Act
+            package = config.APP_PACKAGE
+            device = config.DEVICE_NAME
+
+        # Assert
+        assert package == "com.serverinfo.bshoppdv.stone.qa"
+        assert device == "L400-01"
+        adb.dispositivos.assert_called_once()
+
+    def test_atributo_desconhecido_continua_dando_erro(self):
+        """
+        O __getattr__ do módulo só responde pelos nomes descobertos.
+        """
+        import config
+
+        # Act & Assert
+        with pytest.raises(AttributeError):
+            config.NAO_EXISTE
+
+
+class TestConfigLogAssincrono:
+    """Testes para o pipeline de log em fila (QueueHandler/QueueListener)."""
+
+    def test_arquivo_criado_so_no_primeiro_registro(self, tmp_path):
+        """
+        Configurar o log não cria arquivo; o registro chega ao arquivo pelo listener.
+        """
+        import logging
+        from config import configurar_log_assincrono
+
+        # Arrange
+        log = logging.getLogger("teste_log_assincrono")
+        log.propagate = False
+        log.setLevel(logging.INFO)
+        arquivo = tmp_path / "teste.log"
+        file_handler, listener = configurar_log_assincrono(log, arquivo)
+        criado_antes = arquivo.exists()
+
+        try:
+            # Act
+            log.debug("descartado antes da fila")
+            log.info("clicando em btn_ok")
+        finally:
+            listener.stop()
+            file_handler.close()
+            log.handlers.clear()
+
+        # Assert
+        assert criado_antes is False
+        linhas = arquivo.read_text(encoding="utf-8").splitlines()
+        assert len(linhas) == 1
+        assert json.loads(linhas[0])["nivel"] == "INFO"
+        assert json.loads(linhas[0])["msg"] == "clicando em btn_ok"
+        assert file_handler.maxBytes > 0
+
+    def test_redirecionar_antes_do_primeiro_registro(self, tmp_path):
+        """
+        Redirecionado antes do primeiro registro, o log só é criado no novo diretório.
+        """
+        import logging
+        import config
+
+        # Arrange
+        log = logging.getLogger("teste_log_redirecionado")
+        log.propagate = False
+        log.setLevel(logging.INFO)
+        original = tmp_path / "logs" / "teste.jsonl"
+        file_handler, listener = config.configurar_log_assincrono(log, original)
+
+        try:
+            with patch.object(config, 'file_handler', file_handler), \
+                    patch.object(config, 'log_listener', listener), \
+                    patch.object(config, 'log_filename', original):
+                # Act
+                config.redirecionar_log(tmp_path / "temporario")
+                log.info("registro depois do redirecionamento")
+        finally:
+            listener.stop()
+            file_handler.close()
+            log.handlers.clear()
+
+        # Assert
+        assert not original.exists()
+        assert (tmp_path / "temporario" / "teste.jsonl").exists()
+
+
+class TestConfigEventoLog:
+    """Testes para os eventos de log estruturados."""
+
+    def test_nada_e_formatado_com_nivel_desligado(self):
+        """
+        Registro filtrado pelo nível não monta o texto do evento.
+        """
+        import logging
+        from config import EventoLog, LogStyle
+
+        # Arrange
+        class NaoFormatar:
+            def __format__(self, spec):
+                raise AssertionError("evento formatado sem necessidade")
+
+        log = logging.getLogger("teste_evento_filtrado")
+        log.propagate = False
+        log.setLevel(logging.WARNING)
+        log.addHandler(logging.NullHandler())
+
+        # Act & Assert (não levanta)
+        log.info(EventoLog("clique", LogStyle.CLICK, "Clicando em {locator} {extra}", locator="btn_ok", extra=NaoFormatar()))
+
+    def test_json_com_campos_e_console_colorido(self):
+        """
+        No arquivo o evento vira campos JSON sem ANSI; no console (str) sai colorido.
+        """
+        import logging
+        from config import EventoLog, FormatadorJson, LogStyle, Cores
+
+        # Arrange
+        evento = EventoLog("clique", LogStyle.OK, "Clique em {locator} executado", locator="btn_ok", duracao=0.12345)
+        record = logging.LogRecord("appium_test", logging.INFO, __file__, 1, evento, None, None)
+
+        # Act
+        linha = FormatadorJson().format(record)
+        console = record.getMessage()
+
+        # Assert
+        dados = json.loads(linha)
+        assert dados["acao"] == "clique"
+        assert dados["locator"] == "btn_ok"
+        assert dados["duracao"] == 0.123
+        assert dados["msg"] == "Clique em 'btn_ok' executado"
+        assert "\033[" not in linha
+        assert Cores.RESET in console and console.startswith("   ")
+
+    def test_fila_nao_formata_na_thread_do_teste(self, tmp_path):
+        """
+        O QueueHandler enfileira o próprio EventoLog, sem trocar por texto.
+        """
+        import logging
+        import queue
+        from config import EventoLog, LogStyle, _QueueHandlerSemFormatacao
+
+        # Arrange
+        fila = queue.SimpleQueue()
+        handler = _QueueHandlerSemFormatacao(fila)
+        evento = EventoLog("digitar", LogStyle.DIGITAR, "Campo {locator} ← {valor}", locator="edt_cpf", valor="123")
+        record = logging.LogRecord("appium_test", logging.INFO, __file__, 1, evento, None, None)
+
+        # Act
+        handler.handle(record)
+
+        # Assert
+        assert fila.get_nowait().msg is evento
@@ -11,8 +11,8 @@ class TestConsultaPedidoPageAbrirMenuLateral:
 
     @patch('pages.consulta_pedido_page.BasePage.__init__', return_value=None)
     @patch('pages.consulta_pedido_page.logger')
-    @patch('pages.consulta_pedido_page.time')
-    def test_abrir_menu_lateral_sucesso(self, mock_time, mock_logger, mock_base_init):
+    @patch('pages.consulta_pedido_page.BasePage.aguardar_tela_estavel')
+    def test_abrir_menu_lateral_sucesso(self, mock_estavel, mock_logger, mock_base_init):
         """
         Deve encontrar e clicar no menu lateral por accessibility ID.
         """
@@ -32,8 +32,8 @@ class TestConsultaPedidoPageAbrirMenuLateral:
 
     @patch('pages.consulta_pedido_page.BasePage.__init__', return_value=None)
     @patch('pages.consulta_pedido_page.logger')
-    @patch('pages.consulta_pedido_page.time')
-    def test_abrir_menu_lateral_lanca_excecao_quando_falha(self, mock_time, mock_logger, mock_base_init):
+    @patch('pages.consulta_pedido_page.BasePage.aguardar_tela_estavel')
+    def test_abrir_menu_lateral_lanca_excecao_quando_falha(self, mock_estavel, mock_logger, mock_base_init):
         """
         Deve lançar exceção quando não encontra o menu.
         """
@@ -54,8 +54,8 @@ class TestConsultaPedidoPageGarantirFlagBuscarTodosPedidos:
 
     @patch('pages.consulta_pedido_page.BasePage.__init__', return_value=None)
     @patch('pages.consulta_pedido_page.logger')
-    @patch('pages.consulta_pedido_page.time')
-    def test_garantir_flag_ativa_switch_quando_desativado(self, mock_time, mock_logger, mock_base_init):
+    @patch('pages.consulta_pedido_page.BasePage.aguardar_tela_estavel')
+    def test_garantir_flag_ativa_switch_quando_desativado(self, mock_estavel, mock_logger, mock_base_init):
         """
         Quando o switch está desativado (checked=false),
         deve clicar para ativar.
@@ -87,8 +87,8 @@ class TestConsultaPedidoPageGarantirFlagBuscarTodosPedidos:
 
     @patch('pages.consulta_pedido_page.BasePage.__init__', return_value=None)
     @patch('pages.consulta_pedido_page.logger')
-    @patch('pages.consulta_pedido_page.time')
-    def test_garantir_flag_nao_clica_quando_ja_ativado(self, mock_time, mock_logger, mock_base_init):
+    @patch('pages.consulta_pedido_page.BasePage.aguardar_tela_estavel')
+    def test_garantir_flag_nao_clica_quando_ja_ativado(self, mock_estavel, mock_logger, mock_base_init):
         """
         Quando o switch já está ativado (checked=true),
         não deve clicar.
@@ -124,8 +124,8 @@ class TestConsultaPedidoPageSelecionarPrimeiroPedido:
 
     @patch('pages.consulta_pedido_page.BasePage.__init__', return_value=None)
     @patch('pages.consulta_pedido_page.logger')
-    @patch('pages.consulta_pedido_page.time')
-    def test_selecionar_primeiro_pedido_quando_lista_tem_elementos(self, mock_time, mock_logger, mock_base_init):
+    @patch('pages.consulta_pedido_page.BasePage.aguardar_tela_estavel')
+    def test_selecionar_primeiro_pedido_quando_lista_tem_elementos(self, mock_estavel, mock_logger, mock_base_init):
         """
         Quando há pedidos na lista, deve clicar no primeiro.
         """
@@ -148,8 +148,8 @@ class TestConsultaPedidoPageSelecionarPrimeiroPedido:
 
     @patch('pages.consulta_pedido_page.BasePage.__init__', return_value=None)
     @patch('pages.consulta_pedido_page.logger')
-    @patch('pages.consulta_pedido_page.time')
-    def test_selecionar_primeiro_pedido_retorna_false_quando_lista_vazia(self, mock_time, mock_logger, mock_base_init):
+    @patch('pages.consulta_pedido_page.BasePage.aguardar_tela_estavel')
+    def test_selecionar_primeiro_pedido_retorna_false_quando_lista_vazia(self, mock_estavel, mock_logger, mock_base_init):
         """
         Quando não há pedidos na lista, deve retornar False.
         """
@@ -173,43 +173,45 @@ class TestConsultaPedidoPageTratarPopupBonus:
 
     @patch('pages.consulta_pedido_page.BasePage.__init__', return_value=None)
     @patch('pages.consulta_pedido_page.logger')
-    @patch('pages.consulta_pedido_page.time')
-    def test_tratar_popup_bonus_clica_quando_existe(self, mock_time, mock_logger, mock_base_init):
+    def test_tratar_popup_bonus_usa_registro_de_interrupcoes(self, mock_logger, mock_base_init):
         """
-        Quando o popup de bônus existe, deve clicar em 'Mais tarde'.
+        O popup de bônus é dispensado pelo registro de interrupções.
         """
         from pages.consulta_pedido_page import ConsultaPedidoPage
+        from pages.interrupcoes import BONUS
 
         # Arrange
         page = ConsultaPedidoPage.__new__(ConsultaPedidoPage)
         page.driver = MagicMock()
-        page.clicar_se_existir = MagicMock(return_value=True)
+        page.tratar_interrupcoes = MagicMock(return_value=["bonus"])
 
         # Act
         page.tratar_popup_bonus()
 
         # Assert
-        page.clicar_se_existir.assert_called_once_with(ConsultaPedidoPage.BTN_MAIS_TARDE, tempo_espera=3)
+        page.tratar_interrupcoes.assert_called_once_with(BONUS)
 
     @patch('pages.consulta_pedido_page.BasePage.__init__', return_value=None)
     @patch('pages.consulta_pedido_page.logger')
-    @patch('pages.consulta_pedido_page.time')
-    def test_tratar_popup_bonus_ignora_quando_nao_existe(self, mock_time, mock_logger, mock_base_init):
+    def test_tratar_popup_bonus_nao_espera_pelo_popup(self, mock_logger, mock_base_init):
         """
-        Quando o popup de bônus não existe, deve ignorar.
+        Sem popup na tela, não faz nenhuma espera por texto ou botão.
         """
         from pages.consulta_pedido_page import ConsultaPedidoPage
 
         # Arrange
         page = ConsultaPedidoPage.__new__(ConsultaPedidoPage)
         page.driver = MagicMock()
-        page.clicar_se_existir = MagicMock(return_value=False)
+        page.tratar_interrupcoes = MagicMock(return_value=[])
+        page.texto_exibido = MagicMock()
+        page.clicar_se_existir = MagicMock()
 
-        # Act - não deve lançar exceção
+        # Act
         page.tratar_popup_bonus()
 
         # Assert
-        page.clicar_se_existir.assert_called_once()
+        page.texto_exibido.assert_not_called()
+        page.clicar_se_existir.assert_not_called()
 
 
 class TestConsultaPedidoPageResponderImpressao:
@@ -217,8 +219,8 @@ class TestConsultaPedidoPageResponderImpressao:
 
     @patch('pages.consulta_pedido_page.BasePage.__init__', return_value=None)
     @patch('pages.consulta_pedido_page.logger')
-    @patch('pages.consulta_pedido_page.time')
-    def test_responder_impressao_clica_nao(self, mock_time, mock_logger, mock_base_init):
+    @patch('pages.consulta_pedido_page.BasePage.aguardar_tela_estavel')
+    def test_responder_impressao_clica_nao(self, mock_estavel, mock_logger, mock_base_init):
         """
         Deve clicar em NÃO no diálogo de impressão.
         """
@@ -227,13 +229,15 @@ class TestConsultaPedidoPageResponderImpressao:
         # Arrange
         page = ConsultaPedidoPage.__new__(ConsultaPedidoPage)
         page.driver = MagicMock()
-        page.clicar_se_existir = MagicMock()
+        page.passo_opcional = MagicMock(return_value=True)
 
         # Act
         page.responder_impressao(imprimir=False)
 
         # Assert
-        page.clicar_se_existir.assert_called_once_with(ConsultaPedidoPage.BTN_IMPRIMIR_NAO, tempo_espera=20)
+        botao, proxima = page.passo_opcional.call_args.args
+        assert botao == ConsultaPedidoPage.BTN_IMPRIMIR_NAO
+        assert ConsultaPedidoPage.TXT_VENDA_REALIZADA in proxima[1]
 
 
 class TestConsultaPedidoPageValidacoes:
@@ -284,8 +288,8 @@ class TestConsultaPedidoPageFluxoCompleto:
 
     @patch('pages.consulta_pedido_page.BasePage.__init__', return_value=None)
     @patch('pages.consulta_pedido_page.logger')
-    @patch('pages.consulta_pedido_page.time')
-    def test_executar_consulta_e_finalizar_pedido_chama_metodos_na_ordem(self, mock_time, mock_logger, mock_base_init):
+    @patch('pages.consulta_pedido_page.BasePage.aguardar_tela_estavel')
+    def test_executar_consulta_e_finalizar_pedido_chama_metodos_na_ordem(self, mock_estavel, mock_logger, mock_base_init):
         """
         Deve chamar todos os métodos do fluxo na ordem correta.
         """
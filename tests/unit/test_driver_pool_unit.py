@@ -0,0 +1,169 @@
+"""
+Testes unitários para o pool de sessões Appium (driver_pool.py).
+Utiliza mocks para evitar interação real com Appium/emulador.
+"""
+import pytest
+from unittest.mock import MagicMock
+from selenium.common.exceptions import InvalidSessionIdException
+
+
+URL = "http://127.0.0.1:4723"
+
+
+def _novo_driver():
+    drv = MagicMock()
+    drv.capabilities = {'appPackage': 'com.test.app'}
+    return drv
+
+
+@pytest.fixture
+def estatisticas():
+    from driver_pool import ESTATISTICAS_POOL
+
+    original = dict(ESTATISTICAS_POOL)
+    ESTATISTICAS_POOL.update(criadas=0, reaproveitadas=0, recriadas_apos_falha=0, tempo_criacao=0.0, tempo_reset=0.0)
+    yield ESTATISTICAS_POOL
+    ESTATISTICAS_POOL.update(original)
+
+
+class TestPoolDeSessoes:
+    """Testes para reaproveitamento e recriação das sessões."""
+
+    def test_reaproveita_sessao_e_reinicia_app(self, estatisticas):
+        """
+        O segundo teste no mesmo device usa a mesma sessão, com terminate/activate do app.
+        """
+        from driver_pool import PoolDeSessoes
+
+        # Arrange
+        criar = MagicMock(side_effect=lambda *args: _novo_driver())
+        pool = PoolDeSessoes(criar)
+
+        # Act
+        primeiro = pool.obter(URL, "L400-01")
+        segundo = pool.obter(URL, "L400-01")
+
+        # Assert
+        assert segundo is primeiro
+        assert criar.call_count == 1
+        primeiro.terminate_app.assert_called_once_with('com.test.app')
+        primeiro.activate_app.assert_called_once_with('com.test.app')
+        assert estatisticas['reaproveitadas'] == 1
+
+    def test_sessao_caida_e_recriada(self, estatisticas):
+        """
+        Se o reset falha (UiAutomator2 caiu), a sessão é descartada e outra é criada.
+        """
+        from driver_pool import PoolDeSessoes
+
+        # Arrange
+        criar = MagicMock(side_effect=lambda *args: _novo_driver())
+        pool = PoolDeSessoes(criar)
+        caida = pool.obter(URL, "L400-01")
+        caida.terminate_app.side_effect = InvalidSessionIdException("session is either terminated or not started")
+
+        # Act
+        nova = pool.obter(URL, "L400-01")
+
+        # Assert
+        assert nova is not caida
+        caida.quit.assert_called_once()
+        assert estatisticas['recriadas_apos_falha'] == 1
+
+    def test_dados_limpos_exigem_sessao_nova(self, estatisticas):
+        """
+        limpar_dados só tem efeito na criação: o pool cria uma sessão nova.
+        """
+        from driver_pool import PoolDeSessoes
+
+        # Arrange
+        criar = MagicMock(side_effect=lambda *args: _novo_driver())
+        pool = PoolDeSessoes(criar)
+        antiga = pool.obter(URL, "L400-01")
+
+        # Act
+        nova = pool.obter(URL, "L400-01", limpar_dados=True)
+
+        # Assert
+        assert nova is not antiga
+        criar.assert_called_with(URL, "L400-01", True)
+        antiga.quit.assert_called_once()
+
+    def test_uma_sessao_por_device_e_encerramento(self, estatisticas):
+        """
+        Devices diferentes têm sessões próprias; encerrar() fecha todas.
+        """
+        from driver_pool import PoolDeSessoes
+
+        # Arrange
+        pool = PoolDeSessoes(MagicMock(side_effect=lambda *args: _novo_driver()))
+        a = pool.obter(URL, "L400-01")
+        b = pool.obter("http://127.0.0.1:4724", "N960-02")
+
+        # Act
+        pool.encerrar()
+
+        # Assert
+        assert a is not b
+        a.quit.assert_called_once()
+        b.quit.assert_called_once()
+
+    def test_economia_estimada(self, estatisticas):
+        """
+        Economia = criações evitadas pelo tempo médio de criação, menos o tempo de reset.
+        """
+        from driver_pool import economia_estimada
+
+        # Arrange
+        estatisticas.update(criadas=1, tempo_criacao=20.0, reaproveitadas=11, tempo_reset=22.0)
+
+        # Act & Assert
+        assert economia_estimada() == pytest.approx(11 * 20.0 - 22.0)
+
+
+class TestPoolDeSessoesAutenticacao:
+    """Testes para o estado de login lembrado por sessão."""
+
+    def test_marca_de_login_vale_so_para_a_mesma_sessao(self, estatisticas):
+        """
+        Sessão recriada (queda ou dados limpos) não herda a marca de login da anterior.
+        """
+        from driver_pool import PoolDeSessoes
+
+        # Arrange
+        contador = iter(range(100))
+
+        def criar(*args):
+            drv = _novo_driver()
+            drv.session_id = f"sessao-{next(contador)}"
+            return drv
+
+        pool = PoolDeSessoes(criar)
+        antiga = pool.obter(URL, "L400-01")
+        pool.marcar_autenticada(antiga)
+
+        # Act
+        reaproveitada = pool.obter(URL, "L400-01")
+        autenticada_ao_reaproveitar = pool.autenticada(reaproveitada)
+        nova = pool.obter(URL, "L400-01", limpar_dados=True)
+
+        # Assert
+        assert autenticada_ao_reaproveitar is True
+        assert pool.autenticada(nova) is False
+
+    def test_falha_no_teste_esquece_o_login(self, estatisticas):
+        """
+        marcar_autenticada(False) faz o próximo teste conferir o login de novo.
+        """
+        from driver_pool import PoolDeSessoes
+
+        # Arrange
+        pool = PoolDeSessoes(MagicMock(side_effect=lambda *args: _novo_driver()))
+        drv = pool.obter(URL, "L400-01")
+        pool.marcar_autenticada(drv)
+
+        # Act
+        pool.marcar_autenticada(drv, False)
+
+        # Assert
+        assert pool.autenticada(drv) is False
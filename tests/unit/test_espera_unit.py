@@ -0,0 +1,76 @@
+"""
+Testes unitários para a espera adaptativa (pages/espera.py).
+Utiliza mocks para evitar interação real com Appium/emulador.
+"""
+import itertools
+
+import pytest
+from unittest.mock import MagicMock, patch
+from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.webdriver.support import expected_conditions as EC
+
+
+class TestEsperaIntervalos:
+    """Testes para o cronograma de consultas."""
+
+    def test_consultas_rapidas_e_depois_backoff_ate_o_teto(self):
+        """
+        Primeiras consultas no intervalo inicial, depois dobrando até o máximo.
+        """
+        from pages.espera import intervalos
+
+        # Act
+        pausas = list(itertools.islice(intervalos(0.05, 3, 2.0, 1.0), 10))
+
+        # Assert
+        assert pausas == [0.05, 0.05, 0.05, 0.1, 0.2, 0.4, 0.8, 1.0, 1.0, 1.0]
+
+
+class TestEsperaAdaptativa:
+    """Testes para EsperaAdaptativa (drop-in do WebDriverWait)."""
+
+    @patch.dict('pages.espera.ESTATISTICAS_ESPERAS', clear=True)
+    @patch('pages.espera.time')
+    def test_elemento_rapido_detectado_no_intervalo_inicial(self, mock_time):
+        """
+        Elemento que aparece na 2ª consulta: uma única pausa de 50ms (não 500ms).
+        """
+        from pages.espera import EsperaAdaptativa, ESTATISTICAS_ESPERAS
+
+        # Arrange
+        driver = MagicMock()
+        elemento = MagicMock()
+        driver.find_element.side_effect = [NoSuchElementException("ainda nao"), elemento]
+        mock_time.monotonic.return_value = 0
+
+        # Act
+        resultado = EsperaAdaptativa(driver, 30).until(EC.presence_of_element_located(("id", "btn_ok")))
+
+        # Assert
+        assert resultado is elemento
+        mock_time.sleep.assert_called_once_with(0.05)
+        assert ESTATISTICAS_ESPERAS["presence_of_element_located"] == [
+            {'alvo': "btn_ok", 'consultas': 2, 'tempo': 0, 'sucesso': True}
+        ]
+
+    @patch.dict('pages.espera.ESTATISTICAS_ESPERAS', clear=True)
+    @patch('pages.espera.time')
+    def test_espera_longa_faz_poucas_consultas_e_respeita_prazo(self, mock_time):
+        """
+        Espera de 30s sem o elemento: poucas consultas e a última pausa não passa do prazo.
+        """
+        from pages.espera import EsperaAdaptativa, ESTATISTICAS_ESPERAS
+
+        # Arrange
+        driver = MagicMock()
+        driver.find_element.side_effect = NoSuchElementException("nao existe")
+        relogio = [0.0]
+        mock_time.monotonic.side_effect = lambda: relogio[0]
+        mock_time.sleep.side_effect = lambda segundos: relogio.__setitem__(0, relogio[0] + segundos)
+
+        # Act & Assert
+        with pytest.raises(TimeoutException):
+            EsperaAdaptativa(driver, 30).until(EC.presence_of_element_located(("id", "btn_ok")))
+        assert relogio[0] == pytest.approx(30)
+        assert driver.find_element.call_count < 40
+        assert ESTATISTICAS_ESPERAS["presence_of_element_located"][0]['sucesso'] is False
@@ -0,0 +1,101 @@
+"""
+Testes unitários para os gestos de scroll (pages/gestos.py).
+Utiliza mocks para evitar interação real com Appium/emulador.
+"""
+from unittest.mock import MagicMock, patch
+from selenium.common.exceptions import WebDriverException
+
+
+class TestGestosRegiao:
+    """Testes para o cálculo das regiões de scroll."""
+
+    def test_regiao_da_faixa_padrao(self):
+        """
+        Faixa 20%-80% da altura, com 10% de margem lateral.
+        """
+        from pages.gestos import regiao_scroll
+
+        # Act
+        regiao = regiao_scroll({'width': 720, 'height': 1280})
+
+        # Assert
+        assert regiao == {'left': 72, 'top': 256, 'width': 576, 'height': 768}
+
+    def test_tamanho_da_sessao_busca_uma_vez(self):
+        """
+        O tamanho da tela é buscado uma única vez por sessão.
+        """
+        from pages.gestos import tamanho_da_sessao
+
+        # Arrange
+        driver = MagicMock()
+        driver.session_id = "sessao-gestos"
+        driver.get_window_size.return_value = {'width': 720, 'height': 1280, 'x': 0, 'y': 0}
+
+        # Act
+        tamanho_da_sessao(driver)
+        tamanho = tamanho_da_sessao(driver)
+
+        # Assert
+        assert tamanho == {'width': 720, 'height': 1280}
+        driver.get_window_size.assert_called_once()
+
+
+class TestGestosRolar:
+    """Testes para o backend de scroll."""
+
+    def test_backend_nativo_usa_scroll_gesture(self):
+        """
+        Um único mobile: scrollGesture, devolvendo se ainda dá para rolar.
+        """
+        from pages.gestos import rolar
+
+        # Arrange
+        driver = MagicMock()
+        driver.execute_script.return_value = False
+        regiao = {'left': 72, 'top': 256, 'width': 576, 'height': 768}
+
+        # Act
+        pode_rolar = rolar(driver, regiao, percentual=0.5)
+
+        # Assert
+        assert pode_rolar is False
+        driver.execute_script.assert_called_once_with('mobile: scrollGesture', {
+            'left': 72, 'top': 256, 'width': 576, 'height': 768, 'direction': 'down', 'percent': 0.5,
+        })
+
+    @patch('pages.gestos.logger')
+    @patch('pages.gestos.arrastar_w3c')
+    def test_fallback_w3c_quando_gesto_nativo_indisponivel(self, mock_arrastar, mock_logger):
+        """
+        Servidor sem o comando nativo: faz o arrasto W3C equivalente.
+        """
+        from pages.gestos import rolar
+
+        # Arrange
+        driver = MagicMock()
+        driver.execute_script.side_effect = WebDriverException("Unknown mobile command")
+        regiao = {'left': 72, 'top': 256, 'width': 576, 'height': 768}
+
+        # Act
+        pode_rolar = rolar(driver, regiao, percentual=0.5)
+
+        # Assert
+        assert pode_rolar is None
+        mock_arrastar.assert_called_once_with(driver, 360, 1024, 1024 - 384)
+
+    def test_swipe_usa_direcao_do_dedo(self):
+        """
+        swipeGesture recebe a direção do dedo: conteúdo para baixo = dedo para cima.
+        """
+        from pages.gestos import swipe
+
+        # Arrange
+        driver = MagicMock()
+        regiao = {'left': 0, 'top': 0, 'width': 100, 'height': 100}
+
+        # Act
+        swipe(driver, regiao, direcao='down')
+
+        # Assert
+        assert driver.execute_script.call_args[0][1]['direction'] == 'up'
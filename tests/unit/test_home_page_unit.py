@@ -4,15 +4,17 @@ Utiliza mocks para evitar interação real com Appium/emulador.
 """
 import pytest
 from unittest.mock import MagicMock, patch
+from selenium.common.exceptions import TimeoutException
 
 
 class TestHomePageIniciarVenda:
     """Testes para o método iniciar_venda."""
 
+    @patch('pages.home_page.BasePage.aguardar_tela_estavel')
     @patch('pages.home_page.BasePage.__init__', return_value=None)
     @patch('pages.home_page.logger')
     @patch('pages.home_page.time')
-    def test_iniciar_venda_quando_iniciar_venda_visivel(self, mock_time, mock_logger, mock_base_init):
+    def test_iniciar_venda_quando_iniciar_venda_visivel(self, mock_time, mock_logger, mock_base_init, mock_estavel):
         """
         Quando o texto 'Iniciar Venda' está visível,
         deve clicar nele e retornar (versão device).
@@ -22,7 +24,7 @@ class TestHomePageIniciarVenda:
         # Arrange
         home_page = HomePage.__new__(HomePage)
         home_page.driver = MagicMock()
-        home_page.texto_exibido = MagicMock(side_effect=lambda texto, tempo_espera: texto == "Iniciar Venda")
+        home_page.aguardar_primeiro = MagicMock(return_value=("device", MagicMock()))
         home_page.clicar_por_texto = MagicMock()
         home_page.rolar_ate_texto = MagicMock()
 
@@ -32,10 +34,11 @@ class TestHomePageIniciarVenda:
         # Assert
         home_page.clicar_por_texto.assert_called_once_with(HomePage.TXT_INICIAR_VENDA)
 
+    @patch('pages.home_page.BasePage.aguardar_tela_estavel')
     @patch('pages.home_page.BasePage.__init__', return_value=None)
     @patch('pages.home_page.logger')
     @patch('pages.home_page.time')
-    def test_iniciar_venda_quando_venda_visivel(self, mock_time, mock_logger, mock_base_init):
+    def test_iniciar_venda_quando_venda_visivel(self, mock_time, mock_logger, mock_base_init, mock_estavel):
         """
         Quando 'Iniciar Venda' não existe mas 'Venda' está visível,
         deve clicar em 'Venda' (versão Playstore).
@@ -45,11 +48,7 @@ class TestHomePageIniciarVenda:
         # Arrange
         home_page = HomePage.__new__(HomePage)
         home_page.driver = MagicMock()
-
-        def texto_exibido_mock(texto, tempo_espera):
-            return texto == "Venda"
-
-        home_page.texto_exibido = MagicMock(side_effect=texto_exibido_mock)
+        home_page.aguardar_primeiro = MagicMock(return_value=("playstore", MagicMock()))
         home_page.clicar_por_texto = MagicMock()
         home_page.rolar_ate_texto = MagicMock()
 
@@ -59,10 +58,11 @@ class TestHomePageIniciarVenda:
         # Assert
         home_page.clicar_por_texto.assert_called_once_with(HomePage.TXT_VENDA)
 
+    @patch('pages.home_page.BasePage.aguardar_tela_estavel')
     @patch('pages.home_page.BasePage.__init__', return_value=None)
     @patch('pages.home_page.logger')
     @patch('pages.home_page.time')
-    def test_iniciar_venda_usa_scroll_quando_nao_encontra(self, mock_time, mock_logger, mock_base_init):
+    def test_iniciar_venda_usa_scroll_quando_nao_encontra(self, mock_time, mock_logger, mock_base_init, mock_estavel):
         """
         Quando nenhum texto visível diretamente, usa scroll para encontrar.
         """
@@ -71,7 +71,7 @@ class TestHomePageIniciarVenda:
         # Arrange
         home_page = HomePage.__new__(HomePage)
         home_page.driver = MagicMock()
-        home_page.texto_exibido = MagicMock(return_value=False)
+        home_page.aguardar_primeiro = MagicMock(side_effect=TimeoutException("nenhuma"))
         home_page.clicar_por_texto = MagicMock()
         home_page.rolar_ate_texto = MagicMock()
 
@@ -81,10 +81,11 @@ class TestHomePageIniciarVenda:
         # Assert - deve tentar scroll
         home_page.rolar_ate_texto.assert_called()
 
+    @patch('pages.home_page.BasePage.aguardar_tela_estavel')
     @patch('pages.home_page.BasePage.__init__', return_value=None)
     @patch('pages.home_page.logger')
     @patch('pages.home_page.time')
-    def test_iniciar_venda_lanca_excecao_quando_nenhum_botao_encontrado(self, mock_time, mock_logger, mock_base_init):
+    def test_iniciar_venda_lanca_excecao_quando_nenhum_botao_encontrado(self, mock_time, mock_logger, mock_base_init, mock_estavel):
         """
         Quando nenhum botão de venda é encontrado,
         deve lançar exceção.
@@ -94,7 +95,7 @@ class TestHomePageIniciarVenda:
         # Arrange
         home_page = HomePage.__new__(HomePage)
         home_page.driver = MagicMock()
-        home_page.texto_exibido = MagicMock(return_value=False)
+        home_page.aguardar_primeiro = MagicMock(side_effect=TimeoutException("nenhuma"))
         home_page.clicar_por_texto = MagicMock()
         home_page.rolar_ate_texto = MagicMock(side_effect=Exception("Não encontrou"))
 
@@ -106,10 +107,11 @@ class TestHomePageIniciarVenda:
 class TestHomePageIniciarTroca:
     """Testes para o método iniciar_troca."""
 
+    @patch('pages.home_page.BasePage.aguardar_tela_estavel')
     @patch('pages.home_page.BasePage.__init__', return_value=None)
     @patch('pages.home_page.logger')
     @patch('pages.home_page.time')
-    def test_iniciar_troca_rola_e_clica(self, mock_time, mock_logger, mock_base_init):
+    def test_iniciar_troca_rola_e_clica(self, mock_time, mock_logger, mock_base_init, mock_estavel):
         """
         Deve rolar até encontrar 'Realizar Troca' e clicar.
         """
@@ -132,10 +134,11 @@ class TestHomePageIniciarTroca:
 class TestHomePageSelecionarVendedor:
     """Testes para o método selecionar_vendedor."""
 
+    @patch('pages.home_page.BasePage.aguardar_tela_estavel')
     @patch('pages.home_page.BasePage.__init__', return_value=None)
     @patch('pages.home_page.logger')
     @patch('pages.home_page.time')
-    def test_selecionar_vendedor_tela_full_screen(self, mock_time, mock_logger, mock_base_init):
+    def test_selecionar_vendedor_tela_full_screen(self, mock_time, mock_logger, mock_base_init, mock_estavel):
         """
         Quando a tela 'Escolher Vendedor' está visível,
         deve clicar no primeiro vendedor da lista.
@@ -156,10 +159,11 @@ class TestHomePageSelecionarVendedor:
         # Assert
         home_page.clicar_no_primeiro_da_lista_por_id.assert_called_once_with(HomePage.DIALOGO_VENDEDOR)
 
+    @patch('pages.home_page.BasePage.aguardar_tela_estavel')
     @patch('pages.home_page.BasePage.__init__', return_value=None)
     @patch('pages.home_page.logger')
     @patch('pages.home_page.time')
-    def test_selecionar_vendedor_dialogo_popup(self, mock_time, mock_logger, mock_base_init):
+    def test_selecionar_vendedor_dialogo_popup(self, mock_time, mock_logger, mock_base_init, mock_estavel):
         """
         Quando apenas o diálogo popup de vendedor aparece,
         deve clicar por ID.
@@ -180,10 +184,11 @@ class TestHomePageSelecionarVendedor:
         # Assert
         home_page.clicar_por_id.assert_called_once_with(HomePage.DIALOGO_VENDEDOR)
 
+    @patch('pages.home_page.BasePage.aguardar_tela_estavel')
     @patch('pages.home_page.BasePage.__init__', return_value=None)
     @patch('pages.home_page.logger')
     @patch('pages.home_page.time')
-    def test_selecionar_vendedor_nenhuma_tela_detectada(self, mock_time, mock_logger, mock_base_init):
+    def test_selecionar_vendedor_nenhuma_tela_detectada(self, mock_time, mock_logger, mock_base_init, mock_estavel):
         """
         Quando nenhuma tela de vendedor aparece,
         deve simplesmente retornar (versão pode não exigir).
@@ -370,3 +370,160 @@ class TestLocatorsConsistencia:
                         if isinstance(valor, str):
                             assert ' ' not in valor, \
                                 f"{page.__name__}.{attr_name} contem espacos: '{valor}'"
+
+
+# =============================================================================
+# TESTES DO COMPILADOR XPATH -> UISELECTOR (pages/locators.py)
+# =============================================================================
+
+class TestLocatorsCompiladosXPath:
+    """Valida a tradução dos XPaths usados nas pages para UiSelector."""
+
+    def test_resource_id_com_descendente_vira_child_selector(self):
+        """XPath do campo de data da troca vira resourceId().childSelector()."""
+        from pages.locators import compilar_xpath
+        from appium.webdriver.common.appiumby import AppiumBy
+
+        xpath = "//*[@resource-id='com.test.app:id/textInputLayout4']//android.widget.EditText"
+
+        assert compilar_xpath(xpath) == (
+            AppiumBy.ANDROID_UIAUTOMATOR,
+            'new UiSelector().resourceId("com.test.app:id/textInputLayout4")'
+            '.childSelector(new UiSelector().className("android.widget.EditText"))'
+        )
+
+    @pytest.mark.parametrize("xpath, esperado", [
+        ("//*[@text='Imprimir']", 'new UiSelector().text("Imprimir")'),
+        ("//*[contains(@text,'Venda')]", 'new UiSelector().textContains("Venda")'),
+        ("//android.widget.Button[@text='OK']", 'new UiSelector().className("android.widget.Button").text("OK")'),
+        ("//*[@text='Imprimir']/..//*[@resource-id='android:id/switch_widget']",
+         'new UiSelector().text("Imprimir").fromParent(new UiSelector().resourceId("android:id/switch_widget"))'),
+    ])
+    def test_formatos_suportados(self, xpath, esperado):
+        """Formatos comuns das pages/framework são traduzidos."""
+        from pages.locators import xpath_para_uiselector
+
+        assert xpath_para_uiselector(xpath) == esperado
+
+    @pytest.mark.parametrize("xpath", [
+        "//*[@text='Imprimir']/../..//*[@resource-id='android:id/switch_widget']",
+        "//*[@text='Imprimir']/..",
+        "(//*[@text='OK'])[2]",
+        "//*[@index='1']",
+    ])
+    def test_formatos_nao_suportados_continuam_xpath(self, xpath):
+        """Formatos sem equivalente em UiSelector ficam como XPath."""
+        from pages.locators import compilar_xpath
+        from appium.webdriver.common.appiumby import AppiumBy
+
+        assert compilar_xpath(xpath) == (AppiumBy.XPATH, xpath)
+
+    def test_aguardar_por_xpath_usa_xpath_quando_uiselector_nao_acha(self):
+        """Se o UiSelector não encontra nada, o XPath original é consultado antes do timeout."""
+        from unittest.mock import MagicMock
+        from pages.locators import aguardar_por_xpath
+        from appium.webdriver.common.appiumby import AppiumBy
+
+        driver = MagicMock()
+        elemento = MagicMock()
+        driver.find_elements.side_effect = lambda by, valor: [elemento] if by == AppiumBy.XPATH else []
+
+        resultado = aguardar_por_xpath(driver, "//*[@text='Imprimir']", timeout=0.1)
+
+        assert resultado is elemento
+        driver.find_elements.assert_called_with(AppiumBy.XPATH, "//*[@text='Imprimir']")
+
+    def test_aguardar_por_xpath_nao_esgota_o_timeout_no_uiselector(self):
+        """XPath acha e UiSelector não: retorna logo após o orçamento do UiSelector, não no timeout."""
+        import time
+        from unittest.mock import MagicMock, patch
+        from pages.locators import aguardar_por_xpath
+        from appium.webdriver.common.appiumby import AppiumBy
+
+        driver = MagicMock()
+        elemento = MagicMock()
+        driver.find_elements.side_effect = lambda by, valor: [elemento] if by == AppiumBy.XPATH else []
+
+        inicio = time.monotonic()
+        with patch('pages.locators.ORCAMENTO_UISELECTOR', 0.1):
+            resultado = aguardar_por_xpath(driver, "//*[@text='Imprimir']", timeout=30)
+        decorrido = time.monotonic() - inicio
+
+        assert resultado is elemento
+        assert decorrido < 1.0
+
+    def test_aguardar_por_xpath_so_consulta_uiselector_dentro_do_orcamento(self):
+        """UiSelector que acha logo: o XPath (hierarquia inteira) nunca é consultado."""
+        from unittest.mock import MagicMock
+        from pages.locators import aguardar_por_xpath
+        from appium.webdriver.common.appiumby import AppiumBy
+
+        driver = MagicMock()
+        elemento = MagicMock()
+        driver.find_elements.return_value = [elemento]
+
+        resultado = aguardar_por_xpath(driver, "//*[@text='Imprimir']", timeout=5)
+
+        assert resultado is elemento
+        driver.find_elements.assert_called_once_with(AppiumBy.ANDROID_UIAUTOMATOR, 'new UiSelector().text("Imprimir")')
+
+
+class TestLocatorsPreferenciaPorDevice:
+    """Valida a escolha e o armazenamento da estratégia mais rápida por modelo."""
+
+    @pytest.mark.parametrize("valor, tipo", [
+        ("btn_proceed", "id"),
+        ("btnFinalizar", "id"),
+        ("android:id/button1", "id"),
+        ("Venda", "texto"),
+        ("INICIAR VENDA", "texto"),
+    ])
+    def test_tipo_locator(self, valor, tipo):
+        """IDs e textos das pages são classificados pelo formato do valor."""
+        from pages.locators import tipo_locator
+
+        assert tipo_locator(valor) == tipo
+
+    def test_escolhe_estrategia_mais_rapida_entre_equivalentes(self):
+        """A mais rápida vence quando todas acham os mesmos elementos."""
+        from pages.locators import escolher_preferida
+
+        estrategias = {
+            'id': {'media_ms': 80.0, 'encontrados': 1},
+            'uiselector': {'media_ms': 45.0, 'encontrados': 1},
+            'xpath': {'media_ms': 300.0, 'encontrados': 1},
+        }
+
+        assert escolher_preferida(estrategias) == 'uiselector'
+
+    def test_nao_escolhe_quando_estrategias_divergem(self):
+        """Se as estratégias acham quantidades diferentes, não são equivalentes."""
+        from pages.locators import escolher_preferida
+
+        estrategias = {
+            'uiselector': {'media_ms': 45.0, 'encontrados': 2},
+            'xpath': {'media_ms': 300.0, 'encontrados': 1},
+        }
+
+        assert escolher_preferida(estrategias) is None
+
+    def test_resultado_de_hierarquia_nao_sobrescreve_sessao(self, tmp_path, monkeypatch):
+        """Medição sobre XML gravado não troca a preferência medida no device."""
+        import pages.locators as locators
+        monkeypatch.setattr(locators, 'BENCHMARK_DIR', tmp_path)
+
+        locators.salvar_resultados("L400", {
+            "id:btn_ok": {'id': {'media_ms': 90.0, 'encontrados': 1},
+                          'uiselector': {'media_ms': 40.0, 'encontrados': 1}},
+        }, origem="sessao")
+        locators.salvar_resultados("L400", {
+            "id:btn_ok": {'id': {'media_ms': 0.1, 'encontrados': 1},
+                          'uiselector': {'media_ms': 0.2, 'encontrados': 1}},
+            "texto:Venda": {'uiselector': {'media_ms': 0.1, 'encontrados': 1},
+                            'xpath': {'media_ms': 0.5, 'encontrados': 1}},
+        }, origem="hierarquia")
+
+        assert locators.preferencias_do_modelo("L400") == {
+            "id:btn_ok": "uiselector",
+            "texto:Venda": "uiselector",
+        }
@@ -24,7 +24,7 @@ class TestLoginPageConfigurarConexao:
 
         # Mock dos métodos herdados de BasePage
         login_page.clicar_se_existir = MagicMock(return_value=True)
-        login_page.digitar_por_id = MagicMock()
+        login_page.preencher_formulario = MagicMock()
         login_page.clicar_por_id = MagicMock()
 
         ip = "192.168.1.100"
@@ -38,8 +38,10 @@ class TestLoginPageConfigurarConexao:
         login_page.clicar_se_existir.assert_called_once_with(
             LoginPage.BTN_CONFIGURAR_CONEXAO, tempo_espera=3
         )
-        login_page.digitar_por_id.assert_any_call(LoginPage.EDT_IP_SERVIDOR, ip)
-        login_page.digitar_por_id.assert_any_call(LoginPage.EDT_GATEWAY_SERVIDOR, porta)
+        login_page.preencher_formulario.assert_called_once_with([
+            (LoginPage.EDT_IP_SERVIDOR, ip),
+            (LoginPage.EDT_GATEWAY_SERVIDOR, porta),
+        ])
         login_page.clicar_por_id.assert_called_once_with(LoginPage.BTN_SALVAR_DIALOGO)
 
     @patch('pages.login_page.BasePage.__init__', return_value=None)
@@ -57,7 +59,7 @@ class TestLoginPageConfigurarConexao:
 
         # Botão não existe
         login_page.clicar_se_existir = MagicMock(return_value=False)
-        login_page.digitar_por_id = MagicMock()
+        login_page.preencher_formulario = MagicMock()
         login_page.clicar_por_id = MagicMock()
 
         ip = "192.168.1.100"
@@ -69,7 +71,7 @@ class TestLoginPageConfigurarConexao:
         # Assert
         assert resultado is False
         login_page.clicar_se_existir.assert_called_once()
-        login_page.digitar_por_id.assert_not_called()
+        login_page.preencher_formulario.assert_not_called()
         login_page.clicar_por_id.assert_not_called()
 
 
@@ -228,6 +230,27 @@ class TestLoginPageEstaLogado:
         # Assert
         assert resultado is False
 
+    @patch('pages.login_page.BasePage.__init__', return_value=None)
+    @patch('pages.login_page.logger')
+    def test_esta_logado_com_flavor_playstore_consulta_so_venda(self, mock_logger, mock_base_init):
+        """
+        Com flavor Playstore conhecido, não deve esperar pelo texto 'Iniciar Venda'.
+        """
+        from pages.login_page import LoginPage
+
+        # Arrange
+        login_page = LoginPage.__new__(LoginPage)
+        login_page.driver = MagicMock()
+        login_page.driver.capabilities = {'appPackage': 'com.serverinfo.bshoppdv.playstore.qa'}
+        login_page.texto_exibido = MagicMock(return_value=False)
+
+        # Act
+        resultado = login_page.esta_logado(timeout=5)
+
+        # Assert
+        assert resultado is False
+        login_page.texto_exibido.assert_called_once_with("Venda", 5)
+
 
 class TestLoginPageOutrosMetodos:
     """Testes para outros métodos da LoginPage."""
@@ -264,7 +287,7 @@ class TestLoginPageOutrosMetodos:
         # Arrange
         login_page = LoginPage.__new__(LoginPage)
         login_page.driver = MagicMock()
-        login_page.digitar_por_id = MagicMock()
+        login_page.preencher_formulario = MagicMock()
         login_page.fechar_teclado = MagicMock()
 
         empresa = "EMPRESA_TESTE"
@@ -275,9 +298,11 @@ class TestLoginPageOutrosMetodos:
         login_page.preencher_credenciais(empresa, usuario, senha)
 
         # Assert
-        login_page.digitar_por_id.assert_any_call(LoginPage.EDT_EMPRESA, empresa)
-        login_page.digitar_por_id.assert_any_call(LoginPage.EDT_USUARIO, usuario)
-        login_page.digitar_por_id.assert_any_call(LoginPage.EDT_SENHA, senha)
+        login_page.preencher_formulario.assert_called_once_with([
+            (LoginPage.EDT_EMPRESA, empresa),
+            (LoginPage.EDT_USUARIO, usuario),
+            (LoginPage.EDT_SENHA, senha),
+        ])
         login_page.fechar_teclado.assert_called_once()
 
     @patch('pages.login_page.BasePage.__init__', return_value=None)
@@ -0,0 +1,170 @@
+"""
+Testes unitários para a subida dos servidores Appium (parallel_runner.py).
+Usa um servidor HTTP local de mentira respondendo ao /status do Appium -
+não precisa de Appium nem de device.
+"""
+import json
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+
+class _AppiumFalso(ThreadingHTTPServer):
+    """Servidor de mentira: GET /status responde ready=False até pronto_em, depois ready=True."""
+
+    daemon_threads = True
+
+    def __init__(self, pronto_em: float = 0.0):
+        super().__init__(("127.0.0.1", 0), _AtendimentoStatus)
+        self.pronto_em = time.monotonic() + pronto_em
+        self.consultas = 0
+
+    @property
+    def porta(self) -> int:
+        return self.server_address[1]
+
+
+class _AtendimentoStatus(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        self.server.consultas += 1
+        if self.path != "/status":
+            self.send_error(404)
+            return
+        pronto = time.monotonic() >= self.server.pronto_em
+        corpo = json.dumps({"value": {"ready": pronto, "message": "stub"}}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def appium_falso():
+    servidores = []
+
+    def _criar(pronto_em: float = 0.0) -> _AppiumFalso:
+        servidor = _AppiumFalso(pronto_em)
+        threading.Thread(target=servidor.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+        servidores.append(servidor)
+        return servidor
+
+    yield _criar
+    for servidor in servidores:
+        servidor.shutdown()
+        servidor.server_close()
+
+
+def _porta_livre() -> int:
+    import socket
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class TestServidorAppiumStatus:
+    """Testes para a prontidão pelo GET /status."""
+
+    def test_pronto_conforme_value_ready(self, appium_falso):
+        """
+        ready=True conta como pronto; ready=False e porta fechada, não.
+        """
+        from parallel_runner import servidor_appium_pronto
+
+        # Arrange
+        pronto = appium_falso()
+        subindo = appium_falso(pronto_em=60)
+
+        # Act & Assert
+        assert servidor_appium_pronto(pronto.porta) is True
+        assert servidor_appium_pronto(subindo.porta) is False
+        assert servidor_appium_pronto(_porta_livre()) is False
+
+    def test_aguardar_consulta_ate_ficar_pronto(self, appium_falso):
+        """
+        O polling rápido do /status libera assim que o servidor fica pronto.
+        """
+        from parallel_runner import aguardar_servidor_appium
+
+        # Arrange
+        servidor = appium_falso(pronto_em=0.5)
+        inicio = time.monotonic()
+
+        # Act
+        pronto = aguardar_servidor_appium(servidor.porta, timeout=5)
+
+        # Assert
+        assert pronto is True
+        assert time.monotonic() - inicio < 1.5
+        assert servidor.consultas >= 2
+
+    def test_processo_encerrado_para_de_esperar(self):
+        """
+        Se o processo do Appium morre, a espera termina sem consumir o timeout.
+        """
+        from parallel_runner import aguardar_servidor_appium
+
+        # Arrange
+        processo = MagicMock()
+        processo.poll.return_value = 1
+        inicio = time.monotonic()
+
+        # Act
+        pronto = aguardar_servidor_appium(_porta_livre(), timeout=10, processo=processo)
+
+        # Assert
+        assert pronto is False
+        assert time.monotonic() - inicio < 2
+
+
+class TestIniciarServidoresAppium:
+    """Testes para a subida concorrente e o reaproveitamento."""
+
+    @patch('builtins.print')
+    @patch('parallel_runner.subprocess.Popen')
+    def test_servidor_saudavel_e_reaproveitado(self, mock_popen, mock_print, appium_falso):
+        """
+        Um Appium já respondendo ao /status (execução anterior) não é iniciado de novo.
+        """
+        from parallel_runner import iniciar_servidor_appium, processos_appium
+
+        # Arrange
+        servidor = appium_falso()
+
+        # Act
+        pronto = iniciar_servidor_appium(servidor.porta)
+
+        # Assert
+        assert pronto is True
+        mock_popen.assert_not_called()
+        assert processos_appium == []
+
+    @patch('builtins.print')
+    def test_servidores_sobem_ao_mesmo_tempo(self, mock_print):
+        """
+        N servidores levam o tempo do mais lento, não a soma.
+        """
+        from parallel_runner import iniciar_servidores_appium
+
+        # Arrange
+        def _subir(porta, timeout):
+            time.sleep(0.4)
+            return porta != 4727
+
+        # Act
+        with patch('parallel_runner.iniciar_servidor_appium', side_effect=_subir):
+            inicio = time.monotonic()
+            prontos = iniciar_servidores_appium([4723, 4725, 4727, 4729])
+            duracao = time.monotonic() - inicio
+
+        # Assert
+        assert prontos == {4723: True, 4725: True, 4727: False, 4729: True}
+        assert duracao < 1.2
@@ -65,8 +65,8 @@ class TestPedidoPageAdicionarProduto:
 
     @patch('pages.pedido_page.BasePage.__init__', return_value=None)
     @patch('pages.pedido_page.logger')
-    @patch('pages.pedido_page.time')
-    def test_adicionar_produto_clica_digita_e_seleciona(self, mock_time, mock_logger, mock_base_init):
+    @patch('pages.pedido_page.BasePage.aguardar_tela_estavel')
+    def test_adicionar_produto_clica_digita_e_seleciona(self, mock_estavel, mock_logger, mock_base_init):
         """
         Deve clicar em adicionar produtos, digitar código e selecionar.
         """
@@ -91,8 +91,8 @@ class TestPedidoPageAdicionarProduto:
 
     @patch('pages.pedido_page.BasePage.__init__', return_value=None)
     @patch('pages.pedido_page.logger')
-    @patch('pages.pedido_page.time')
-    def test_adicionar_produto_usa_scroll_quando_botao_nao_visivel(self, mock_time, mock_logger, mock_base_init):
+    @patch('pages.pedido_page.BasePage.aguardar_tela_estavel')
+    def test_adicionar_produto_usa_scroll_quando_botao_nao_visivel(self, mock_estavel, mock_logger, mock_base_init):
         """
         Quando o botão não está visível, deve fazer scroll.
         """
@@ -117,46 +117,45 @@ class TestPedidoPageTratarPopupBonus:
 
     @patch('pages.pedido_page.BasePage.__init__', return_value=None)
     @patch('pages.pedido_page.logger')
-    @patch('pages.pedido_page.time')
-    def test_tratar_popup_bonus_clica_quando_visivel(self, mock_time, mock_logger, mock_base_init):
+    def test_tratar_popup_bonus_usa_registro_de_interrupcoes(self, mock_logger, mock_base_init):
         """
-        Quando o popup de bônus está visível, deve clicar em 'Mais tarde'.
+        O popup de bônus é dispensado pelo registro de interrupções.
         """
         from pages.pedido_page import PedidoPage
+        from pages.interrupcoes import BONUS
 
         # Arrange
         page = PedidoPage.__new__(PedidoPage)
         page.driver = MagicMock()
-        page.texto_exibido = MagicMock(return_value=True)
-        page.clicar_por_id = MagicMock()
+        page.tratar_interrupcoes = MagicMock(return_value=["bonus"])
 
         # Act
         page.tratar_popup_bonus()
 
         # Assert
-        page.texto_exibido.assert_called_once_with(PedidoPage.TXT_BONUS_DISPONIVEL, tempo_espera=3)
-        page.clicar_por_id.assert_called_once_with(PedidoPage.BTN_MAIS_TARDE)
+        page.tratar_interrupcoes.assert_called_once_with(BONUS)
 
     @patch('pages.pedido_page.BasePage.__init__', return_value=None)
     @patch('pages.pedido_page.logger')
-    @patch('pages.pedido_page.time')
-    def test_tratar_popup_bonus_ignora_quando_nao_visivel(self, mock_time, mock_logger, mock_base_init):
+    def test_tratar_popup_bonus_nao_espera_pelo_popup(self, mock_logger, mock_base_init):
         """
-        Quando o popup de bônus não está visível, não deve clicar.
+        Sem popup na tela, não faz nenhuma espera por texto ou botão.
         """
         from pages.pedido_page import PedidoPage
 
         # Arrange
         page = PedidoPage.__new__(PedidoPage)
         page.driver = MagicMock()
-        page.texto_exibido = MagicMock(return_value=False)
-        page.clicar_por_id = MagicMock()
+        page.tratar_interrupcoes = MagicMock(return_value=[])
+        page.texto_exibido = MagicMock()
+        page.clicar_se_existir = MagicMock()
 
         # Act
         page.tratar_popup_bonus()
 
         # Assert
-        page.clicar_por_id.assert_not_called()
+        page.texto_exibido.assert_not_called()
+        page.clicar_se_existir.assert_not_called()
 
 
 class TestPedidoPageSelecaonasPagamentoDinheiro:
@@ -164,8 +163,8 @@ class TestPedidoPageSelecaonasPagamentoDinheiro:
 
     @patch('pages.pedido_page.BasePage.__init__', return_value=None)
     @patch('pages.pedido_page.logger')
-    @patch('pages.pedido_page.time')
-    def test_selecionar_pagamento_dinheiro_rola_clica_e_avanca(self, mock_time, mock_logger, mock_base_init):
+    @patch('pages.pedido_page.BasePage.aguardar_tela_estavel')
+    def test_selecionar_pagamento_dinheiro_rola_clica_e_avanca(self, mock_estavel, mock_logger, mock_base_init):
         """
         Deve rolar, clicar em DINHEIRO e avançar.
         """
@@ -0,0 +1,142 @@
+"""
+Testes unitários para o aluguel de portas por device (port_leases.py).
+Usa um arquivo de leases temporário e portas reais da máquina (bind de teste).
+"""
+import json
+import os
+import socket
+import threading
+
+import pytest
+from unittest.mock import patch
+
+
+@pytest.fixture
+def leases(tmp_path):
+    import port_leases
+
+    arquivo = tmp_path / "portas.json"
+    with patch.object(port_leases, 'ARQUIVO_LEASES', arquivo), \
+            patch.object(port_leases, 'ARQUIVO_TRAVA', tmp_path / "portas.lock"), \
+            patch.object(port_leases, '_ALUGADOS', set()), \
+            patch('port_leases.atexit.register'):
+        yield arquivo
+
+
+def _porta_livre() -> int:
+    """Uma porta livre da máquina (o sistema escolhe)."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class TestPortLeases:
+    """Testes para portas estáveis, exclusivas e liberadas por processo."""
+
+    def test_mesmas_portas_para_o_mesmo_udid(self, leases):
+        """
+        O UDID recebe as mesmas portas depois de liberar; outro UDID recebe outras.
+        """
+        from port_leases import alugar, liberar
+
+        # Arrange
+        primeiro = alugar("L400-01")
+        liberar("L400-01")
+
+        # Act
+        de_novo = alugar("L400-01")
+        outro = alugar("N960-02")
+
+        # Assert
+        assert de_novo == primeiro
+        assert set(primeiro) == {"appium", "systemPort", "mjpegServerPort", "chromedriverPort"}
+        assert not set(primeiro.values()) & set(outro.values())
+
+    def test_porta_ocupada_e_pulada(self, leases):
+        """
+        Porta que não passa no bind de teste não é entregue.
+        """
+        import port_leases
+
+        # Arrange
+        ocupada = socket.socket()
+        ocupada.bind(("127.0.0.1", 0))
+        ocupada.listen()
+        porta = ocupada.getsockname()[1]
+
+        try:
+            # Act
+            with patch.dict(port_leases.FAIXAS, appium=(porta, porta + 4, 2)):
+                portas = port_leases.alugar("L400-01")
+        finally:
+            ocupada.close()
+
+        # Assert
+        assert portas["appium"] == porta + 2
+
+    def test_processo_encerrado_sai_do_lease(self, leases):
+        """
+        liberar() tira o pid da entrada; pids mortos são limpos no próximo aluguel.
+        """
+        from port_leases import alugar, liberar
+
+        # Arrange
+        alugar("L400-01")
+        dados = json.loads(leases.read_text())
+        dados["L400-01"]["pids"].append(999999999)
+        leases.write_text(json.dumps(dados))
+
+        # Act
+        alugar("N960-02")
+        depois_do_aluguel = json.loads(leases.read_text())["L400-01"]["pids"]
+        liberar("L400-01")
+
+        # Assert
+        assert depois_do_aluguel == [os.getpid()]
+        assert json.loads(leases.read_text())["L400-01"]["pids"] == []
+
+    def test_faixa_cheia_retoma_porta_de_device_inativo(self, leases):
+        """
+        Sem porta nova na faixa, usa a de um device sem processo ativo.
+        """
+        import port_leases
+
+        # Arrange
+        inicio = _porta_livre()
+        with patch.dict(port_leases.FAIXAS, appium=(inicio, inicio + 1, 1)):
+            antigo = port_leases.alugar("L400-01")
+            port_leases.liberar("L400-01")
+
+            # Act
+            novo = port_leases.alugar("N960-02")
+
+            # Assert
+            assert novo["appium"] == antigo["appium"]
+            with pytest.raises(RuntimeError):
+                port_leases.alugar("L400-01")
+
+    def test_alugueis_simultaneos_nao_colidem(self, leases):
+        """
+        Vários alugueis ao mesmo tempo (trava de arquivo) entregam portas distintas.
+        """
+        from port_leases import alugar
+
+        # Arrange
+        resultados = {}
+
+        def _alugar(udid):
+            resultados[udid] = alugar(udid)
+
+        threads = [threading.Thread(target=_alugar, args=(f"device-{i}",)) for i in range(8)]
+
+        # Act
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Assert
+        for tipo in ("appium", "systemPort", "mjpegServerPort", "chromedriverPort"):
+            portas = [r[tipo] for r in resultados.values()]
+            assert len(set(portas)) == 8
+        assert len(json.loads(leases.read_text())) == 8
@@ -0,0 +1,103 @@
+"""
+Testes unitários para a política de retry (pages/retry.py).
+Utiliza mocks para evitar interação real com Appium/emulador.
+"""
+import pytest
+from unittest.mock import MagicMock, patch
+from selenium.common.exceptions import (
+    StaleElementReferenceException, InvalidSessionIdException, TimeoutException, WebDriverException,
+)
+
+
+class TestRetryClassificacao:
+    """Testes para a classificação das exceções."""
+
+    def test_classifica_retentaveis_e_fatais(self):
+        """
+        Stale/timeout são retentáveis; sessão encerrada e erro de programação são fatais.
+        """
+        from pages.retry import classificar_falha, RETENTAVEL, FATAL
+
+        # Act & Assert
+        assert classificar_falha(StaleElementReferenceException("stale")) == RETENTAVEL
+        assert classificar_falha(TimeoutException("timeout")) == RETENTAVEL
+        assert classificar_falha(InvalidSessionIdException("sessao")) == FATAL
+        assert classificar_falha(AttributeError("bug")) == FATAL
+
+    def test_mensagem_de_uiautomator2_caido_e_fatal(self):
+        """
+        WebDriverException genérica com a mensagem do servidor fora do ar não é retentada.
+        """
+        from pages.retry import classificar_falha, RETENTAVEL, FATAL
+
+        # Act & Assert
+        assert classificar_falha(WebDriverException("instrumentation process is not running")) == FATAL
+        assert classificar_falha(WebDriverException("erro qualquer")) == RETENTAVEL
+
+
+@patch('pages.retry.logger')
+@patch('pages.retry.time')
+class TestRetryExecucao:
+    """Testes para executar_com_retry."""
+
+    def test_retentavel_tenta_de_novo_com_backoff(self, mock_time, mock_logger):
+        """
+        Falha retentável seguida de sucesso: devolve o resultado e conta o retry.
+        """
+        from pages.retry import executar_com_retry, CONTADORES_RETRY
+
+        # Arrange
+        acao = MagicMock(side_effect=[StaleElementReferenceException("stale"), "ok"])
+
+        # Act
+        resultado = executar_com_retry("btn_retry_ok", acao)
+
+        # Assert
+        assert resultado == "ok"
+        assert acao.call_count == 2
+        mock_time.sleep.assert_called_once()
+        assert CONTADORES_RETRY["btn_retry_ok"] == {'tentativas': 2, 'retries': 1, 'fatais': 0, 'esgotados': 0}
+
+    def test_fatal_falha_na_hora_sem_esperar(self, mock_time, mock_logger):
+        """
+        Sessão encerrada: uma tentativa só, sem sleep, com a exceção original.
+        """
+        from pages.retry import executar_com_retry, CONTADORES_RETRY
+
+        # Arrange
+        acao = MagicMock(side_effect=InvalidSessionIdException("sessao encerrada"))
+
+        # Act & Assert
+        with pytest.raises(InvalidSessionIdException):
+            executar_com_retry("btn_retry_fatal", acao, max_tentativas=3)
+        assert acao.call_count == 1
+        mock_time.sleep.assert_not_called()
+        assert CONTADORES_RETRY["btn_retry_fatal"]['fatais'] == 1
+
+    def test_esgota_tentativas_e_relanca(self, mock_time, mock_logger):
+        """
+        Retentável em todas as tentativas: relança a última exceção e conta como esgotado.
+        """
+        from pages.retry import executar_com_retry, CONTADORES_RETRY
+
+        # Arrange
+        acao = MagicMock(side_effect=TimeoutException("nao apareceu"))
+
+        # Act & Assert
+        with pytest.raises(TimeoutException):
+            executar_com_retry("btn_retry_esgotado", acao, max_tentativas=3)
+        assert acao.call_count == 3
+        assert mock_time.sleep.call_count == 2
+        assert CONTADORES_RETRY["btn_retry_esgotado"]['esgotados'] == 1
+
+    def test_backoff_cresce_ate_o_maximo(self, mock_time, mock_logger):
+        """
+        A pausa dobra a cada tentativa, com jitter, e nunca passa do máximo.
+        """
+        from pages.retry import atraso_backoff, BASE_BACKOFF, MAXIMO_BACKOFF
+
+        # Act & Assert
+        with patch('pages.retry.random.uniform', return_value=1.0):
+            assert atraso_backoff(0) == BASE_BACKOFF
+            assert atraso_backoff(1) == BASE_BACKOFF * 2
+            assert atraso_backoff(10) == MAXIMO_BACKOFF
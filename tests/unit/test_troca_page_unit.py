@@ -2,18 +2,48 @@
 Testes unitários para TrocaPage.
 Utiliza mocks para evitar interação real com Appium/emulador.
 """
+import time
+
 import pytest
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock, patch, call
 from datetime import datetime
 
 
+def _pagina_com_telas(**aparece_na_consulta):
+    """
+    TrocaPage cujo driver passa a mostrar cada locator a partir da N-ésima consulta
+    (find_elements); o trecho do locator é a chave: _pagina_com_telas(checkBox=3).
+    Cliques por ID ficam num mock.
+    """
+    from pages.troca_page import TrocaPage
+
+    page = TrocaPage.__new__(TrocaPage)
+    page.driver = MagicMock()
+    page.driver.capabilities = {'appPackage': 'com.test.app'}
+    page._elemento_realmente_visivel = MagicMock(return_value=True)
+    page.clicar_por_id = MagicMock()
+    consultas = {'n': 0}
+    elementos = {}
+
+    def _find_elements(by, valor):
+        consultas['n'] += 1
+        for trecho, a_partir in aparece_na_consulta.items():
+            if trecho in valor and consultas['n'] >= a_partir:
+                return [elementos.setdefault(trecho, MagicMock())]
+        return []
+
+    page.driver.find_elements.side_effect = _find_elements
+    page.elementos = elementos
+    return page
+
+
 class TestTrocaPageDefinirDataInicial:
     """Testes para o método definir_data_inicial."""
 
     @patch('pages.troca_page.BasePage.__init__', return_value=None)
     @patch('pages.troca_page.logger')
-    @patch('pages.troca_page.time')
-    def test_definir_data_inicial_com_data_fornecida(self, mock_time, mock_logger, mock_base_init):
+    @patch('pages.troca_page.BasePage.aguardar_tela_estavel')
+    def test_definir_data_inicial_com_data_fornecida(self, mock_estavel, mock_logger, mock_base_init):
         """
         Quando uma data é fornecida, deve usá-la.
         """
@@ -40,8 +70,8 @@ class TestTrocaPageDefinirDataInicial:
 
     @patch('pages.troca_page.BasePage.__init__', return_value=None)
     @patch('pages.troca_page.logger')
-    @patch('pages.troca_page.time')
-    def test_definir_data_inicial_usa_data_atual_quando_nao_fornecida(self, mock_time, mock_logger, mock_base_init):
+    @patch('pages.troca_page.BasePage.aguardar_tela_estavel')
+    def test_definir_data_inicial_usa_data_atual_quando_nao_fornecida(self, mock_estavel, mock_logger, mock_base_init):
         """
         Quando nenhuma data é fornecida, deve usar a data atual.
         """
@@ -95,8 +125,8 @@ class TestTrocaPageSelecionarPrimeiraNota:
 
     @patch('pages.troca_page.BasePage.__init__', return_value=None)
     @patch('pages.troca_page.logger')
-    @patch('pages.troca_page.time')
-    def test_selecionar_primeira_nota_clica_no_primeiro_item(self, mock_time, mock_logger, mock_base_init):
+    @patch('pages.troca_page.BasePage.aguardar_tela_estavel')
+    def test_selecionar_primeira_nota_clica_no_primeiro_item(self, mock_estavel, mock_logger, mock_base_init):
         """
         Deve clicar no primeiro item da lista de notas.
         """
@@ -138,7 +168,7 @@ class TestTrocaPageSelecionarCliente:
         page.selecionar_cliente(identificador)
 
         # Assert
-        page.digitar_por_id.assert_called_once_with(TrocaPage.EDT_BUSCA_CLIENTE, identificador)
+        page.digitar_por_id.assert_called_once_with(TrocaPage.EDT_BUSCA_CLIENTE, identificador, rapido=True)
         page.pressionar_pesquisar.assert_called_once()
         page.clicar_por_id.assert_called_once_with(TrocaPage.BTN_CONFIRMAR_CLIENTE)
 
@@ -148,8 +178,8 @@ class TestTrocaPageMarcarItemParaDevolucao:
 
     @patch('pages.troca_page.BasePage.__init__', return_value=None)
     @patch('pages.troca_page.logger')
-    @patch('pages.troca_page.time')
-    def test_marcar_item_para_devolucao_clica_no_checkbox(self, mock_time, mock_logger, mock_base_init):
+    @patch('pages.troca_page.BasePage.aguardar_tela_estavel')
+    def test_marcar_item_para_devolucao_clica_no_checkbox(self, mock_estavel, mock_logger, mock_base_init):
         """
         Deve clicar no checkbox do item.
         """
@@ -172,25 +202,112 @@ class TestTrocaPageConfirmarDialogos:
 
     @patch('pages.troca_page.BasePage.__init__', return_value=None)
     @patch('pages.troca_page.logger')
-    @patch('pages.troca_page.time')
-    def test_confirmar_dialogos_clica_nos_popups(self, mock_time, mock_logger, mock_base_init):
+    @patch('pages.base_page.logger')
+    def test_segundo_dialogo_atrasado_e_confirmado(self, mock_base_logger, mock_logger, mock_base_init):
         """
-        Deve clicar em ambos os popups de confirmação.
+        O segundo OK que aparece só depois de algumas consultas ainda é confirmado.
         """
         from pages.troca_page import TrocaPage
 
         # Arrange
-        page = TrocaPage.__new__(TrocaPage)
-        page.driver = MagicMock()
-        page.clicar_se_existir = MagicMock(return_value=True)
-        page.clicar_por_id = MagicMock()
+        page = _pagina_com_telas(md_buttonDefaultPositive=6)
 
         # Act
+        inicio = time.monotonic()
         page.confirmar_dialogos()
+        duracao = time.monotonic() - inicio
 
         # Assert
-        page.clicar_se_existir.assert_called_once_with(TrocaPage.BTN_DIALOGO_OK, tempo_espera=5)
-        page.clicar_por_id.assert_called_once_with(TrocaPage.BTN_DIALOGO_OK)
+        assert page.clicar_por_id.call_args_list == [
+            call(TrocaPage.BTN_DIALOGO_OK, confirmar=TrocaPage.CONFIRMAR_SUMIU),
+            call(TrocaPage.BTN_DIALOGO_OK),
+        ]
+        assert duracao < 2
+
+    @patch('pages.troca_page.BasePage.__init__', return_value=None)
+    @patch('pages.troca_page.logger')
+    @patch('pages.base_page.logger')
+    def test_tela_de_sucesso_no_lugar_do_segundo_dialogo(self, mock_base_logger, mock_logger, mock_base_init):
+        """
+        Se vem a tela de sucesso (mesmo botão OK), segue sem clicar no OK dela.
+        """
+        from pages.troca_page import TrocaPage
+
+        # Arrange
+        page = _pagina_com_telas(md_buttonDefaultPositive=1, **{"Sucesso!": 1})
+
+        # Act
+        page.confirmar_dialogos()
+
+        # Assert
+        page.clicar_por_id.assert_called_once_with(TrocaPage.BTN_DIALOGO_OK, confirmar=TrocaPage.CONFIRMAR_SUMIU)
+
+    @patch('pages.troca_page.BasePage.__init__', return_value=None)
+    @patch('pages.troca_page.logger')
+    @patch('pages.base_page.logger')
+    def test_sem_segundo_dialogo_espera_so_o_tempo_curto(self, mock_base_logger, mock_logger, mock_base_init):
+        """
+        Nada aparece depois do primeiro OK: segue após TEMPO_SEGUNDO_DIALOGO, sem a espera padrão (30s).
+        """
+        from pages.troca_page import TrocaPage
+
+        # Arrange
+        page = _pagina_com_telas()
+        page.TEMPO_SEGUNDO_DIALOGO = 0.3
+
+        # Act
+        inicio = time.monotonic()
+        page.confirmar_dialogos()
+        duracao = time.monotonic() - inicio
+
+        # Assert
+        page.clicar_por_id.assert_called_once_with(TrocaPage.BTN_DIALOGO_OK, confirmar=TrocaPage.CONFIRMAR_SUMIU)
+        assert 0.3 <= duracao < 1.5
+
+
+class TestTrocaPageConfirmacaoSim:
+    """Testes para o método responder_confirmacao_sim."""
+
+    @patch('pages.troca_page.BasePage.__init__', return_value=None)
+    @patch('pages.troca_page.logger')
+    @patch('pages.base_page.logger')
+    def test_sim_atrasado_e_respondido(self, mock_base_logger, mock_logger, mock_base_init):
+        """
+        O SIM que abre só depois de algumas consultas ainda é respondido (não depende de um snapshot).
+        """
+        from pages.interrupcoes import INTERRUPCOES_TRATADAS
+
+        # Arrange
+        page = _pagina_com_telas(SIM=5)
+        antes = INTERRUPCOES_TRATADAS.get("confirmacao_sim", 0)
+
+        # Act
+        respondeu = page.responder_confirmacao_sim()
+
+        # Assert
+        assert respondeu is True
+        page.elementos["SIM"].click.assert_called_once()
+        assert INTERRUPCOES_TRATADAS["confirmacao_sim"] == antes + 1
+
+    @patch('pages.troca_page.BasePage.__init__', return_value=None)
+    @patch('pages.troca_page.logger')
+    @patch('pages.base_page.logger')
+    def test_item_na_tela_segue_sem_esperar_o_sim(self, mock_base_logger, mock_logger, mock_base_init):
+        """
+        Com o checkbox do item na tela, segue na hora sem clicar em nada.
+        """
+        # Arrange
+        page = _pagina_com_telas(checkBox=1)
+
+        # Act
+        inicio = time.monotonic()
+        respondeu = page.responder_confirmacao_sim()
+        duracao = time.monotonic() - inicio
+
+        # Assert
+        assert respondeu is False
+        page.elementos["checkBox"].click.assert_not_called()
+        assert duracao < 1
 
 
 class TestTrocaPageTratarPopupBonus:
@@ -198,45 +315,45 @@ class TestTrocaPageTratarPopupBonus:
 
     @patch('pages.troca_page.BasePage.__init__', return_value=None)
     @patch('pages.troca_page.logger')
-    @patch('pages.troca_page.time')
-    def test_tratar_popup_bonus_clica_quando_visivel(self, mock_time, mock_logger, mock_base_init):
+    def test_tratar_popup_bonus_usa_registro_de_interrupcoes(self, mock_logger, mock_base_init):
         """
-        Quando o popup de bônus está visível, deve clicar em 'Mais tarde'.
+        O popup de bônus é dispensado pelo registro de interrupções.
         """
         from pages.troca_page import TrocaPage
+        from pages.interrupcoes import BONUS
 
         # Arrange
         page = TrocaPage.__new__(TrocaPage)
         page.driver = MagicMock()
-        page.texto_exibido = MagicMock(return_value=True)
-        page.clicar_por_id = MagicMock()
+        page.tratar_interrupcoes = MagicMock(return_value=["bonus"])
 
         # Act
         page.tratar_popup_bonus()
 
         # Assert
-        page.clicar_por_id.assert_called_once_with(TrocaPage.BTN_MAIS_TARDE)
+        page.tratar_interrupcoes.assert_called_once_with(BONUS)
 
     @patch('pages.troca_page.BasePage.__init__', return_value=None)
     @patch('pages.troca_page.logger')
-    @patch('pages.troca_page.time')
-    def test_tratar_popup_bonus_ignora_quando_nao_visivel(self, mock_time, mock_logger, mock_base_init):
+    def test_tratar_popup_bonus_nao_espera_pelo_popup(self, mock_logger, mock_base_init):
         """
-        Quando o popup não está visível, não deve clicar.
+        Sem popup na tela, não faz nenhuma espera por texto ou botão.
         """
         from pages.troca_page import TrocaPage
 
         # Arrange
         page = TrocaPage.__new__(TrocaPage)
         page.driver = MagicMock()
-        page.texto_exibido = MagicMock(return_value=False)
-        page.clicar_por_id = MagicMock()
+        page.tratar_interrupcoes = MagicMock(return_value=[])
+        page.texto_exibido = MagicMock()
+        page.clicar_se_existir = MagicMock()
 
         # Act
         page.tratar_popup_bonus()
 
         # Assert
-        page.clicar_por_id.assert_not_called()
+        page.texto_exibido.assert_not_called()
+        page.clicar_se_existir.assert_not_called()
 
 
 class TestTrocaPageSelecionarPagamentoBonus:
@@ -244,8 +361,8 @@ class TestTrocaPageSelecionarPagamentoBonus:
 
     @patch('pages.troca_page.BasePage.__init__', return_value=None)
     @patch('pages.troca_page.logger')
-    @patch('pages.troca_page.time')
-    def test_selecionar_pagamento_bonus_ativa_switch_e_avanca(self, mock_time, mock_logger, mock_base_init):
+    @patch('pages.troca_page.BasePage.aguardar_tela_estavel')
+    def test_selecionar_pagamento_bonus_ativa_switch_e_avanca(self, mock_estavel, mock_logger, mock_base_init):
         """
         Deve ativar o switch de bônus e clicar em avançar.
         """
@@ -346,7 +463,7 @@ class TestTrocaPageFluxoTroca:
         page.definir_data_inicial = MagicMock()
         page.clicar_consultar = MagicMock()
         page.selecionar_primeira_nota = MagicMock()
-        page.clicar_texto_se_existir = MagicMock(return_value=False)
+        page.responder_confirmacao_sim = MagicMock(return_value=False)
         page.marcar_item_para_devolucao = MagicMock()
         page.clicar_devolver_itens = MagicMock()
         page.confirmar_dialogos = MagicMock()
@@ -378,7 +495,7 @@ class TestTrocaPageFluxoTroca:
         page.definir_data_inicial = MagicMock()
         page.clicar_consultar = MagicMock()
         page.selecionar_primeira_nota = MagicMock()
-        page.clicar_texto_se_existir = MagicMock(return_value=False)
+        page.responder_confirmacao_sim = MagicMock(return_value=False)
         page.marcar_item_para_devolucao = MagicMock()
         page.clicar_devolver_itens = MagicMock()
         page.confirmar_dialogos = MagicMock()
@@ -409,7 +526,7 @@ class TestTrocaPageFluxoTrocaConsumidor:
         page.definir_data_inicial = MagicMock()
         page.clicar_consultar = MagicMock()
         page.selecionar_primeira_nota = MagicMock()
-        page.clicar_texto_se_existir = MagicMock(return_value=False)
+        page.responder_confirmacao_sim = MagicMock(return_value=False)
         page.selecionar_cliente = MagicMock()
         page.marcar_item_para_devolucao = MagicMock()
         page.clicar_devolver_itens = MagicMock()
@@ -457,7 +574,7 @@ class TestTrocaPageFluxoTrocaConsumidor:
         page.definir_data_inicial = MagicMock()
         page.clicar_consultar = MagicMock()
         page.selecionar_primeira_nota = MagicMock()
-        page.clicar_texto_se_existir = MagicMock(return_value=True)  # Popup SIM aparece
+        page.responder_confirmacao_sim = MagicMock(return_value=True)  # Popup SIM aparece
         page.selecionar_cliente = MagicMock()
         page.marcar_item_para_devolucao = MagicMock()
         page.clicar_devolver_itens = MagicMock()
@@ -136,7 +136,7 @@ class TestVendaFuturaPageAdicionarProduto:
 
         # Assert
         page.rolar_ate_id.assert_any_call(VendaFuturaPage.BTN_ADICIONAR_PRODUTOS)
-        page.clicar_por_id.assert_any_call(VendaFuturaPage.BTN_ADICIONAR_PRODUTOS)
+        page.clicar_por_id.assert_any_call(VendaFuturaPage.BTN_ADICIONAR_PRODUTOS, confirmar=VendaFuturaPage.EDT_BUSCA_PRODUTO)
         page.digitar_por_id.assert_called_once_with(VendaFuturaPage.EDT_BUSCA_PRODUTO, codigo)
         page.clicar_por_id.assert_any_call(VendaFuturaPage.IMG_PRODUTO)
         page.rolar_ate_texto.assert_called_once_with(tamanho)
@@ -148,8 +148,8 @@ class TestVendaFuturaPageSelecionarPagamentoAvista:
 
     @patch('pages.venda_futura_page.BasePage.__init__', return_value=None)
     @patch('pages.venda_futura_page.logger')
-    @patch('pages.venda_futura_page.time')
-    def test_selecionar_pagamento_avista_seleciona_movimento_e_plano(self, mock_time, mock_logger, mock_base_init):
+    @patch('pages.venda_futura_page.BasePage.aguardar_tela_estavel')
+    def test_selecionar_pagamento_avista_seleciona_movimento_e_plano(self, mock_estavel, mock_logger, mock_base_init):
         """
         Deve selecionar movimento e plano A VISTA.
         """
@@ -186,43 +186,45 @@ class TestVendaFuturaPageTratarPopupBonus:
 
     @patch('pages.venda_futura_page.BasePage.__init__', return_value=None)
     @patch('pages.venda_futura_page.logger')
-    @patch('pages.venda_futura_page.time')
-    def test_tratar_popup_bonus_clica_quando_existe(self, mock_time, mock_logger, mock_base_init):
+    def test_tratar_popup_bonus_usa_registro_de_interrupcoes(self, mock_logger, mock_base_init):
         """
-        Quando o popup existe, deve clicar em 'Mais tarde'.
+        O popup de bônus é dispensado pelo registro de interrupções.
         """
         from pages.venda_futura_page import VendaFuturaPage
+        from pages.interrupcoes import BONUS
 
         # Arrange
         page = VendaFuturaPage.__new__(VendaFuturaPage)
         page.driver = MagicMock()
-        page.clicar_se_existir = MagicMock(return_value=True)
+        page.tratar_interrupcoes = MagicMock(return_value=["bonus"])
 
         # Act
         page.tratar_popup_bonus()
 
         # Assert
-        page.clicar_se_existir.assert_called_once_with(VendaFuturaPage.BTN_MAIS_TARDE, tempo_espera=2)
+        page.tratar_interrupcoes.assert_called_once_with(BONUS, estavel=True)
 
     @patch('pages.venda_futura_page.BasePage.__init__', return_value=None)
     @patch('pages.venda_futura_page.logger')
-    @patch('pages.venda_futura_page.time')
-    def test_tratar_popup_bonus_ignora_quando_nao_existe(self, mock_time, mock_logger, mock_base_init):
+    def test_tratar_popup_bonus_nao_espera_pelo_popup(self, mock_logger, mock_base_init):
         """
-        Quando o popup não existe, deve apenas logar.
+        Sem popup na tela, não faz nenhuma espera por texto ou botão.
         """
         from pages.venda_futura_page import VendaFuturaPage
 
         # Arrange
         page = VendaFuturaPage.__new__(VendaFuturaPage)
         page.driver = MagicMock()
-        page.clicar_se_existir = MagicMock(return_value=False)
+        page.tratar_interrupcoes = MagicMock(return_value=[])
+        page.texto_exibido = MagicMock()
+        page.clicar_se_existir = MagicMock()
 
-        # Act - não deve lançar exceção
+        # Act
         page.tratar_popup_bonus()
 
         # Assert
-        page.clicar_se_existir.assert_called_once()
+        page.texto_exibido.assert_not_called()
+        page.clicar_se_existir.assert_not_called()
 
 
 class TestVendaFuturaPageSelecionarFormaDinheiro:
@@ -11,8 +11,8 @@ class TestVendaPageClicarBuscarCliente:
 
     @patch('pages.venda_page.BasePage.__init__', return_value=None)
     @patch('pages.venda_page.logger')
-    @patch('pages.venda_page.time')
-    def test_clicar_buscar_cliente_versao_l400_stone(self, mock_time, mock_logger, mock_base_init):
+    @patch('pages.venda_page.BasePage.aguardar_tela_estavel')
+    def test_clicar_buscar_cliente_versao_l400_stone(self, mock_estavel, mock_logger, mock_base_init):
         """
         Na versão L400/Stone, deve clicar por texto em 'Buscar Cliente'.
         """
@@ -21,11 +21,58 @@ class TestVendaPageClicarBuscarCliente:
         # Arrange
         page = VendaPage.__new__(VendaPage)
         page.driver = MagicMock()
+        page.aguardar_primeiro = MagicMock(return_value=("device", MagicMock()))
+        page.texto_exibido = MagicMock(side_effect=lambda texto, tempo_espera: texto == "Buscar Cliente")
+        page.clicar_por_texto = MagicMock()
+        page.clicar_por_id = MagicMock()
+
+        # Act
+        page.clicar_buscar_cliente()
+
+        # Assert
+        page.clicar_por_texto.assert_called_once_with("Buscar Cliente")
+        page.clicar_por_id.assert_not_called()
+
+    @patch('pages.venda_page.BasePage.__init__', return_value=None)
+    @patch('pages.venda_page.logger')
+    @patch('pages.venda_page.BasePage.aguardar_tela_estavel')
+    def test_clicar_buscar_cliente_versao_playstore(self, mock_estavel, mock_logger, mock_base_init):
+        """
+        Na versão Playstore, deve clicar por ID.
+        """
+        from pages.venda_page import VendaPage
+
+        # Arrange
+        page = VendaPage.__new__(VendaPage)
+        page.driver = MagicMock()
+        page.aguardar_primeiro = MagicMock(return_value=("playstore", MagicMock()))
+        page.texto_exibido = MagicMock(return_value=False)
+        page.clicar_por_texto = MagicMock()
+        page.clicar_por_id = MagicMock()
+
+        # Act
+        page.clicar_buscar_cliente()
 
-        def texto_exibido_mock(texto, tempo_espera):
-            return texto in ["Selecionar Cliente", "Buscar Cliente"]
+        # Assert - branch imediato, sem sondar texto da versão L400/Stone
+        page.clicar_por_id.assert_called_once_with(VendaPage.BTN_BUSCAR_CLIENTE)
+        page.texto_exibido.assert_not_called()
 
-        page.texto_exibido = MagicMock(side_effect=texto_exibido_mock)
+
+    @patch('pages.venda_page.BasePage.__init__', return_value=None)
+    @patch('pages.venda_page.logger')
+    @patch('pages.venda_page.BasePage.aguardar_tela_estavel')
+    def test_clicar_buscar_cliente_flavor_stone_nao_sonda_tela(self, mock_estavel, mock_logger, mock_base_init):
+        """
+        Com flavor Stone conhecido, deve clicar direto por texto sem aguardar as versões.
+        """
+        from pages.venda_page import VendaPage
+
+        # Arrange
+        page = VendaPage.__new__(VendaPage)
+        page.driver = MagicMock()
+        page.driver.capabilities = {'appPackage': 'com.serverinfo.bshoppdv.stone.qa'}
+        page.aguardar_primeiro = MagicMock()
+        page.texto_exibido = MagicMock(return_value=True)
         page.clicar_por_texto = MagicMock()
         page.clicar_por_id = MagicMock()
 
@@ -33,21 +80,24 @@ class TestVendaPageClicarBuscarCliente:
         page.clicar_buscar_cliente()
 
         # Assert
+        page.aguardar_primeiro.assert_not_called()
         page.clicar_por_texto.assert_called_once_with("Buscar Cliente")
         page.clicar_por_id.assert_not_called()
 
     @patch('pages.venda_page.BasePage.__init__', return_value=None)
     @patch('pages.venda_page.logger')
-    @patch('pages.venda_page.time')
-    def test_clicar_buscar_cliente_versao_playstore(self, mock_time, mock_logger, mock_base_init):
+    @patch('pages.venda_page.BasePage.aguardar_tela_estavel')
+    def test_clicar_buscar_cliente_flavor_stone_sem_texto_usa_id(self, mock_estavel, mock_logger, mock_base_init):
         """
-        Na versão Playstore, deve clicar por ID.
+        Com flavor Stone mas sem 'Buscar Cliente' na tela, segue pelo ID da versão Playstore.
         """
         from pages.venda_page import VendaPage
 
         # Arrange
         page = VendaPage.__new__(VendaPage)
         page.driver = MagicMock()
+        page.driver.capabilities = {'appPackage': 'com.serverinfo.bshoppdv.stone.qa'}
+        page.aguardar_primeiro = MagicMock()
         page.texto_exibido = MagicMock(return_value=False)
         page.clicar_por_texto = MagicMock()
         page.clicar_por_id = MagicMock()
@@ -55,8 +105,34 @@ class TestVendaPageClicarBuscarCliente:
         # Act
         page.clicar_buscar_cliente()
 
+        # Assert
+        page.texto_exibido.assert_called_once_with("Buscar Cliente", tempo_espera=2)
+        page.clicar_por_texto.assert_not_called()
+        page.clicar_por_id.assert_called_once_with(VendaPage.BTN_BUSCAR_CLIENTE)
+
+    @patch('pages.venda_page.BasePage.__init__', return_value=None)
+    @patch('pages.venda_page.logger')
+    @patch('pages.venda_page.BasePage.aguardar_tela_estavel')
+    def test_clicar_buscar_cliente_nenhuma_tela_usa_id(self, mock_estavel, mock_logger, mock_base_init):
+        """
+        Se nenhuma das versões aparece no prazo, segue pelo ID da versão Playstore.
+        """
+        from selenium.common.exceptions import TimeoutException
+        from pages.venda_page import VendaPage
+
+        # Arrange
+        page = VendaPage.__new__(VendaPage)
+        page.driver = MagicMock()
+        page.aguardar_primeiro = MagicMock(side_effect=TimeoutException())
+        page.clicar_por_texto = MagicMock()
+        page.clicar_por_id = MagicMock()
+
+        # Act
+        page.clicar_buscar_cliente()
+
         # Assert
         page.clicar_por_id.assert_called_once_with(VendaPage.BTN_BUSCAR_CLIENTE)
+        page.clicar_por_texto.assert_not_called()
 
 
 class TestVendaPageIniciarVendaSemCliente:
@@ -64,8 +140,8 @@ class TestVendaPageIniciarVendaSemCliente:
 
     @patch('pages.venda_page.BasePage.__init__', return_value=None)
     @patch('pages.venda_page.logger')
-    @patch('pages.venda_page.time')
-    def test_iniciar_venda_sem_cliente_versao_l400_stone(self, mock_time, mock_logger, mock_base_init):
+    @patch('pages.venda_page.BasePage.aguardar_tela_estavel')
+    def test_iniciar_venda_sem_cliente_versao_l400_stone(self, mock_estavel, mock_logger, mock_base_init):
         """
         Na versão L400/Stone, deve clicar em 'INICIAR VENDA' por texto.
         """
@@ -74,11 +150,8 @@ class TestVendaPageIniciarVendaSemCliente:
         # Arrange
         page = VendaPage.__new__(VendaPage)
         page.driver = MagicMock()
-
-        def texto_exibido_mock(texto, tempo_espera):
-            return texto in ["Selecionar Cliente", "INICIAR VENDA"]
-
-        page.texto_exibido = MagicMock(side_effect=texto_exibido_mock)
+        page.aguardar_primeiro = MagicMock(return_value=("device", MagicMock()))
+        page.texto_exibido = MagicMock(side_effect=lambda texto, tempo_espera: texto == "INICIAR VENDA")
         page.clicar_por_texto = MagicMock()
         page.clicar_por_id = MagicMock()
 
@@ -90,8 +163,8 @@ class TestVendaPageIniciarVendaSemCliente:
 
     @patch('pages.venda_page.BasePage.__init__', return_value=None)
     @patch('pages.venda_page.logger')
-    @patch('pages.venda_page.time')
-    def test_iniciar_venda_sem_cliente_versao_playstore(self, mock_time, mock_logger, mock_base_init):
+    @patch('pages.venda_page.BasePage.aguardar_tela_estavel')
+    def test_iniciar_venda_sem_cliente_versao_playstore(self, mock_estavel, mock_logger, mock_base_init):
         """
         Na versão Playstore, deve clicar por ID (button30).
         """
@@ -100,6 +173,7 @@ class TestVendaPageIniciarVendaSemCliente:
         # Arrange
         page = VendaPage.__new__(VendaPage)
         page.driver = MagicMock()
+        page.aguardar_primeiro = MagicMock(return_value=("playstore", MagicMock()))
         page.texto_exibido = MagicMock(return_value=False)
         page.clicar_por_texto = MagicMock()
         page.clicar_por_id = MagicMock()
@@ -107,8 +181,33 @@ class TestVendaPageIniciarVendaSemCliente:
         # Act
         page.iniciar_venda_sem_cliente()
 
+        # Assert - branch imediato, sem sondar texto da versão L400/Stone
+        page.clicar_por_id.assert_called_once_with(VendaPage.BTN_INICIAR_VENDA_SEM_CLIENTE)
+        page.texto_exibido.assert_not_called()
+
+    @patch('pages.venda_page.BasePage.__init__', return_value=None)
+    @patch('pages.venda_page.logger')
+    @patch('pages.venda_page.BasePage.aguardar_tela_estavel')
+    def test_iniciar_venda_sem_cliente_nenhuma_tela_usa_id(self, mock_estavel, mock_logger, mock_base_init):
+        """
+        Se nenhuma das versões aparece no prazo, segue pelo ID (button30).
+        """
+        from selenium.common.exceptions import TimeoutException
+        from pages.venda_page import VendaPage
+
+        # Arrange
+        page = VendaPage.__new__(VendaPage)
+        page.driver = MagicMock()
+        page.aguardar_primeiro = MagicMock(side_effect=TimeoutException())
+        page.clicar_por_texto = MagicMock()
+        page.clicar_por_id = MagicMock()
+
+        # Act
+        page.iniciar_venda_sem_cliente()
+
         # Assert
         page.clicar_por_id.assert_called_once_with(VendaPage.BTN_INICIAR_VENDA_SEM_CLIENTE)
+        page.clicar_por_texto.assert_not_called()
 
 
 class TestVendaPageSelecionarCliente:
@@ -163,7 +262,7 @@ class TestVendaPageAdicionarProduto:
         page.adicionar_produto(codigo)
 
         # Assert
-        page.clicar_por_id.assert_any_call(VendaPage.BTN_ADICIONAR_PRODUTOS)
+        page.clicar_por_id.assert_any_call(VendaPage.BTN_ADICIONAR_PRODUTOS, confirmar=VendaPage.EDT_BUSCA_PRODUTO)
         page.digitar_por_id.assert_called_once_with(VendaPage.EDT_BUSCA_PRODUTO, codigo)
         page.clicar_por_id.assert_any_call(VendaPage.IMG_PRODUTO)
 
@@ -173,45 +272,45 @@ class TestVendaPageTratarPopupBonus:
 
     @patch('pages.venda_page.BasePage.__init__', return_value=None)
     @patch('pages.venda_page.logger')
-    @patch('pages.venda_page.time')
-    def test_tratar_popup_bonus_clica_quando_visivel(self, mock_time, mock_logger, mock_base_init):
+    def test_tratar_popup_bonus_usa_registro_de_interrupcoes(self, mock_logger, mock_base_init):
         """
-        Quando o popup de bônus está visível, deve clicar em 'Mais tarde'.
+        O popup de bônus é dispensado pelo registro de interrupções.
         """
         from pages.venda_page import VendaPage
+        from pages.interrupcoes import BONUS
 
         # Arrange
         page = VendaPage.__new__(VendaPage)
         page.driver = MagicMock()
-        page.texto_exibido = MagicMock(return_value=True)
-        page.clicar_por_id = MagicMock()
+        page.tratar_interrupcoes = MagicMock(return_value=["bonus"])
 
         # Act
         page.tratar_popup_bonus()
 
         # Assert
-        page.clicar_por_id.assert_called_once_with(VendaPage.BTN_MAIS_TARDE)
+        page.tratar_interrupcoes.assert_called_once_with(BONUS)
 
     @patch('pages.venda_page.BasePage.__init__', return_value=None)
     @patch('pages.venda_page.logger')
-    @patch('pages.venda_page.time')
-    def test_tratar_popup_bonus_ignora_quando_nao_visivel(self, mock_time, mock_logger, mock_base_init):
+    def test_tratar_popup_bonus_nao_espera_pelo_popup(self, mock_logger, mock_base_init):
         """
-        Quando o popup não está visível, não deve clicar.
+        Sem popup na tela, não faz nenhuma espera por texto ou botão.
         """
         from pages.venda_page import VendaPage
 
         # Arrange
         page = VendaPage.__new__(VendaPage)
         page.driver = MagicMock()
-        page.texto_exibido = MagicMock(return_value=False)
-        page.clicar_por_id = MagicMock()
+        page.tratar_interrupcoes = MagicMock(return_value=[])
+        page.texto_exibido = MagicMock()
+        page.clicar_se_existir = MagicMock()
 
         # Act
         page.tratar_popup_bonus()
 
         # Assert
-        page.clicar_por_id.assert_not_called()
+        page.texto_exibido.assert_not_called()
+        page.clicar_se_existir.assert_not_called()
 
 
 class TestVendaPageResponderImpressao:
@@ -219,8 +318,8 @@ class TestVendaPageResponderImpressao:
 
     @patch('pages.venda_page.BasePage.__init__', return_value=None)
     @patch('pages.venda_page.logger')
-    @patch('pages.venda_page.time')
-    def test_responder_impressao_sim(self, mock_time, mock_logger, mock_base_init):
+    @patch('pages.venda_page.BasePage.aguardar_tela_estavel')
+    def test_responder_impressao_sim(self, mock_estavel, mock_logger, mock_base_init):
         """
         Quando imprimir=True, deve clicar no botão SIM.
         """
@@ -229,18 +328,20 @@ class TestVendaPageResponderImpressao:
         # Arrange
         page = VendaPage.__new__(VendaPage)
         page.driver = MagicMock()
-        page.clicar_se_existir = MagicMock()
+        page.passo_opcional = MagicMock(return_value=True)
 
         # Act
         page.responder_impressao(imprimir=True)
 
         # Assert
-        page.clicar_se_existir.assert_called_once_with(VendaPage.BTN_IMPRIMIR_SIM, tempo_espera=20)
+        botao, proxima = page.passo_opcional.call_args.args
+        assert botao == VendaPage.BTN_IMPRIMIR_SIM
+        assert VendaPage.TXT_VENDA_REALIZADA in proxima[1]
 
     @patch('pages.venda_page.BasePage.__init__', return_value=None)
     @patch('pages.venda_page.logger')
-    @patch('pages.venda_page.time')
-    def test_responder_impressao_nao(self, mock_time, mock_logger, mock_base_init):
+    @patch('pages.venda_page.BasePage.aguardar_tela_estavel')
+    def test_responder_impressao_nao(self, mock_estavel, mock_logger, mock_base_init):
         """
         Quando imprimir=False, deve clicar no botão NÃO.
         """
@@ -249,13 +350,15 @@ class TestVendaPageResponderImpressao:
         # Arrange
         page = VendaPage.__new__(VendaPage)
         page.driver = MagicMock()
-        page.clicar_se_existir = MagicMock()
+        page.passo_opcional = MagicMock(return_value=True)
 
         # Act
         page.responder_impressao(imprimir=False)
 
         # Assert
-        page.clicar_se_existir.assert_called_once_with(VendaPage.BTN_IMPRIMIR_NAO, tempo_espera=20)
+        botao, proxima = page.passo_opcional.call_args.args
+        assert botao == VendaPage.BTN_IMPRIMIR_NAO
+        assert VendaPage.TXT_VENDA_REALIZADA in proxima[1]
 
 
 class TestVendaPageValidacoes: